@@ -0,0 +1,4 @@
+"""Micro-benchmarks for the fetch/parse pipeline.
+
+Run from the repository root, e.g. ``python -m benchmarks.json_codec``.
+"""
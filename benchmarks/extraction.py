@@ -0,0 +1,284 @@
+"""Check ``simplify_update`` against the recursive implementation and time both.
+
+The recursive extraction that ``fetch_linkedin_profile_updates`` used before
+its iterative rewrite (explicit-stack text/content walkers plus the actor
+cache) is kept below as the baseline. Both versions run over every update of
+the recorded pages; the benchmark first checks that they produce the same
+records, then reports updates/sec for each. The rewrite exists to bound stack
+depth and share actor lookups, not for raw speed: on small recorded pages the
+two are within noise of each other. The check also
+covers copies of the recorded updates carrying every field the baseline reads
+(``permalink``, ``lifecycleState``, ``createdAt``, content entities), which the
+recorded pages happen not to contain.
+
+Example usage:
+
+    python -m benchmarks.extraction --page mail.json --repeat 200
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterable
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import json_backend
+from benchmarks.json_codec import best_of
+from fetch_linkedin_profile_updates import (
+    collect_updates,
+    harvest_social_counts,
+    index_included,
+    simplify_update,
+)
+
+
+def legacy_extract_text_block(block: Any) -> Optional[str]:
+    """Recursive text extraction as it was before the iterative rewrite."""
+    if block is None:
+        return None
+    if isinstance(block, str):
+        return block
+    if isinstance(block, dict):
+        if "text" in block:
+            return legacy_extract_text_block(block["text"])
+        if "value" in block:
+            return legacy_extract_text_block(block["value"])
+        if "textViewModel" in block:
+            return legacy_extract_text_block(block["textViewModel"])
+        if "attributes" in block:
+            return legacy_extract_text_block(block.get("string"))
+        if "attributedText" in block:
+            return legacy_extract_text_block(block["attributedText"])
+        if "rawText" in block:
+            return legacy_extract_text_block(block["rawText"])
+    if isinstance(block, Iterable):
+        parts: List[str] = []
+        for item in block:
+            text = legacy_extract_text_block(item)
+            if text:
+                parts.append(text)
+        return "".join(parts) if parts else None
+    return None
+
+
+def legacy_simplify_actor(actor_ref: Optional[Any], index: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if actor_ref is None:
+        return None
+    if isinstance(actor_ref, dict):
+        actor = actor_ref
+        actor_urn = actor_ref.get("entityUrn")
+    else:
+        actor_urn = actor_ref
+        actor = index.get(actor_urn)
+    if not isinstance(actor, dict):
+        return {"entityUrn": actor_urn} if actor_urn else None
+
+    # Profiles often appear as miniProfile entries or profile view models.
+    name = None
+    first = actor.get("firstName") or actor.get("localizedFirstName")
+    last = actor.get("lastName") or actor.get("localizedLastName")
+    if first or last:
+        name = " ".join(filter(None, [first, last]))
+
+    public_id = actor.get("publicIdentifier")
+    if not public_id and isinstance(actor.get("miniProfile"), dict):
+        mini = actor["miniProfile"]
+        public_id = mini.get("publicIdentifier")
+        if not name:
+            first = mini.get("firstName") or mini.get("localizedFirstName")
+            last = mini.get("lastName") or mini.get("localizedLastName")
+            if first or last:
+                name = " ".join(filter(None, [first, last]))
+
+    return {
+        "entityUrn": actor_urn,
+        "name": name,
+        "publicIdentifier": public_id,
+    }
+
+
+def legacy_simplify_content_entities(content: Any) -> List[Dict[str, Any]]:
+    entities: List[Dict[str, Any]] = []
+    if isinstance(content, dict):
+        if "contentEntities" in content and isinstance(content["contentEntities"], list):
+            for entity in content["contentEntities"]:
+                if not isinstance(entity, dict):
+                    continue
+                simplified = {
+                    "title": legacy_extract_text_block(entity.get("title")),
+                    "entity": entity.get("entity"),
+                    "thumbnails": entity.get("thumbnails"),
+                    "landingUrl": entity.get("landingUrl"),
+                }
+                entities.append(simplified)
+        # Recursively inspect nested dicts for additional collections.
+        for value in content.values():
+            if isinstance(value, dict):
+                entities.extend(legacy_simplify_content_entities(value))
+            elif isinstance(value, list):
+                for item in value:
+                    entities.extend(legacy_simplify_content_entities(item))
+    elif isinstance(content, list):
+        for item in content:
+            entities.extend(legacy_simplify_content_entities(item))
+    return entities
+
+
+def legacy_simplify_update(
+    update: Dict[str, Any],
+    index: Dict[str, Dict[str, Any]],
+    include_raw: bool,
+    social_counts: Dict[str, Dict[str, Any]],
+) -> Dict[str, Any]:
+    commentary = None
+    for key in ("commentaryV2", "commentary", "header", "body"):
+        if key in update:
+            commentary = legacy_extract_text_block(update[key])
+            if commentary:
+                break
+
+    actor_info = legacy_simplify_actor(update.get("actor") or update.get("actorUrn"), index)
+    content_entities = legacy_simplify_content_entities(update.get("content"))
+
+    entity_urn = update.get("entityUrn")
+    simplified: Dict[str, Any] = {
+        "entityUrn": update.get("entityUrn"),
+        "type": update.get("updateType") or update.get("$type"),
+        "actor": actor_info,
+        "permalink": update.get("permalink") or update.get("updateMetadata", {}).get("permalink"),
+        "lifecycleState": update.get("lifecycleState"),
+        "createdAt": update.get("createdAt")
+        or update.get("firstPublishedAt")
+        or update.get("lastModified"),
+        "commentary": commentary,
+        "contentEntities": content_entities if content_entities else None,
+    }
+
+    social = None
+    if isinstance(entity_urn, str):
+        social = social_counts.get(entity_urn)
+        if not social and entity_urn.endswith(")"):
+            # Strip update URN wrapper to match social counts keyed by activity URN.
+            inner_start = entity_urn.find("(")
+            if inner_start != -1:
+                inner = entity_urn[inner_start + 1 : -1]
+                social = social_counts.get(inner)
+    if not social:
+        # Social counts can also be stored under preDashEntityUrn.
+        pre_dash = update.get("preDashEntityUrn") or update.get("dashEntityUrn")
+        if isinstance(pre_dash, str):
+            social = social_counts.get(pre_dash)
+
+    if isinstance(social, dict):
+        simplified["numLikes"] = social.get("numLikes")
+        simplified["numComments"] = social.get("numComments")
+        simplified["numShares"] = social.get("numShares")
+
+    if not simplified["contentEntities"]:
+        simplified.pop("contentEntities")
+
+    if include_raw:
+        simplified["raw"] = update
+
+    return simplified
+
+
+Workload = List[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]]
+
+
+def load_workload(paths: List[str]) -> Workload:
+    """Return ``(update, index, social_counts)`` triples for every recorded update."""
+    workload: Workload = []
+    for path in paths:
+        with open(path, "rb") as handle:
+            payload = json_backend.loads(handle.read())
+        index = index_included(payload)
+        social_counts: Dict[str, Dict[str, Any]] = {}
+        harvest_social_counts(payload, social_counts)
+        order, updates = collect_updates(payload)
+        workload.extend((updates[urn], index, social_counts) for urn in order)
+    return workload
+
+
+def with_all_fields(workload: Workload) -> Workload:
+    """Copies of ``workload`` updates that also carry every field the baseline reads."""
+    extended: Workload = []
+    for number, (update, index, counts) in enumerate(workload):
+        content = {
+            "contentEntities": [
+                {
+                    "title": {"text": f"Attachment {number}"},
+                    "entity": f"urn:li:digitalmediaAsset:{number}",
+                    "landingUrl": f"https://example.com/{number}",
+                }
+            ],
+            "original": update.get("content"),
+        }
+        extended.append(
+            (
+                {
+                    **update,
+                    "permalink": f"https://www.linkedin.com/feed/update/{number}",
+                    "lifecycleState": "PUBLISHED",
+                    "createdAt": 1_700_000_000_000 + number,
+                    "content": content,
+                },
+                index,
+                counts,
+            )
+        )
+    return extended
+
+
+def run_legacy(workload: Workload) -> List[Dict[str, Any]]:
+    return [legacy_simplify_update(update, index, False, counts) for update, index, counts in workload]
+
+
+def run_iterative(workload: Workload) -> List[Dict[str, Any]]:
+    caches: Dict[int, Dict[Any, Any]] = {}
+    return [
+        simplify_update(update, index, False, counts, caches.setdefault(id(index), {}))
+        for update, index, counts in workload
+    ]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark simplify_update on recorded pages")
+    parser.add_argument(
+        "--page",
+        action="append",
+        default=[],
+        help="Raw GraphQL page with profile updates; can be repeated (default: mail.json).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=100,
+        help="Timing repetitions; the best run is reported (default: 100).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    workload = load_workload(args.page or ["mail.json"])
+    if not workload:
+        raise SystemExit("No updates found in the given pages.")
+
+    checked = workload + with_all_fields(workload)
+    if run_legacy(checked) != run_iterative(checked):
+        raise SystemExit("Iterative extraction diverges from the recursive baseline.")
+
+    runners: List[Tuple[str, Callable[[Workload], Any]]] = [
+        ("recursive", run_legacy),
+        ("iterative", run_iterative),
+    ]
+    print(f"{len(workload)} updates, best of {args.repeat}\n")
+    print(f"{'implementation':<16} {'ms':>9} {'updates/s':>12}")
+    for name, runner in runners:
+        elapsed = best_of(lambda: runner(workload), args.repeat)
+        print(f"{name:<16} {elapsed * 1000:>9.3f} {len(workload) / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
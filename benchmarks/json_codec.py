@@ -0,0 +1,111 @@
+"""Compare JSON decode/encode cost of the stdlib and orjson backends.
+
+Decoding is measured per recorded GraphQL page (raw bytes, as returned in
+``response.content``) and encoding per output document, in both the indented
+and ``--compact`` layouts.
+
+Example usage:
+
+    python -m benchmarks.json_codec --page mail.json --output-file posts.json --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _stdlib_codec() -> Dict[str, Callable[..., Any]]:
+    return {
+        "decode": lambda data: json.loads(data),
+        "pretty": lambda obj: json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8"),
+        "compact": lambda obj: json.dumps(
+            obj, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8"),
+    }
+
+
+def _orjson_codec() -> Dict[str, Callable[..., Any]]:
+    return {
+        "decode": orjson.loads,
+        "pretty": lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2),
+        "compact": orjson.dumps,
+    }
+
+
+def available_codecs() -> List[Tuple[str, Dict[str, Callable[..., Any]]]]:
+    codecs = [("json", _stdlib_codec())]
+    if orjson is not None:
+        codecs.append(("orjson", _orjson_codec()))
+    return codecs
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark JSON backends on recorded payloads")
+    parser.add_argument(
+        "--page",
+        action="append",
+        default=[],
+        help="Raw GraphQL page to decode; can be repeated (default: mail.json).",
+    )
+    parser.add_argument(
+        "--output-file",
+        action="append",
+        default=[],
+        help="JSON document to re-encode; can be repeated (default: posts.json).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=20,
+        help="Timing repetitions; the best run is reported (default: 20).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    pages = args.page or ["mail.json"]
+    outputs = args.output_file or ["posts.json"]
+    codecs = available_codecs()
+    if orjson is None:
+        print("orjson is not installed; reporting the stdlib backend only\n")
+
+    print(f"{'decode page':<40} {'backend':<8} {'bytes':>10} {'ms':>9}")
+    for path in pages:
+        with open(path, "rb") as handle:
+            raw = handle.read()
+        for name, codec in codecs:
+            elapsed = best_of(lambda: codec["decode"](raw), args.repeat)
+            print(f"{path:<40} {name:<8} {len(raw):>10} {elapsed * 1000:>9.3f}")
+
+    print(f"\n{'encode output':<40} {'backend':<8} {'layout':<8} {'bytes':>10} {'ms':>9}")
+    for path in outputs:
+        with open(path, "rb") as handle:
+            document = json.loads(handle.read())
+        for name, codec in codecs:
+            for layout in ("pretty", "compact"):
+                encoder = codec[layout]
+                size = len(encoder(document))
+                elapsed = best_of(lambda: encoder(document), args.repeat)
+                print(f"{path:<40} {name:<8} {layout:<8} {size:>10} {elapsed * 1000:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""Parser microbenchmarks on synthetic pages, with regression gates.
+
+Each case runs one parsing entry point over pages from
+:mod:`benchmarks.synthetic` and records throughput and peak traced memory
+(``tracemalloc``, one extra run). A timing sample repeats the case until it
+lasts at least 50 ms, and the best of ``--repeat`` samples in each of
+``--rounds`` interleaved rounds is reported. Cases that still look slower than
+the gate are measured again up to ``--retries`` times before they count as
+regressions, so a burst of load on the runner does not fail the build:
+
+    get_updates_section, extract_pagination_token   pages/s
+    collect_social_metadata, collect_owned_posts    included entities/s
+    simplify_update                                 updates/s
+    fetchv2.derive_posts                            included entities/s
+
+With ``--save-baseline`` the results are written to ``--baseline``. Later
+runs compare against it and exit non-zero when a case is slower than
+``--max-slowdown`` or uses more than ``--max-memory-growth`` extra peak
+memory, or when there is no baseline to compare against. Baselines are
+machine-specific: record one per CI runner (e.g. cached between jobs) and
+point ``--baseline`` at it.
+
+Example usage:
+
+    python -m benchmarks.parsers --updates 500 --save-baseline
+    python -m benchmarks.parsers --updates 500 --max-slowdown 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+import json_backend
+import fetch_linkedin_profile_updates as updates_module
+from benchmarks.json_codec import best_of
+from benchmarks.synthetic import generate_page
+from lkvanity._loader import load_script
+
+OWNER_ID = "ACoAABenchmarkOwner0000000000000000000"
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "parsers_baseline.json")
+MIN_SAMPLE_SECONDS = 0.05
+
+
+class Case(NamedTuple):
+    name: str
+    unit: str
+    items: int
+    run: Callable[[], Any]
+
+
+def build_cases(pages: List[Dict[str, Any]], owner_id: str) -> List[Case]:
+    fetchv2 = load_script("fetchv2")
+    included = [item for page in pages for item in page["included"]]
+    prepared: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Dict[str, Any]]]] = []
+    for page in pages:
+        index = updates_module.index_included(page)
+        counts: Dict[str, Dict[str, Any]] = {}
+        updates_module.harvest_social_counts(page, counts)
+        order, by_urn = updates_module.collect_updates(page)
+        prepared.extend((by_urn[urn], index, counts) for urn in order)
+
+    def simplify_all() -> None:
+        for update, index, counts in prepared:
+            updates_module.simplify_update(update, index, False, counts, {})
+
+    return [
+        Case(
+            "get_updates_section",
+            "pages",
+            len(pages),
+            lambda: [updates_module.get_updates_section(page) for page in pages],
+        ),
+        Case(
+            "extract_pagination_token",
+            "pages",
+            len(pages),
+            lambda: [updates_module.extract_pagination_token(page) for page in pages],
+        ),
+        Case(
+            "collect_social_metadata",
+            "entities",
+            len(included),
+            lambda: [updates_module.collect_social_metadata(page) for page in pages],
+        ),
+        Case(
+            "collect_owned_posts",
+            "entities",
+            len(included),
+            lambda: [updates_module.collect_owned_posts(page, owner_id) for page in pages],
+        ),
+        Case("simplify_update", "updates", len(prepared), simplify_all),
+        Case(
+            "derive_posts",
+            "entities",
+            len(included),
+            lambda: fetchv2.derive_posts(included, owner_id),
+        ),
+    ]
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def seconds_per_run(run: Callable[[], Any], repeat: int) -> float:
+    """Best of ``repeat`` samples, each looping ``run`` for at least MIN_SAMPLE_SECONDS."""
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            run()
+        if time.perf_counter() - started >= MIN_SAMPLE_SECONDS:
+            break
+        loops *= 2
+
+    def sample() -> None:
+        for _ in range(loops):
+            run()
+
+    return best_of(sample, repeat) / loops
+
+
+def measure(cases: List[Case], repeat: int, rounds: int) -> Dict[str, Dict[str, Any]]:
+    # Rounds interleave the cases so drift on the machine hits all of them alike.
+    elapsed_by_case: Dict[str, float] = {case.name: float("inf") for case in cases}
+    for _ in range(rounds):
+        for case in cases:
+            elapsed = seconds_per_run(case.run, repeat)
+            elapsed_by_case[case.name] = min(elapsed_by_case[case.name], elapsed)
+    results: Dict[str, Dict[str, Any]] = {}
+    for case in cases:
+        elapsed = elapsed_by_case[case.name]
+        results[case.name] = {
+            "unit": case.unit,
+            "items": case.items,
+            "perSecond": case.items / elapsed if elapsed else float("inf"),
+            "peakBytes": peak_memory(case.run),
+        }
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    max_slowdown: float,
+    max_memory_growth: float,
+) -> List[str]:
+    failures: List[str] = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        floor = previous["perSecond"] * (1 - max_slowdown)
+        if current["perSecond"] < floor:
+            failures.append(
+                f"{name}: {current['perSecond']:,.0f} {current['unit']}/s is below "
+                f"{floor:,.0f} (baseline {previous['perSecond']:,.0f})"
+            )
+        ceiling = previous["peakBytes"] * (1 + max_memory_growth)
+        if current["peakBytes"] > ceiling:
+            failures.append(
+                f"{name}: peak {current['peakBytes']:,} B exceeds {ceiling:,.0f} B "
+                f"(baseline {previous['peakBytes']:,} B)"
+            )
+    return failures
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Parser microbenchmarks with regression gates")
+    parser.add_argument("--updates", type=int, default=200, help="Updates per page (default: 200).")
+    parser.add_argument("--pages", type=int, default=3, help="Synthetic pages (default: 3).")
+    parser.add_argument(
+        "--org-reactions",
+        type=int,
+        default=20,
+        help="Organization reactions per page (default: 20).",
+    )
+    parser.add_argument("--depth", type=int, default=3, help="Content nesting depth (default: 3).")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed (default: 0).")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Timing samples per round; the best one counts (default: 5).",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=3,
+        help="Interleaved measurement rounds (default: 3).",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="Re-measure cases below the throughput gate this many times (default: 2).",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=DEFAULT_BASELINE,
+        help="Baseline JSON to compare against or write (default: benchmarks/parsers_baseline.json).",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write the results as the new baseline instead of comparing.",
+    )
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=0.25,
+        help="Allowed throughput drop as a fraction of the baseline (default: 0.25).",
+    )
+    parser.add_argument(
+        "--max-memory-growth",
+        type=float,
+        default=0.25,
+        help="Allowed peak memory growth as a fraction of the baseline (default: 0.25).",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    # Round-trip through JSON so every case sees freshly decoded objects.
+    pages = [
+        json_backend.loads(
+            json_backend.dumps_bytes(
+                generate_page(
+                    updates=args.updates,
+                    org_reactions=args.org_reactions,
+                    depth=args.depth,
+                    seed=args.seed + number,
+                    owner_id=OWNER_ID,
+                    start=number * args.updates,
+                )
+            )
+        )
+        for number in range(args.pages)
+    ]
+    if args.repeat <= 0 or args.rounds <= 0:
+        raise SystemExit("--repeat and --rounds must be positive")
+    cases = build_cases(pages, OWNER_ID)
+    results = measure(cases, args.repeat, args.rounds)
+
+    print(f"{'case':<26} {'throughput':>16} {'peak KiB':>10}")
+    for name, result in results.items():
+        rate = f"{result['perSecond']:,.0f} {result['unit']}/s"
+        print(f"{name:<26} {rate:>16} {result['peakBytes'] / 1024:>10,.1f}")
+
+    config = {
+        "updates": args.updates,
+        "pages": args.pages,
+        "orgReactions": args.org_reactions,
+        "depth": args.depth,
+        "seed": args.seed,
+    }
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json_backend.dump({"config": config, "results": results}, handle)
+            handle.write("\n")
+        print(f"\nSaved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        # A missing baseline must not pass the gate silently, e.g. on a fresh CI checkout.
+        print(
+            f"\nNo baseline at {args.baseline}; run with --save-baseline to record one.",
+            file=sys.stderr,
+        )
+        return 1
+    with open(args.baseline, "rb") as handle:
+        baseline = json_backend.loads(handle.read())
+    if baseline.get("config") != config:
+        raise SystemExit(
+            f"Baseline was recorded with {baseline.get('config')}; rerun with the same "
+            "workload flags or save a new baseline."
+        )
+    for _ in range(args.retries):
+        slow = [
+            case
+            for case in cases
+            if case.name in baseline["results"]
+            and results[case.name]["perSecond"]
+            < baseline["results"][case.name]["perSecond"] * (1 - args.max_slowdown)
+        ]
+        if not slow:
+            break
+        print(f"Re-measuring {', '.join(case.name for case in slow)}", file=sys.stderr)
+        for name, result in measure(slow, args.repeat, args.rounds).items():
+            if result["perSecond"] > results[name]["perSecond"]:
+                results[name] = result
+    failures = compare(results, baseline["results"], args.max_slowdown, args.max_memory_growth)
+    if failures:
+        print("\nRegressions:", file=sys.stderr)
+        for failure in failures:
+            print(f"  {failure}", file=sys.stderr)
+        return 1
+    print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
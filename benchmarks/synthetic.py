@@ -0,0 +1,396 @@
+"""Generate voyager-shaped GraphQL profile-update pages at arbitrary scale.
+
+Pages mirror the recorded ``mail.json`` layout: ``data`` holds the
+``feedDashProfileUpdatesByMemberShareFeed`` collection (``*elements``, paging
+and a pagination token) and ``included`` holds normalized entities:
+
+* ``feed.Update`` records with an actor view model, a ``commentary`` text view
+  model, a ``content`` union (every component key present, one populated and
+  nested ``depth`` levels deep) and ``socialContent.shareUrl`` carrying the
+  profile id the way LinkedIn's ``rcm=`` parameter does;
+* ``SocialActivityCounts`` for activity and ugcPost URNs, some with
+  ``reactionByOrganizationActor`` set (organization reactions);
+* ``SocialDetail`` and ``Profile`` records that link them together.
+
+Activity ids are real-looking snowflakes (``publishedAt << 22`` plus
+sequence bits), so ``extract_snowflake_timestamp`` recovers the timestamps.
+Output is deterministic for a given ``seed``.
+
+Example usage:
+
+    python -m benchmarks.synthetic --updates 500 --pages 4 --output-dir synthetic/
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import os
+import random
+import string
+from typing import Any, Dict, List, Optional
+
+import json_backend
+
+UPDATE_TYPE = "com.linkedin.voyager.dash.feed.Update"
+COUNTS_TYPE = "com.linkedin.voyager.dash.feed.SocialActivityCounts"
+CONTENT_COMPONENTS = (
+    "articleComponent",
+    "imageComponent",
+    "linkedInVideoComponent",
+    "documentComponent",
+    "pollComponent",
+    "eventComponent",
+    "celebrationComponent",
+    "carouselComponent",
+    "jobComponent",
+    "promoComponent",
+)
+WORDS = (
+    "growth founder hiring launch product team sales code learning community "
+    "data cloud design story lessons today week customers market build ship"
+).split()
+_ID_ALPHABET = string.ascii_letters + string.digits + "-_"
+_RECIPE = ["com.linkedin.0000000000000000000000000000synth"]
+
+
+def profile_id(rng: random.Random) -> str:
+    return "ACoAA" + "".join(rng.choice(_ID_ALPHABET) for _ in range(34))
+
+
+def snowflake(published_ms: int, rng: random.Random) -> int:
+    return (published_ms << 22) | rng.getrandbits(22)
+
+
+def _text_view_model(text: str, profile_urn: Optional[str] = None) -> Dict[str, Any]:
+    attributes: List[Dict[str, Any]] = []
+    if profile_urn:
+        attributes.append(
+            {
+                "start": 0,
+                "length": min(len(text), 8),
+                "detailData": {"*profileFullName": profile_urn, "hyperlink": None, "hashtag": None},
+                "$recipeTypes": _RECIPE,
+                "$type": "com.linkedin.voyager.dash.common.text.TextAttribute",
+            }
+        )
+    return {
+        "textDirection": "FIRST_STRONG",
+        "text": text,
+        "attributesV2": attributes,
+        "accessibilityTextAttributesV2": [],
+        "accessibilityText": None,
+        "$recipeTypes": _RECIPE,
+        "$type": "com.linkedin.voyager.dash.common.text.TextViewModel",
+    }
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _vector_image(rng: random.Random, asset: str) -> Dict[str, Any]:
+    return {
+        "digitalmediaAsset": f"urn:li:digitalmediaAsset:{asset}",
+        "attribution": None,
+        "artifacts": [
+            {
+                "width": size,
+                "height": size,
+                "fileIdentifyingUrlPathSegment": f"{size}/{asset}/0/{rng.getrandbits(40)}",
+                "expiresAt": 1761782400000,
+                "$recipeTypes": _RECIPE,
+                "$type": "com.linkedin.common.VectorArtifact",
+            }
+            for size in (160, 480, 800)
+        ],
+        "rootUrl": f"https://media.licdn.com/dms/image/v2/{asset}/feedshare-shrink_",
+        "$recipeTypes": _RECIPE,
+        "$type": "com.linkedin.common.VectorImage",
+    }
+
+
+def _nested_component(rng: random.Random, depth: int) -> Dict[str, Any]:
+    asset = "".join(rng.choice(_ID_ALPHABET) for _ in range(19))
+    node: Dict[str, Any] = {
+        "attributes": [
+            {
+                "scalingType": "ASPECT_FIT",
+                "detailData": {
+                    "vectorImage": _vector_image(rng, asset),
+                    "companyLogo": None,
+                    "profilePicture": None,
+                    "imageUrl": None,
+                },
+                "tapTargets": [],
+                "$type": "com.linkedin.voyager.dash.common.image.ImageAttribute",
+            }
+        ],
+        "accessibilityText": _sentence(rng, 6),
+        "$type": "com.linkedin.voyager.dash.common.image.ImageViewModel",
+    }
+    for level in range(depth):
+        node = {
+            "images": [node],
+            "navigationContext": None,
+            "level": level,
+            "$type": "com.linkedin.voyager.dash.feed.component.image.ImageComponent",
+        }
+    return node
+
+
+def _content(rng: random.Random, depth: int) -> Dict[str, Any]:
+    populated = rng.choice(CONTENT_COMPONENTS)
+    content: Dict[str, Any] = {name: None for name in CONTENT_COMPONENTS}
+    content[populated] = _nested_component(rng, depth)
+    content["$recipeTypes"] = _RECIPE
+    content["$type"] = "com.linkedin.voyager.dash.feed.render.FeedComponent"
+    return content
+
+
+def _actor(owner_urn: str, vanity: str, name: str) -> Dict[str, Any]:
+    return {
+        "image": {
+            "attributes": [
+                {
+                    "detailData": {
+                        "nonEntityProfilePicture": {
+                            "*profile": owner_urn,
+                            "$type": "com.linkedin.voyager.dash.common.image.NonEntityProfilePicture",
+                        }
+                    },
+                    "$type": "com.linkedin.voyager.dash.common.image.ImageAttribute",
+                }
+            ],
+            "$type": "com.linkedin.voyager.dash.common.image.ImageViewModel",
+        },
+        "name": _text_view_model(name, owner_urn),
+        "description": _text_view_model("Founder"),
+        "navigationContext": {
+            "actionTarget": f"https://www.linkedin.com/in/{vanity}?miniProfileUrn={owner_urn.replace(':', '%3A')}",
+            "$type": "com.linkedin.voyager.dash.feed.navigation.FeedNavigationContext",
+        },
+        "$recipeTypes": _RECIPE,
+        "$type": "com.linkedin.voyager.dash.feed.component.actor.ActorComponent",
+    }
+
+
+def _update_urn(activity: int) -> str:
+    return f"urn:li:fsd_update:(urn:li:activity:{activity},MEMBER_SHARES,EMPTY,DEFAULT,false)"
+
+
+def generate_page(
+    updates: int = 20,
+    social_counts: Optional[int] = None,
+    org_reactions: int = 0,
+    depth: int = 3,
+    seed: int = 0,
+    owner_id: Optional[str] = None,
+    start_ms: int = 1_756_000_000_000,
+    spacing_ms: int = 6 * 3_600_000,
+    start: int = 0,
+    next_token: bool = True,
+) -> Dict[str, Any]:
+    """Return one GraphQL page with ``updates`` feed updates and their entities.
+
+    ``social_counts`` defaults to one per update; extra counts refer to posts
+    that are not on the page (as in real reshare-heavy pages). The first
+    ``org_reactions`` counts carry ``reactionByOrganizationActor``.
+    """
+    rng = random.Random(seed)
+    owner_id = owner_id or profile_id(rng)
+    owner_urn = f"urn:li:fsd_profile:{owner_id}"
+    vanity = "creator-" + owner_id[-6:].lower()
+    social_counts = updates if social_counts is None else social_counts
+
+    included: List[Dict[str, Any]] = []
+    elements: List[str] = []
+    activities: List[int] = []
+    others = [profile_id(rng) for _ in range(max(1, updates // 4))]
+    for other in others:
+        included.append(
+            {
+                "firstName": rng.choice(WORDS).title(),
+                "lastName": rng.choice(WORDS).title(),
+                "entityUrn": f"urn:li:fsd_profile:{other}",
+                "publicIdentifier": f"member-{other[-6:].lower()}",
+                "$recipeTypes": _RECIPE,
+                "$type": "com.linkedin.voyager.dash.identity.profile.Profile",
+            }
+        )
+
+    for position in range(updates):
+        published = start_ms - (start + position) * spacing_ms
+        activity = snowflake(published, rng)
+        activities.append(activity)
+        authored = rng.random() < 0.8
+        actor_id = owner_id if authored else rng.choice(others)
+        actor_urn = f"urn:li:fsd_profile:{actor_id}"
+        slug = "-".join(rng.choice(WORDS) for _ in range(5))
+        share_url = (
+            f"https://www.linkedin.com/posts/{vanity}_{slug}-activity-{activity}-"
+            f"{''.join(rng.choice(_ID_ALPHABET) for _ in range(4))}"
+            f"?utm_source=social_share_send&utm_medium=member_desktop_web&rcm={owner_id}"
+        )
+        update_urn = _update_urn(activity)
+        elements.append(update_urn)
+        included.append(
+            {
+                "metadata": {
+                    "backendUrn": f"urn:li:activity:{activity}",
+                    "shareUrn": f"urn:li:share:{activity - rng.getrandbits(20)}",
+                    "shareAudience": "PUBLIC",
+                    "trackingData": {
+                        "trackingId": base64.b64encode(rng.randbytes(16)).decode("ascii"),
+                        "$type": "com.linkedin.voyager.dash.feed.metadata.TrackingData",
+                    },
+                    "$type": "com.linkedin.voyager.dash.feed.metadata.UpdateMetadata",
+                },
+                "socialContent": {
+                    "shareUrl": share_url,
+                    "hideCommentsCount": False,
+                    "$type": "com.linkedin.voyager.dash.social.SocialContent",
+                },
+                "content": _content(rng, depth),
+                "entityUrn": update_urn,
+                "preDashEntityUrn": update_urn.replace("fsd_update", "fs_updateV2"),
+                "actor": _actor(actor_urn, vanity, "Synthetic Creator"),
+                "commentary": {
+                    "numLines": 3,
+                    "text": _text_view_model(_sentence(rng, rng.randint(8, 60))),
+                    "$type": "com.linkedin.voyager.dash.feed.component.commentary.CommentaryComponent",
+                },
+                "header": None,
+                "resharedUpdate": None,
+                "*socialDetail": (
+                    f"urn:li:fsd_socialDetail:(urn:li:activity:{activity},"
+                    f"urn:li:activity:{activity},urn:li:highlightedReply:-)"
+                ),
+                "$recipeTypes": _RECIPE,
+                "$type": UPDATE_TYPE,
+            }
+        )
+        included.append(
+            {
+                "threadUrn": f"urn:li:activity:{activity}",
+                "*totalSocialActivityCounts": f"urn:li:fsd_socialActivityCounts:urn:li:activity:{activity}",
+                "entityUrn": f"urn:li:fsd_socialDetail:(urn:li:activity:{activity},urn:li:activity:{activity},urn:li:highlightedReply:-)",
+                "$type": "com.linkedin.voyager.dash.social.SocialDetail",
+            }
+        )
+
+    for position in range(social_counts):
+        if position < len(activities):
+            target = f"urn:li:activity:{activities[position]}"
+        else:
+            published = start_ms - (start + position) * spacing_ms
+            target = f"urn:li:ugcPost:{snowflake(published, rng)}"
+        likes = int(rng.paretovariate(1.2) * 5)
+        organization = None
+        if position < org_reactions:
+            organization = {
+                "reactionType": "LIKE",
+                "actorUrn": f"urn:li:fsd_company:{rng.randint(1000, 99999999)}",
+                "$type": "com.linkedin.voyager.dash.feed.social.OrganizationReaction",
+            }
+        included.append(
+            {
+                "reactionByOrganizationActor": organization,
+                "numLikes": likes,
+                "numComments": rng.randint(0, max(1, likes // 3)),
+                "numShares": rng.randint(0, max(1, likes // 20)),
+                "liked": rng.random() < 0.3,
+                "urn": target,
+                "entityUrn": f"urn:li:fsd_socialActivityCounts:{target}",
+                "reactionTypeCounts": [
+                    {
+                        "count": likes,
+                        "reactionType": "LIKE",
+                        "$type": "com.linkedin.voyager.dash.feed.social.ReactionTypeCount",
+                    }
+                ],
+                "highlightedReactorName": _text_view_model(
+                    rng.choice(WORDS).title(), f"urn:li:fsd_profile:{rng.choice(others)}"
+                ),
+                "$recipeTypes": _RECIPE,
+                "$type": COUNTS_TYPE,
+            }
+        )
+
+    token = None
+    if next_token and activities:
+        token = base64.b64encode(
+            f"urn:li:activity:{activities[-1]}-{start_ms}".encode("ascii")
+        ).decode("ascii")
+    return {
+        "data": {
+            "data": {
+                "feedDashProfileUpdatesByMemberShareFeed": {
+                    "metadata": {
+                        "paginationToken": token,
+                        "paginationTokenExpiryTime": None,
+                        "$type": "com.linkedin.voyager.dash.common.InfiniteScrollMetadata",
+                    },
+                    "paging": {
+                        "count": updates,
+                        "start": start,
+                        "total": 0,
+                        "$type": "com.linkedin.restli.common.CollectionMetadata",
+                    },
+                    "*elements": elements,
+                    "$type": "com.linkedin.restli.common.CollectionResponse",
+                },
+                "$type": "com.linkedin.graphql.Query",
+            },
+            "extensions": {"webMetadata": {}},
+        },
+        "meta": {"microSchema": {"isGraphQL": True, "version": "2.1", "types": {}}},
+        "included": included,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Write synthetic voyager GraphQL pages")
+    parser.add_argument("--updates", type=int, default=20, help="Updates per page (default: 20).")
+    parser.add_argument(
+        "--social-counts",
+        type=int,
+        help="SocialActivityCounts per page (default: one per update).",
+    )
+    parser.add_argument(
+        "--org-reactions",
+        type=int,
+        default=0,
+        help="Counts per page that carry an organization reaction (default: 0).",
+    )
+    parser.add_argument("--depth", type=int, default=3, help="Nesting depth of content (default: 3).")
+    parser.add_argument("--pages", type=int, default=1, help="Pages to write (default: 1).")
+    parser.add_argument("--profile-id", help="Owner profile id (default: random).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0).")
+    parser.add_argument("--output-dir", required=True, help="Directory for page-NNNN.json files.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    owner = args.profile_id or profile_id(random.Random(args.seed))
+    os.makedirs(args.output_dir, exist_ok=True)
+    for number in range(args.pages):
+        page = generate_page(
+            updates=args.updates,
+            social_counts=args.social_counts,
+            org_reactions=args.org_reactions,
+            depth=args.depth,
+            seed=args.seed + number,
+            owner_id=owner,
+            start=number * args.updates,
+            next_token=number < args.pages - 1,
+        )
+        path = os.path.join(args.output_dir, f"page-{number:04d}.json")
+        with open(path, "w", encoding="utf-8") as handle:
+            json_backend.dump(page, handle, compact=True)
+    print(f"Wrote {args.pages} pages for profile {owner} to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
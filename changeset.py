@@ -0,0 +1,135 @@
+"""Change-only output: diff fresh results against the previous snapshot.
+
+The previous output (a JSON list of post or update records, as written by
+``fetchv2 --posts-output`` or ``fetch_linkedin_profile_updates.py --output``
+with or without ``--ndjson``) is loaded into a hash index of
+``record key -> count fingerprint``. Diffing a new result list against it
+yields only the records that are new and the records whose counts moved, so
+downstream writes scale with activity rather than with history size.
+
+Records are keyed by ``urn``, then ``entityUrn``, then ``$id``. Records that
+carry none of the count fields are fingerprinted by their canonical JSON.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import json_backend
+
+KEY_CANDIDATES = ("urn", "entityUrn", "$id")
+COUNT_FIELDS = ("numLikes", "numComments", "numShares")
+
+
+def _key_field(record: Dict[str, Any]) -> Optional[str]:
+    for candidate in KEY_CANDIDATES:
+        if isinstance(record.get(candidate), str):
+            return candidate
+    return None
+
+
+def record_key(record: Dict[str, Any]) -> str:
+    field = _key_field(record)
+    return record[field] if field else json_backend.canonical_key(record)
+
+
+def fingerprint(record: Dict[str, Any]) -> Hashable:
+    counts = tuple(record.get(field) for field in COUNT_FIELDS)
+    if any(value is not None for value in counts):
+        return counts
+    return hash(json_backend.canonical_key(record))
+
+
+def build_index(records: Iterable[Any]) -> Dict[str, Hashable]:
+    return {
+        record_key(record): fingerprint(record)
+        for record in records
+        if isinstance(record, dict)
+    }
+
+
+def load_index(path: str) -> Dict[str, Hashable]:
+    """Index a previous output file; a missing or empty file is an empty snapshot."""
+    if not os.path.exists(path):
+        return {}
+    from record_index import IndexedRecords, index_path
+
+    if os.path.exists(index_path(path)):
+        try:
+            records = IndexedRecords(path)
+        except ValueError:
+            # A stale index left behind by an --ndjson run; the file is plain JSON now.
+            records = None
+        if records is not None:
+            with records:
+                return build_index(records)
+    with open(path, "rb") as handle:
+        raw = handle.read()
+    try:
+        previous = json_backend.loads(raw) if raw.strip() else []
+    except ValueError:
+        # --ndjson output whose .idx sidecar is missing: one record per line.
+        previous = [json_backend.loads(line) for line in raw.splitlines() if line.strip()]
+    if isinstance(previous, dict) and "included" in previous:
+        # Raw fetchv2 output wraps entities in {"included": [...]}.
+        previous = previous["included"] or []
+    elif isinstance(previous, dict):
+        # A one-line NDJSON file holding a single record.
+        previous = [previous]
+    return build_index(previous)
+
+
+def diff_records(
+    records: Iterable[Dict[str, Any]],
+    index: Dict[str, Hashable],
+    base: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Return ``{"base", "total", "unchanged", "added", "changed"}`` for ``records``.
+
+    ``added`` holds full records. ``changed`` holds the key field plus the
+    current count fields, or the full record when it has no count fields.
+    """
+    added: List[Dict[str, Any]] = []
+    changed: List[Dict[str, Any]] = []
+    total = 0
+    seen: set[str] = set()
+    for record in records:
+        key = record_key(record)
+        if key in seen:
+            continue
+        seen.add(key)
+        total += 1
+        previous = index.get(key)
+        if previous is None:
+            added.append(record)
+            continue
+        current = fingerprint(record)
+        if current == previous:
+            continue
+        if isinstance(current, tuple):
+            delta: Dict[str, Any] = {_key_field(record) or "urn": key}
+            delta.update((field, record.get(field)) for field in COUNT_FIELDS)
+            changed.append(delta)
+        else:
+            changed.append(record)
+    return {
+        "base": base,
+        "total": total,
+        "unchanged": total - len(added) - len(changed),
+        "added": added,
+        "changed": changed,
+    }
+
+
+def write_changeset(changes: Dict[str, Any], path: Optional[str] = None) -> None:
+    """Write ``changes`` as single-line JSON to ``path`` or stdout."""
+    if path:
+        with open(path, "w", encoding="utf-8") as handle:
+            json_backend.dump(changes, handle, compact=True)
+            handle.write("\n")
+    else:
+        json_backend.dump(changes, sys.stdout, compact=True)
+        sys.stdout.write("\n")
+
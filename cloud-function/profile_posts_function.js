@@ -422,6 +422,21 @@ async function fetchProfileNetworkInfo(publicId) {
   }
 }
 
+// Concurrent requests handled by the same instance share one upstream call per key.
+const inFlight = new Map();
+
+function singleFlight(key, fn) {
+  const pending = inFlight.get(key);
+  if (pending) {
+    return pending;
+  }
+  const promise = Promise.resolve()
+    .then(fn)
+    .finally(() => inFlight.delete(key));
+  inFlight.set(key, promise);
+  return promise;
+}
+
 function requireEnv(name) {
   const value = process.env[name];
   if (!value) {
@@ -476,7 +491,10 @@ exports.profilePostsFetcher = async (req, res) => {
     const cookie = requireEnv('LINKEDIN_COOKIE');
     const csrfToken = requireEnv('LINKEDIN_CSRF_TOKEN');
 
-    const profileMetadata = await fetchProfileMetadata(requestUrl);
+    const profileMetadata = await singleFlight(
+      `urn|${requestUrl}`,
+      () => fetchProfileMetadata(requestUrl),
+    );
     let profileUrn = profileMetadata && profileMetadata.id;
     const profileUsername = profileMetadata && profileMetadata.username;
     const profileUrl = profileMetadata && profileMetadata.url || requestUrl;
@@ -492,18 +510,24 @@ exports.profilePostsFetcher = async (req, res) => {
     }
     const profileId = profileUrn.split(':').pop();
 
-    const included = await collectIncluded({
-      profileUrn,
-      cookie,
-      csrfToken,
-      count,
-      includeWebMetadata,
-      timeoutSeconds: REQUEST_TIMEOUT_SECONDS,
-    });
+    const included = await singleFlight(
+      `pages|${profileUrn}|${count}|${includeWebMetadata}`,
+      () => collectIncluded({
+        profileUrn,
+        cookie,
+        csrfToken,
+        count,
+        includeWebMetadata,
+        timeoutSeconds: REQUEST_TIMEOUT_SECONDS,
+      }),
+    );
 
     const posts = derivePosts(included, profileId);
     const vanity = profileUsername || inferVanity(profileUrl) || profileId;
-    const networkInfo = await fetchProfileNetworkInfo(vanity);
+    const networkInfo = await singleFlight(
+      `networkinfo|${vanity}`,
+      () => fetchProfileNetworkInfo(vanity),
+    );
     const docRef = db.collection('creators').doc(vanity);
     await docRef.set({
       id: profileUrn,
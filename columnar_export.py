@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""Write derived posts and raw ``included`` entities to partitioned Parquet.
+
+Datasets are laid out hive-style so that readers can prune whole directories
+before touching any file:
+
+    <root>/posts/profile=<profileId>/month=<YYYY-MM>/part-*.parquet
+    <root>/entities/profile=<profileId>/month=<YYYY-MM>/part-*.parquet
+
+The month is derived from ``publishedAt`` (or the URN snowflake when no
+timestamp is present). Entities are stored with a handful of typed columns plus
+the original JSON document so nothing is lost relative to ``org-reactions.json``.
+
+A run writes its batches as extra part files and, on :meth:`close`, compacts
+every partition it touched into a single file keyed on ``urn`` (posts) or
+``type``/``urn`` (entities), with this run's rows replacing earlier ones. Re-running
+a profile therefore refreshes its rows instead of duplicating them.
+
+``pyarrow`` is optional for the rest of the repository and is only imported
+when an export or query is actually performed.
+
+Example usage:
+
+    ./fetchv2 'urn:li:fsd_profile:ACoAAByAzQoB9-VHcgJ_Fx6moaCchiwhtPfz7rw' \
+        --parquet-dir exports/
+    python columnar_export.py exports/ --profile ACoAAByAzQoB9-VHcgJ_Fx6moaCchiwhtPfz7rw \
+        --since 2025-08-01 --until 2025-09-30
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import json_backend
+
+POSTS_DATASET = "posts"
+ENTITIES_DATASET = "entities"
+UNKNOWN_MONTH = "unknown"
+
+DATASET_KEYS: Dict[str, Sequence[str]] = {
+    POSTS_DATASET: ("urn",),
+    ENTITIES_DATASET: ("type", "urn"),
+}
+
+DEFAULT_ENTITY_TYPES: Sequence[str] = (
+    "com.linkedin.voyager.dash.feed.Update",
+    "com.linkedin.voyager.dash.feed.SocialActivityCounts",
+)
+
+
+def _require_pyarrow() -> Any:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.dataset  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as exc:
+        raise SystemExit(
+            "pyarrow is required for Parquet export/query; install it with `pip install pyarrow`"
+        ) from exc
+    return pyarrow
+
+
+def _snowflake_timestamp(urn: Any) -> Optional[int]:
+    if not isinstance(urn, str):
+        return None
+    candidate = urn.rsplit(":", 1)[-1].rstrip(")")
+    if not candidate.isdigit():
+        return None
+    return int(candidate) >> 22
+
+
+def month_partition(published_at: Optional[int]) -> str:
+    """Return the ``YYYY-MM`` partition value for a millisecond timestamp."""
+    if not isinstance(published_at, int) or published_at <= 0:
+        return UNKNOWN_MONTH
+    moment = datetime.fromtimestamp(published_at / 1000, tz=timezone.utc)
+    return moment.strftime("%Y-%m")
+
+
+def _date_to_millis(value: str, end_of_day: bool = False) -> int:
+    moment = datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    millis = int(moment.timestamp() * 1000)
+    if end_of_day:
+        millis += 86_400_000 - 1
+    return millis
+
+
+def _entity_urn(item: Dict[str, Any]) -> Optional[str]:
+    metadata = item.get("metadata")
+    if isinstance(metadata, dict) and isinstance(metadata.get("backendUrn"), str):
+        return metadata["backendUrn"]
+    for key in ("urn", "entityUrn", "$id"):
+        value = item.get(key)
+        if isinstance(value, str):
+            return value
+    return None
+
+
+def _entity_published_at(item: Dict[str, Any], urn: Optional[str]) -> Optional[int]:
+    published = item.get("publishedAt")
+    if isinstance(published, (int, float)):
+        return int(published)
+    return _snowflake_timestamp(urn)
+
+
+def compact_partition(directory: str, key_columns: Sequence[str], compression: str = "zstd") -> int:
+    """Merge the part files in ``directory`` into one, keeping the newest row per key.
+
+    Files are read oldest first (by mtime, then name), so a later row with the
+    same key replaces an earlier one. Rows with a missing key are all kept.
+    Returns the number of rows written.
+    """
+    pa = _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    names = [name for name in os.listdir(directory) if name.endswith(".parquet")]
+    paths = sorted(
+        (os.path.join(directory, name) for name in names),
+        key=lambda path: (os.path.getmtime(path), path),
+    )
+    if not paths:
+        return 0
+    tables = [pq.read_table(path) for path in paths]
+    rows: Dict[Any, Dict[str, Any]] = {}
+    for table in tables:
+        for position, row in enumerate(table.to_pylist()):
+            key = tuple(row.get(column) for column in key_columns)
+            if any(value is None for value in key):
+                key = (id(table), position)
+            rows.pop(key, None)
+            rows[key] = row
+    merged = pa.Table.from_pylist(list(rows.values()), schema=tables[-1].schema)
+    # Dot-prefixed so dataset readers skip it until it is renamed into place.
+    tmp_path = os.path.join(directory, f".compact-{uuid.uuid4().hex[:8]}.tmp")
+    pq.write_table(merged, tmp_path, compression=compression)
+    os.replace(tmp_path, os.path.join(directory, f"part-{uuid.uuid4().hex[:8]}.parquet"))
+    for path in paths:
+        os.remove(path)
+    return merged.num_rows
+
+
+class PartitionedParquetWriter:
+    """Write batches of posts/entities for a single profile to a dataset root.
+
+    Call :meth:`close` (or use the writer as a context manager) to compact the
+    touched partitions; until then a partition may hold duplicate rows.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        profile_id: str,
+        entity_types: Optional[Iterable[str]] = None,
+        compression: str = "zstd",
+    ) -> None:
+        self._pa = _require_pyarrow()
+        self.root = root.rstrip("/")
+        self.profile_id = profile_id
+        self.entity_types = set(entity_types or DEFAULT_ENTITY_TYPES)
+        self.compression = compression
+        self.batches = 0
+        self.posts_written = 0
+        self.entities_written = 0
+        self._seen_entities: set[str] = set()
+        self._run_id = uuid.uuid4().hex[:8]
+        self._touched: Dict[str, str] = {}
+
+    def __enter__(self) -> "PartitionedParquetWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, *exc: Any) -> None:
+        if exc_type is None:
+            self.close()
+
+    def _write(self, dataset: str, rows_by_month: Dict[str, List[Dict[str, Any]]], schema: Any) -> None:
+        import pyarrow.parquet as pq
+
+        for month, rows in rows_by_month.items():
+            directory = f"{self.root}/{dataset}/profile={self.profile_id}/month={month}"
+            table = self._pa.Table.from_pylist(rows, schema=schema)
+            os.makedirs(directory, exist_ok=True)
+            path = f"{directory}/part-{self._run_id}-{self.batches:05d}.parquet"
+            pq.write_table(table, path, compression=self.compression)
+            self._touched[directory] = dataset
+        self.batches += 1
+
+    def close(self) -> None:
+        """Compact every partition written to, replacing rows from earlier runs."""
+        touched, self._touched = self._touched, {}
+        for directory, dataset in touched.items():
+            compact_partition(directory, DATASET_KEYS[dataset], self.compression)
+
+    def write_posts(self, posts: Sequence[Dict[str, Any]]) -> None:
+        pa = self._pa
+        schema = pa.schema(
+            [
+                ("urn", pa.string()),
+                ("numLikes", pa.int64()),
+                ("numComments", pa.int64()),
+                ("numShares", pa.int64()),
+                ("publishedAt", pa.int64()),
+            ]
+        )
+        rows_by_month: Dict[str, List[Dict[str, Any]]] = {}
+        for post in posts:
+            published = post.get("publishedAt")
+            row = {
+                "urn": post.get("urn"),
+                "numLikes": post.get("numLikes"),
+                "numComments": post.get("numComments"),
+                "numShares": post.get("numShares"),
+                "publishedAt": published,
+            }
+            rows_by_month.setdefault(month_partition(published), []).append(row)
+        if rows_by_month:
+            self._write(POSTS_DATASET, rows_by_month, schema)
+            self.posts_written += len(posts)
+
+    def write_entities(self, included: Iterable[Any]) -> None:
+        """Persist one page of ``included`` items, skipping unselected types and repeats."""
+        pa = self._pa
+        schema = pa.schema(
+            [
+                ("type", pa.string()),
+                ("urn", pa.string()),
+                ("publishedAt", pa.int64()),
+                ("json", pa.string()),
+            ]
+        )
+        rows_by_month: Dict[str, List[Dict[str, Any]]] = {}
+        written = 0
+        for item in included:
+            if not isinstance(item, dict):
+                continue
+            type_name = item.get("$type")
+            if type_name not in self.entity_types:
+                continue
+            urn = _entity_urn(item)
+            dedupe_key = item.get("$id") or item.get("entityUrn") or urn
+            if isinstance(dedupe_key, str):
+                if dedupe_key in self._seen_entities:
+                    continue
+                self._seen_entities.add(dedupe_key)
+            published = _entity_published_at(item, urn)
+            row = {
+                "type": type_name,
+                "urn": urn,
+                "publishedAt": published,
+                "json": json_backend.dumps(item, compact=True),
+            }
+            rows_by_month.setdefault(month_partition(published), []).append(row)
+            written += 1
+        if rows_by_month:
+            self._write(ENTITIES_DATASET, rows_by_month, schema)
+            self.entities_written += written
+
+
+def _month_bounds(since: Optional[str], until: Optional[str]) -> Any:
+    import pyarrow.dataset as ds
+
+    expression = None
+    if since:
+        clause = ds.field("month") >= since[:7]
+        expression = clause if expression is None else expression & clause
+    if until:
+        clause = ds.field("month") <= until[:7]
+        expression = clause if expression is None else expression & clause
+    return expression
+
+
+def query_dataset(
+    root: str,
+    dataset: str = POSTS_DATASET,
+    profile_ids: Optional[Sequence[str]] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> Any:
+    """Return a pyarrow Table filtered by profile and ``publishedAt`` date range.
+
+    ``since``/``until`` are inclusive ``YYYY-MM-DD`` dates. Profile and month
+    predicates are evaluated against the hive partition keys, so directories
+    outside the requested range are never opened.
+    """
+    pa = _require_pyarrow()
+    import pyarrow.dataset as ds
+
+    partitioning = ds.partitioning(
+        pa.schema([("profile", pa.string()), ("month", pa.string())]),
+        flavor="hive",
+    )
+    dataset_obj = ds.dataset(
+        f"{root.rstrip('/')}/{dataset}",
+        format="parquet",
+        partitioning=partitioning,
+    )
+
+    expression = None
+    if profile_ids:
+        expression = ds.field("profile").isin(list(profile_ids))
+    month_filter = _month_bounds(since, until)
+    if month_filter is not None:
+        expression = month_filter if expression is None else expression & month_filter
+    if since:
+        clause = ds.field("publishedAt") >= _date_to_millis(since)
+        expression = clause if expression is None else expression & clause
+    if until:
+        clause = ds.field("publishedAt") <= _date_to_millis(until, end_of_day=True)
+        expression = clause if expression is None else expression & clause
+
+    return dataset_obj.to_table(
+        columns=list(columns) if columns else None,
+        filter=expression,
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Query a partitioned Parquet export written by fetchv2 --parquet-dir",
+    )
+    parser.add_argument("root", help="Dataset root passed to --parquet-dir")
+    parser.add_argument(
+        "--dataset",
+        choices=[POSTS_DATASET, ENTITIES_DATASET],
+        default=POSTS_DATASET,
+        help="Dataset to read (default: posts)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="append",
+        default=[],
+        help="Profile id to include; can be repeated (default: all profiles).",
+    )
+    parser.add_argument("--since", help="Inclusive lower bound on publishedAt (YYYY-MM-DD).")
+    parser.add_argument("--until", help="Inclusive upper bound on publishedAt (YYYY-MM-DD).")
+    parser.add_argument(
+        "--column",
+        action="append",
+        default=[],
+        help="Column to project; can be repeated (default: all columns).",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write single-line JSON instead of the indented layout.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    table = query_dataset(
+        args.root,
+        dataset=args.dataset,
+        profile_ids=args.profile or None,
+        since=args.since,
+        until=args.until,
+        columns=args.column or None,
+    )
+    json_backend.dump(table.to_pylist(), sys.stdout, compact=args.compact, ensure_ascii=False)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
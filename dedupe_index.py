@@ -0,0 +1,265 @@
+"""Persistent, memory-mapped index of 64-bit entity key hashes.
+
+Dedupe inside one run uses Python sets of full strings; this index remembers
+what earlier runs (of any profile) already stored. Keys are hashed to 64 bits
+(the same blake2b digest :mod:`spill_store` uses) and kept as a sorted array of
+``uint64`` in a file that is memory-mapped, so a lookup is a binary search over
+pages the OS shares between processes and the resident cost is 8 bytes per key
+instead of a string object plus a set slot.
+
+Entity dicts that carry like/comment/share counts (``SocialActivityCounts``
+and the update records built from them) are keyed on their identity plus
+those counts, so a post whose counts moved is new again and gets re-exported;
+immutable entities are keyed on identity alone.
+
+An optional Bloom filter (``<path>.bloom``, ~10 bits per key by default)
+answers most lookups for unseen keys without touching the array. Its header
+records the key count and largest key it was built from; a filter that does
+not match the key file (left by a flush with the filter disabled, or read
+between the two renames of a flush) is ignored.
+
+Keys added during a run stay in an in-memory set until the caller merges them
+into the file with :meth:`DedupeIndex.flush`, so a run that fails before its
+outputs are written records nothing. The flush takes an exclusive lock and
+re-reads the file first, so concurrent batch jobs can share one index.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import json_backend
+from spill_store import entity_key
+
+try:  # pragma: no cover - depends on the platform
+    import fcntl
+except ImportError:  # pragma: no cover - depends on the platform
+    fcntl = None
+
+_MAGIC = b"LKDX1" + (b"L" if sys.byteorder == "little" else b"B")
+_HEADER = struct.Struct("=6s2xQ")
+_BLOOM_MAGIC = b"LKDB1" + _MAGIC[-1:]
+# magic, bits, hashes, then the key count and largest key the filter covers.
+_BLOOM_HEADER = struct.Struct("=6s2xQQQQ")
+DEFAULT_BLOOM_BITS = 10
+# The mutable fields changeset.fingerprint compares.
+COUNT_FIELDS = ("numLikes", "numComments", "numShares")
+
+Key = Union[int, str, bytes, Dict[str, Any]]
+
+
+def hash_key(key: Key) -> int:
+    """Return the unsigned 64-bit hash of a key string, digest or entity dict."""
+    if isinstance(key, int):
+        return key
+    if isinstance(key, dict):
+        digest = entity_key(key)
+        counts = [key.get(field) for field in COUNT_FIELDS]
+        if any(value is not None for value in counts):
+            material = digest + json_backend.canonical_key(counts).encode("utf-8")
+            digest = hashlib.blake2b(material, digest_size=8).digest()
+    else:
+        material = key.encode("utf-8") if isinstance(key, str) else key
+        digest = hashlib.blake2b(material, digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _bloom_positions(value: int, bits: int, hashes: int) -> Iterable[int]:
+    # Double hashing over the two halves of an already uniform 64-bit hash.
+    low = value & 0xFFFFFFFF
+    high = (value >> 32) | 1
+    return ((low + i * high) % bits for i in range(hashes))
+
+
+class DedupeIndex:
+    """Set-like ``contains``/``add`` over 64-bit key hashes persisted at ``path``."""
+
+    def __init__(self, path: str, bloom_bits_per_key: int = DEFAULT_BLOOM_BITS) -> None:
+        self.path = path
+        self.bloom_path = f"{path}.bloom"
+        self.bloom_bits_per_key = bloom_bits_per_key
+        self._pending: Set[int] = set()
+        self._keys: Optional[memoryview] = None
+        self._key_bytes: Optional[memoryview] = None
+        self._bloom: Optional[memoryview] = None
+        self._maps: List[mmap.mmap] = []
+        self._views: List[memoryview] = []
+        self._bloom_bits = 0
+        self._bloom_hashes = 0
+        self.lookups = 0
+        self.bloom_skips = 0
+        self._open()
+
+    def __enter__(self) -> "DedupeIndex":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.stored + len(self._pending)
+
+    @property
+    def stored(self) -> int:
+        return len(self._keys) if self._keys is not None else 0
+
+    def _map_file(self, path: str, header: struct.Struct) -> Optional[mmap.mmap]:
+        if not os.path.exists(path) or os.path.getsize(path) <= header.size:
+            return None
+        with open(path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    def _view(self, mapped: mmap.mmap, start: int, end: int) -> memoryview:
+        whole = memoryview(mapped)
+        part = whole[start:end]
+        self._views.extend((whole, part))
+        return part
+
+    def _open(self) -> None:
+        self._unmap()
+        mapped = self._map_file(self.path, _HEADER)
+        if mapped is not None:
+            magic, count = _HEADER.unpack_from(mapped)
+            if magic != _MAGIC:
+                self._unmap()
+                raise ValueError(f"{self.path} is not a dedupe index for this platform")
+            self._key_bytes = self._view(mapped, _HEADER.size, _HEADER.size + count * 8)
+            self._keys = self._key_bytes.cast("Q")
+            self._views.append(self._keys)
+        mapped = self._map_file(self.bloom_path, _BLOOM_HEADER) if self.bloom_bits_per_key else None
+        if mapped is not None:
+            magic, bits, hashes, count, last = _BLOOM_HEADER.unpack_from(mapped)
+            if magic == _BLOOM_MAGIC and bits and (count, last) == self._stamp():
+                self._bloom = self._view(mapped, _BLOOM_HEADER.size, len(mapped))
+                self._bloom_bits = bits
+                self._bloom_hashes = hashes
+
+    def _stamp(self) -> Tuple[int, int]:
+        keys = self._keys
+        return (len(keys), keys[-1]) if keys else (0, 0)
+
+    def _unmap(self) -> None:
+        self._keys = self._key_bytes = self._bloom = None
+        while self._views:
+            self._views.pop().release()
+        while self._maps:
+            self._maps.pop().close()
+        self._bloom_bits = self._bloom_hashes = 0
+
+    def _stored_contains(self, value: int) -> bool:
+        keys = self._keys
+        if not keys:
+            return False
+        bloom = self._bloom
+        if bloom is not None:
+            for position in _bloom_positions(value, self._bloom_bits, self._bloom_hashes):
+                if not bloom[position >> 3] & (1 << (position & 7)):
+                    self.bloom_skips += 1
+                    return False
+        position = bisect_left(keys, value)
+        return position < len(keys) and keys[position] == value
+
+    def __contains__(self, key: Key) -> bool:
+        value = hash_key(key)
+        self.lookups += 1
+        return value in self._pending or self._stored_contains(value)
+
+    def add(self, key: Key) -> bool:
+        """Record ``key``; returns ``True`` when it was not in the index yet."""
+        value = hash_key(key)
+        self.lookups += 1
+        if value in self._pending or self._stored_contains(value):
+            return False
+        self._pending.add(value)
+        return True
+
+    def filter_new(self, items: Iterable[Any]) -> list:
+        """Return the entity dicts from ``items`` not seen before, recording them."""
+        return [item for item in items if isinstance(item, dict) and self.add(item)]
+
+    def flush(self) -> None:
+        """Merge pending keys into the file, including keys other writers flushed."""
+        if not self._pending:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with open(f"{self.path}.lock", "a+b") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                self._open()
+                merged = self._merge(sorted(self._pending))
+                self._unmap()
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as handle:
+                    handle.write(_HEADER.pack(_MAGIC, len(merged)))
+                    merged.tofile(handle)
+                os.replace(tmp_path, self.path)
+                if self.bloom_bits_per_key:
+                    self._write_bloom(merged)
+                else:
+                    # A filter left from an earlier flush no longer covers the keys.
+                    try:
+                        os.remove(self.bloom_path)
+                    except FileNotFoundError:
+                        pass
+                self._pending.clear()
+                self._open()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _merge(self, pending: List[int]) -> array:
+        """Splice sorted ``pending`` into the stored keys, dropping duplicates."""
+        merged = array("Q")
+        keys, raw = self._keys, self._key_bytes
+        if keys is None or raw is None:
+            merged.extend(pending)
+            return merged
+        copied = 0
+        for value in pending:
+            position = bisect_left(keys, value, copied)
+            merged.frombytes(raw[copied * 8 : position * 8])
+            copied = position
+            if position < len(keys) and keys[position] == value:
+                continue
+            merged.append(value)
+        merged.frombytes(raw[copied * 8 :])
+        return merged
+
+    def _write_bloom(self, keys: array) -> None:
+        bits = max(64, len(keys) * self.bloom_bits_per_key)
+        bits = (bits + 7) // 8 * 8
+        # k = ln(2) * bits per key is optimal.
+        hashes = max(1, round(0.693 * self.bloom_bits_per_key))
+        bloom = bytearray(bits // 8)
+        for value in keys:
+            for position in _bloom_positions(value, bits, hashes):
+                bloom[position >> 3] |= 1 << (position & 7)
+        tmp_path = f"{self.bloom_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as handle:
+            stamp = (len(keys), keys[-1]) if keys else (0, 0)
+            handle.write(_BLOOM_HEADER.pack(_BLOOM_MAGIC, bits, hashes, *stamp))
+            handle.write(bloom)
+        os.replace(tmp_path, self.bloom_path)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "stored": self.stored,
+            "pending": len(self._pending),
+            "lookups": self.lookups,
+            "bloomSkips": self.bloom_skips,
+        }
+
+    def close(self) -> None:
+        self.flush()
+        self._unmap()
@@ -13,6 +13,12 @@ overridden via ``--cookie`` and ``--csrf-token`` CLI arguments. The script
 prints a JSON object with the extracted profile URN (`id`), the profile
 vanity (`username`), the requested URL (`url`), and the best effort profile
 image URL (`imageUrl`).
+
+By default the profile is first looked up through the voyager identity API
+(``identity/dash/profiles?q=memberIdentity``), whose normalized JSON carries the
+profile URN and display-photo artifacts in a few kilobytes. The full HTML page
+is only downloaded when that lookup fails; ``--mode html`` forces the scrape and
+``--mode api`` disables the fallback.
 """
 
 from __future__ import annotations
@@ -23,44 +29,58 @@ import os
 import re
 import sys
 from html import unescape
-from typing import Dict, Iterable, Optional, Tuple
-from urllib.parse import urlparse
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import quote, urlparse
+
+import json_backend
+import metrics
+from lazy_re import LazyPattern
 
-import requests
+if TYPE_CHECKING:
+    import requests
 
 DEFAULT_PROFILE_URL = "https://www.linkedin.com/in/ramzib/"
 USER_AGENT = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
     "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36"
 )
-PRIMARY_COMPONENT_PATTERN = re.compile(
+IDENTITY_API_URL = "https://www.linkedin.com/voyager/api/identity/dash/profiles"
+IDENTITY_DECORATION_ID = "com.linkedin.voyager.dash.deco.identity.profile.WebTopCardCore-18"
+IDENTITY_API_HEADERS = {
+    "accept": "application/vnd.linkedin.normalized+json+2.1",
+    "x-restli-protocol-version": "2.0.0",
+}
+PROFILE_TYPE = "com.linkedin.voyager.dash.identity.profile.Profile"
+RESOLUTION_MODES = ("auto", "api", "html")
+
+PRIMARY_COMPONENT_PATTERN = LazyPattern(
     r"componentkey[\s:='\"]+com\\.linkedin\\.sdui\\.profile\\.card\\.ref"
     r"(?P<urn>[A-Za-z0-9_-]+?)(?:Topcard|TopCard)?",
     re.IGNORECASE,
 )
 
-FALLBACK_COMPONENT_PATTERN = re.compile(
+FALLBACK_COMPONENT_PATTERN = LazyPattern(
     r"com\\.linkedin\\.sdui\\.profile\\.card\\.ref"
     r"(?P<urn>[A-Za-z0-9_-]+?)(?:Topcard|TopCard)?",
     re.IGNORECASE,
 )
 
-IDENTITY_DASH_PATTERN = re.compile(
+IDENTITY_DASH_PATTERN = LazyPattern(
     r"identityDashProfilesByMemberIdentity.*?urn:li:(?:fsd?_)?profile:(?P<urn>[A-Za-z0-9_-]+)",
     re.IGNORECASE | re.DOTALL,
 )
 
-URN_PATTERN = re.compile(
+URN_PATTERN = LazyPattern(
     r"urn:li:(?:fsd?_)?profile:(?P<urn>[A-Za-z0-9_-]+)",
     re.IGNORECASE,
 )
 
-ROOT_URL_PATTERN = re.compile(
+ROOT_URL_PATTERN = LazyPattern(
     r'"rootUrl"\s*:\s*"(?P<root>https://media\.licdn\.com/dms/image[^"\\]+)"',
     re.IGNORECASE,
 )
 
-ARTIFACT_SEGMENT_PATTERN = re.compile(
+ARTIFACT_SEGMENT_PATTERN = LazyPattern(
     r'"fileIdentifyingUrlPathSegment"\s*:\s*"(?P<segment>[^"\\]+)"',
     re.IGNORECASE,
 )
@@ -94,11 +114,25 @@ def parse_args() -> argparse.Namespace:
         default=30.0,
         help="Timeout in seconds for the HTTP request (default: 30).",
     )
+    parser.add_argument(
+        "--mode",
+        choices=RESOLUTION_MODES,
+        default="auto",
+        help=(
+            "api: voyager identity JSON only; html: scrape the profile page; "
+            "auto: API first, HTML on failure (default: auto)."
+        ),
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
         help="Print debug information to stderr.",
     )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Print compact UTF-8 JSON instead of the default json.dumps() line.",
+    )
     return parser.parse_args()
 
 
@@ -114,6 +148,8 @@ def parse_cookie_header(cookie_header: str) -> Dict[str, str]:
 
 
 def build_session(cookie_header: str, csrf_token: str, referer: str) -> requests.Session:
+    import requests
+
     session = requests.Session()
     session.headers.update(
         {
@@ -125,7 +161,7 @@ def build_session(cookie_header: str, csrf_token: str, referer: str) -> requests
     )
     for name, value in parse_cookie_header(cookie_header).items():
         session.cookies.set(name, value)
-    return session
+    return metrics.instrument_session(session)
 
 
 def infer_vanity_from_url(url: str) -> str | None:
@@ -300,6 +336,166 @@ def extract_profile_image_url(html: str) -> Optional[str]:
     return collect_candidates(plain)
 
 
+def summarize_profile(html: str, url: str) -> Dict[str, Optional[str]]:
+    """Build the ``id``/``username``/``url``/``imageUrl`` result for a profile page.
+
+    Raises ``ValueError`` when the URN or the username cannot be determined.
+    """
+    vanity = infer_vanity_from_url(url)
+    profile_urn = extract_profile_urn(html, vanity=vanity)
+    profile_image_url = extract_profile_image_url(html)
+
+    username = vanity
+    if not username:
+        parsed = urlparse(url)
+        path = parsed.path.strip("/")
+        if path:
+            username = path.split("/")[-1]
+
+    if not username:
+        raise ValueError("Unable to infer username from the supplied URL.")
+
+    return {
+        "id": profile_urn,
+        "username": username,
+        "url": url,
+        "imageUrl": profile_image_url,
+    }
+
+
+def build_identity_url(vanity: str) -> str:
+    return (
+        f"{IDENTITY_API_URL}?q=memberIdentity&memberIdentity={quote(vanity, safe='')}"
+        f"&decorationId={IDENTITY_DECORATION_ID}"
+    )
+
+
+def _display_photo_url(picture: Any) -> Optional[str]:
+    """Pick the best display-photo artifact from a ``profilePicture`` object."""
+    stack = [picture]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+            continue
+        if not isinstance(node, dict):
+            continue
+        root = node.get("rootUrl")
+        artifacts = node.get("artifacts")
+        if isinstance(root, str) and isinstance(artifacts, list):
+            segment = choose_artifact_segment(
+                artifact["fileIdentifyingUrlPathSegment"]
+                for artifact in artifacts
+                if isinstance(artifact, dict)
+                and isinstance(artifact.get("fileIdentifyingUrlPathSegment"), str)
+            )
+            if segment:
+                return root + segment
+        stack.extend(node.values())
+    return None
+
+
+def summarize_identity(payload: Dict[str, Any], url: str) -> Dict[str, Optional[str]]:
+    """Build the same result as :func:`summarize_profile` from an identity API response.
+
+    Raises ``ValueError`` when no profile for the URL's vanity is present.
+    """
+    vanity = infer_vanity_from_url(url)
+    if not vanity:
+        raise ValueError("Unable to infer username from the supplied URL.")
+    profiles = [
+        item
+        for item in payload.get("included") or []
+        if isinstance(item, dict)
+        and item.get("$type") == PROFILE_TYPE
+        and isinstance(item.get("entityUrn"), str)
+    ]
+    match = next(
+        (
+            profile
+            for profile in profiles
+            if str(profile.get("publicIdentifier") or "").lower() == vanity.lower()
+        ),
+        None,
+    )
+    if match is None:
+        # Decorations that omit publicIdentifier still list the requested profile first.
+        elements = (payload.get("data") or {}).get("*elements") or []
+        urn = elements[0] if elements else None
+        match = next((profile for profile in profiles if profile["entityUrn"] == urn), None)
+    if match is None:
+        raise ValueError(f"Identity API returned no profile for {vanity}.")
+    urn_match = URN_PATTERN.search(match["entityUrn"])
+    if not urn_match:
+        raise ValueError(f"Unexpected profile URN {match['entityUrn']}.")
+    return {
+        "id": urn_match.group("urn"),
+        "username": vanity,
+        "url": url,
+        "imageUrl": _display_photo_url(match.get("profilePicture")),
+    }
+
+
+def resolve_via_api(
+    session: requests.Session, url: str, timeout: float
+) -> Dict[str, Optional[str]]:
+    vanity = infer_vanity_from_url(url)
+    if not vanity:
+        raise ValueError("Unable to infer username from the supplied URL.")
+    response = session.get(
+        build_identity_url(vanity), timeout=timeout, headers=IDENTITY_API_HEADERS
+    )
+    if response.status_code != 200:
+        raise ValueError(f"Unexpected status {response.status_code} from the identity API.")
+    return summarize_identity(json_backend.decode_response(response), url)
+
+
+def resolve_via_html(
+    session: requests.Session, url: str, timeout: float, verbose: bool = False
+) -> Dict[str, Optional[str]]:
+    response = session.get(url, timeout=timeout, headers={"referer": url})
+    if response.status_code != 200:
+        raise ValueError(f"Unexpected status {response.status_code} when fetching profile page.")
+    try:
+        return summarize_profile(response.text, url)
+    except ValueError:
+        if verbose:
+            # The page is the only clue to what changed in LinkedIn's markup.
+            print(response.text, file=sys.stderr)
+        raise
+
+
+def resolve_profile(
+    session: requests.Session,
+    url: str,
+    timeout: float,
+    mode: str = "auto",
+    html_session: Optional[requests.Session] = None,
+    verbose: bool = False,
+) -> Dict[str, Optional[str]]:
+    """Resolve ``url`` via the identity API, the profile HTML, or API then HTML.
+
+    ``html_session`` (defaults to ``session``) is used for the page scrape.
+    Raises ``ValueError`` when resolution fails. In ``auto`` mode any API
+    failure, transport errors included, falls back to the page; errors from
+    the page scrape itself propagate.
+    """
+    import requests
+
+    if mode != "html":
+        try:
+            return resolve_via_api(session, url, timeout)
+        except (ValueError, requests.RequestException) as exc:
+            if mode == "api":
+                raise
+            if verbose:
+                print(
+                    f"Identity API lookup failed ({exc}); scraping the profile page",
+                    file=sys.stderr,
+                )
+    return resolve_via_html(html_session or session, url, timeout, verbose)
+
+
 def main() -> int:
     args = parse_args()
     cookie_header = args.cookie or os.getenv("LINKEDIN_COOKIE")
@@ -312,6 +508,8 @@ def main() -> int:
         print("Missing CSRF token. Set LINKEDIN_CSRF_TOKEN or pass --csrf-token.", file=sys.stderr)
         return 1
 
+    import requests
+
     session = build_session(cookie_header, csrf_token, referer=args.url)
     vanity = infer_vanity_from_url(args.url)
 
@@ -321,47 +519,21 @@ def main() -> int:
             print(f"Detected vanity: {vanity}", file=sys.stderr)
 
     try:
-        response = session.get(args.url, timeout=args.timeout)
+        result = resolve_profile(
+            session, args.url, args.timeout, mode=args.mode, verbose=args.verbose
+        )
     except requests.RequestException as exc:  # pragma: no cover - network failure surface
         print(f"HTTP request failed: {exc}", file=sys.stderr)
         return 1
-
-    if response.status_code != requests.codes.ok:
-        print(
-            f"Unexpected status {response.status_code} when fetching profile page.",
-            file=sys.stderr,
-        )
-        return 1
-
-    try:
-        profile_urn = extract_profile_urn(response.text, vanity=vanity)
     except ValueError as exc:
-        if args.verbose:
-            print(response.text, file=sys.stderr)
         print(str(exc), file=sys.stderr)
         return 1
 
-    profile_image_url = extract_profile_image_url(response.text)
-
-    username = vanity
-    if not username:
-        parsed = urlparse(args.url)
-        path = parsed.path.strip("/")
-        if path:
-            username = path.split("/")[-1]
-
-    if not username:
-        print("Unable to infer username from the supplied URL.", file=sys.stderr)
-        return 1
-
-    result = {
-        "id": profile_urn,
-        "username": username,
-        "url": args.url,
-        "imageUrl": profile_image_url,
-    }
-
-    print(json.dumps(result))
+    if args.compact:
+        print(json_backend.dumps(result, compact=True))
+    else:
+        # The historical stdout format that wrapping scripts parse.
+        print(json.dumps(result))
     return 0
 
 
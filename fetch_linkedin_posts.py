@@ -15,17 +15,34 @@ Example usage:
     python fetch_linkedin_posts.py ramzib --count 20 --limit 100
 
 Use the ``--output`` flag to write the simplified card data to disk.
+
+With ``--watermark-file`` only cards newer than the last run are fetched: the
+newest ``publishedAt`` per vanity is kept in that file together with the
+``entityUrn`` of every card emitted at that millisecond (and of recent cards
+without a ``publishedAt``), pagination stops after the first page holding a
+card already seen, and new cards are written as NDJSON.
+``--dedupe-index`` instead skips cards already stored by any earlier run, for
+batch jobs that sweep many profiles into one store.
+Adding ``--poll`` repeats this every ``--interval`` seconds on one warm session,
+so an idle profile costs a single request per poll:
+
+    python fetch_linkedin_posts.py ramzib --watermark-file cards-state.json --poll --interval 120
 """
 
 from __future__ import annotations
 
 import argparse
-import json
 import os
 import sys
-from typing import Any, Dict, Iterable, List, Optional
+import time
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+import json_backend
+
+if TYPE_CHECKING:
+    import requests
 
-import requests
+    from dedupe_index import DedupeIndex
 
 BASE_URL = "https://www.linkedin.com/voyager/api/voyagerIdentityDashNotificationCards"
 DECORATION_ID = (
@@ -36,6 +53,8 @@ USER_AGENT = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
     "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36"
 )
+# URNs of emitted cards without a publishedAt that a watermark remembers.
+UNTIMED_MEMORY = 1000
 
 
 def parse_args() -> argparse.Namespace:
@@ -55,7 +74,10 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--limit",
         type=int,
-        help="Stop after collecting this many cards (default: fetch until pagination ends)",
+        help=(
+            "Stop after collecting this many cards (default: fetch until pagination ends). "
+            "With --watermark-file, emit at most this many of the oldest new cards per poll."
+        ),
     )
     parser.add_argument(
         "--cookie",
@@ -81,6 +103,48 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Print pagination progress to stderr.",
     )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write single-line JSON instead of the indented layout.",
+    )
+    parser.add_argument(
+        "--watermark-file",
+        help=(
+            "JSON file keeping the newest card seen per vanity; only newer cards are fetched "
+            "and they are written as NDJSON (appended to --output when given)."
+        ),
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Keep polling for new cards every --interval seconds (requires --watermark-file).",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=300.0,
+        help="Seconds between polls (default: 300).",
+    )
+    parser.add_argument(
+        "--max-polls",
+        type=int,
+        help="Stop after this many polls (default: poll until interrupted).",
+    )
+    parser.add_argument(
+        "--dedupe-index",
+        metavar="PATH",
+        help=(
+            "Persistent 64-bit hash index shared across runs and profiles; cards already "
+            "in it are skipped and do not count towards --limit."
+        ),
+    )
+    parser.add_argument(
+        "--dedupe-bloom-bits",
+        type=int,
+        default=10,
+        help="Bloom filter bits per key in front of --dedupe-index; 0 disables it (default: 10).",
+    )
     return parser.parse_args()
 
 
@@ -97,6 +161,8 @@ def parse_cookie_header(cookie_header: str) -> Dict[str, str]:
 
 
 def build_session(cookie_header: str, csrf_token: str, vanity_name: str) -> requests.Session:
+    import requests
+
     session = requests.Session()
     session.headers.update(
         {
@@ -195,7 +261,7 @@ def fetch_notification_page(
     }
     response = session.get(BASE_URL, params=params, timeout=timeout)
     response.raise_for_status()
-    return response.json()
+    return json_backend.decode_response(response)
 
 
 def fetch_cards(
@@ -205,7 +271,9 @@ def fetch_cards(
     timeout: float,
     limit: Optional[int],
     verbose: bool = False,
+    dedupe_index: Optional[DedupeIndex] = None,
 ) -> List[Dict[str, Any]]:
+    """Page through the cards; with ``dedupe_index``, cards it already holds are skipped."""
     start = 0
     collected: List[Dict[str, Any]] = []
     seen: set[str] = set()
@@ -219,6 +287,8 @@ def fetch_cards(
                 continue
             if urn:
                 seen.add(urn)
+            if dedupe_index is not None and not dedupe_index.add(card):
+                continue
             collected.append(card)
             if limit and len(collected) >= limit:
                 break
@@ -242,6 +312,181 @@ def fetch_cards(
     return collected
 
 
+def load_watermarks(path: str) -> Dict[str, Dict[str, Any]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "rb") as handle:
+        return json_backend.loads(handle.read() or b"{}")
+
+
+def save_watermarks(watermarks: Dict[str, Dict[str, Any]], path: str) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json_backend.dump(watermarks, handle, compact=True)
+    os.replace(tmp_path, path)
+
+
+def _newest_urns(watermark: Dict[str, Any]) -> set[str]:
+    urns = set(watermark.get("entityUrns") or ())
+    # Watermarks saved before ties were tracked hold a single entityUrn.
+    if watermark.get("entityUrn"):
+        urns.add(watermark["entityUrn"])
+    return urns
+
+
+def is_seen(card: Dict[str, Any], watermark: Optional[Dict[str, Any]]) -> bool:
+    """True when ``card`` predates ``watermark`` or was already emitted.
+
+    Cards at the watermark's millisecond, or without a ``publishedAt``, are
+    matched by ``entityUrn``.
+    """
+    if not watermark:
+        return False
+    urn = card.get("entityUrn")
+    published = card.get("publishedAt")
+    if published is None:
+        return bool(urn) and urn in (watermark.get("untimed") or ())
+    newest = watermark.get("publishedAt")
+    if newest is None or published > newest:
+        return False
+    if published < newest:
+        return True
+    # Same millisecond: only the cards already emitted at it are seen. A tie
+    # without a URN cannot be told apart and counts as seen, as before.
+    return not urn or urn in _newest_urns(watermark)
+
+
+def fetch_new_cards(
+    session: requests.Session,
+    vanity_name: str,
+    count: int,
+    timeout: float,
+    watermark: Optional[Dict[str, Any]],
+    limit: Optional[int] = None,
+    verbose: bool = False,
+) -> List[Dict[str, Any]]:
+    """Return cards newer than ``watermark``, newest first.
+
+    Pages come newest first, but cards within a page follow the ``included``
+    order, so every card of a page is checked and pagination stops only after
+    a page that holds a seen card. With a watermark, ``limit`` keeps the oldest
+    new cards: the watermark then only advances past cards that were emitted,
+    and the newer ones are picked up by the next call.
+    """
+    start = 0
+    collected: List[Dict[str, Any]] = []
+    seen: set[str] = set()
+    requests_made = 0
+
+    while True:
+        payload = fetch_notification_page(session, vanity_name, start, count, timeout)
+        requests_made += 1
+        reached_seen = False
+        for card in extract_cards(payload):
+            if is_seen(card, watermark):
+                reached_seen = True
+                continue
+            urn = card.get("entityUrn")
+            if urn and urn in seen:
+                continue
+            if urn:
+                seen.add(urn)
+            collected.append(card)
+        if reached_seen:
+            break
+        # Without a watermark there is nothing to catch up on, so the newest cards suffice.
+        if limit and not watermark and len(collected) >= limit:
+            break
+
+        metadata = payload.get("data", {}).get("metadata", {})
+        next_start = metadata.get("nextStart")
+        if next_start is None or next_start <= start:
+            break
+        start = next_start
+
+    # Cards without a timestamp sort last; sorted() keeps their page order.
+    collected.sort(key=lambda card: card.get("publishedAt") or 0, reverse=True)
+    if limit and len(collected) > limit:
+        collected = collected[-limit:] if watermark else collected[:limit]
+
+    if verbose:
+        print(
+            f"{vanity_name}: {len(collected)} new cards in {requests_made} requests",
+            file=sys.stderr,
+        )
+    return collected
+
+
+def advance_watermark(
+    watermark: Optional[Dict[str, Any]], cards: Iterable[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """Fold emitted ``cards`` into ``watermark``: newest timestamp, its URNs, untimed URNs."""
+    watermark = watermark or {}
+    newest = watermark.get("publishedAt")
+    at_newest = _newest_urns(watermark)
+    untimed = list(watermark.get("untimed") or ())
+    for card in cards:
+        urn = card.get("entityUrn")
+        published = card.get("publishedAt")
+        if published is None:
+            if urn and urn not in untimed:
+                untimed.append(urn)
+        elif newest is None or published > newest:
+            newest = published
+            at_newest = {urn} if urn else set()
+        elif published == newest and urn:
+            at_newest.add(urn)
+    if newest is None and not untimed:
+        return None
+    return {
+        "publishedAt": newest,
+        "entityUrns": sorted(at_newest),
+        "untimed": untimed[-UNTIMED_MEMORY:],
+    }
+
+
+def poll_cards(
+    session: requests.Session,
+    args: argparse.Namespace,
+    handle: IO[str],
+) -> None:
+    watermarks = load_watermarks(args.watermark_file)
+    polls = 0
+    while True:
+        started = time.monotonic()
+        watermark = watermarks.get(args.vanity_name)
+        try:
+            cards = fetch_new_cards(
+                session,
+                args.vanity_name,
+                args.count,
+                args.timeout,
+                watermark,
+                limit=args.limit,
+                verbose=args.verbose,
+            )
+        except Exception as exc:
+            # A long-running poller should survive transient upstream failures.
+            if not args.poll:
+                raise
+            print(f"{args.vanity_name}: poll failed: {exc}", file=sys.stderr)
+            cards = []
+        # Oldest first so the stream reads chronologically across polls.
+        for card in reversed(cards):
+            handle.write(json_backend.dumps(card, compact=True))
+            handle.write("\n")
+        handle.flush()
+        updated = advance_watermark(watermark, cards)
+        if updated is not None and updated != watermark:
+            watermarks[args.vanity_name] = updated
+            save_watermarks(watermarks, args.watermark_file)
+
+        polls += 1
+        if not args.poll or (args.max_polls and polls >= args.max_polls):
+            return
+        time.sleep(max(0.0, args.interval - (time.monotonic() - started)))
+
+
 def main() -> None:
     args = parse_args()
     cookie_header = args.cookie or os.getenv("LINKEDIN_COOKIE")
@@ -252,7 +497,31 @@ def main() -> None:
     if not csrf_token:
         raise SystemExit("CSRF token missing. Provide --csrf-token or set LINKEDIN_CSRF_TOKEN.")
 
+    if args.poll and not args.watermark_file:
+        raise SystemExit("--poll requires --watermark-file")
+    if args.interval <= 0:
+        raise SystemExit("--interval must be positive")
+    if args.dedupe_index and args.watermark_file:
+        raise SystemExit("--dedupe-index cannot be combined with --watermark-file")
+
     session = build_session(cookie_header, csrf_token, args.vanity_name)
+    if args.watermark_file:
+        handle = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+        try:
+            poll_cards(session, args, handle)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if handle is not sys.stdout:
+                handle.close()
+        return
+
+    dedupe = None
+    if args.dedupe_index:
+        from dedupe_index import DedupeIndex
+
+        dedupe = DedupeIndex(args.dedupe_index, bloom_bits_per_key=args.dedupe_bloom_bits)
+
     cards = fetch_cards(
         session=session,
         vanity_name=args.vanity_name,
@@ -260,15 +529,20 @@ def main() -> None:
         timeout=args.timeout,
         limit=args.limit,
         verbose=args.verbose,
+        dedupe_index=dedupe,
     )
 
     if args.output:
         with open(args.output, "w", encoding="utf-8") as handle:
-            json.dump(cards, handle, indent=2, ensure_ascii=False)
+            json_backend.dump(cards, handle, compact=args.compact, ensure_ascii=False)
     else:
-        json.dump(cards, sys.stdout, indent=2, ensure_ascii=False)
+        json_backend.dump(cards, sys.stdout, compact=args.compact, ensure_ascii=False)
         sys.stdout.write("\n")
 
+    if dedupe is not None:
+        # Only flushed once the cards are written, so a failed run records nothing.
+        dedupe.close()
+
 
 if __name__ == "__main__":
     main()
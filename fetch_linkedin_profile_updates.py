@@ -19,16 +19,33 @@ Example usage:
 from __future__ import annotations
 
 import argparse
-import json
 import os
 import sys
+import threading
+from collections import OrderedDict
 from collections.abc import Iterable
-from typing import Any, Dict, List, Optional, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 import re
 from urllib.parse import quote, urlencode, unquote
 from urllib.parse import quote
 
-import requests
+import json_backend
+import metrics
+from lazy_re import LazyPattern
+
+if TYPE_CHECKING:
+    import requests
 
 GRAPHQL_URL = "https://www.linkedin.com/voyager/api/graphql"
 QUERY_ID = "voyagerFeedDashProfileUpdates.80d5abb3cd25edff72c093a5db696079"
@@ -136,6 +153,14 @@ def parse_args() -> argparse.Namespace:
         metavar="KEY=VALUE",
         help="Extra request header(s) to include; can be repeated.",
     )
+    parser.add_argument(
+        "--fields",
+        help=(
+            "Comma-separated update fields to compute, e.g. entityUrn,createdAt,numLikes; "
+            "raw.<key> embeds only that key of the raw update. Fields not listed are skipped "
+            f"entirely. Choose from: {', '.join(UPDATE_FIELDS)}."
+        ),
+    )
     parser.add_argument(
         "--social-counts-only",
         action="store_true",
@@ -146,6 +171,73 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Return only included records that contain organization reactions.",
     )
+    parser.add_argument(
+        "--actor-cache-size",
+        type=int,
+        default=ACTOR_CACHE_SIZE,
+        help=(
+            "Resolved actors kept in the LRU cache shared across pages; 0 disables it "
+            f"(default: {ACTOR_CACHE_SIZE})."
+        ),
+    )
+    parser.add_argument(
+        "--social-counts-output",
+        metavar="PATH",
+        help=(
+            "Also write the --social-counts-only records here, harvested from the same "
+            "pages as the updates instead of a second pagination run."
+        ),
+    )
+    parser.add_argument(
+        "--organization-reactions-output",
+        metavar="PATH",
+        help=(
+            "Also write the --organization-reactions-only records here, harvested from the "
+            "same pages as the updates instead of a second pagination run."
+        ),
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write single-line JSON instead of the indented layout.",
+    )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help=(
+            "Write --output as one JSON record per line with a <path>.idx urn -> offset "
+            "index for random access (see record_index.py); requires --output."
+        ),
+    )
+    parser.add_argument(
+        "--diff-against",
+        help=(
+            "Previous output file (may be the --output file itself) to diff against; emit only new records "
+            "and records whose counts changed."
+        ),
+    )
+    parser.add_argument(
+        "--changes-output",
+        help="Write the --diff-against changeset here instead of stdout.",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Write OpenMetrics request/pagination counters to this textfile on exit.",
+    )
+    parser.add_argument(
+        "--dedupe-index",
+        metavar="PATH",
+        help=(
+            "Persistent 64-bit hash index shared across runs and profiles; records already "
+            "in it with the same like/comment/share counts are left out of every output."
+        ),
+    )
+    parser.add_argument(
+        "--dedupe-bloom-bits",
+        type=int,
+        default=10,
+        help="Bloom filter bits per key in front of --dedupe-index; 0 disables it (default: 10).",
+    )
     return parser.parse_args()
 
 
@@ -166,6 +258,8 @@ def build_session(
     referer: Optional[str],
     extra_headers: Iterable[str],
 ) -> requests.Session:
+    import requests
+
     session = requests.Session()
     headers = {
         "accept": "application/vnd.linkedin.normalized+json+2.1",
@@ -191,39 +285,148 @@ def build_session(
 
     for name, value in parse_cookie_header(cookie_header).items():
         session.cookies.set(name, value)
-    return session
+    return metrics.instrument_session(session)
+
+
+def _unwrap_text(block: Any) -> Any:
+    """Follow single-child text wrappers down to a string, list or other leaf."""
+    while isinstance(block, dict):
+        if "text" in block:
+            block = block["text"]
+        elif "value" in block:
+            block = block["value"]
+        elif "textViewModel" in block:
+            block = block["textViewModel"]
+        elif "attributes" in block:
+            block = block.get("string")
+        elif "attributedText" in block:
+            block = block["attributedText"]
+        elif "rawText" in block:
+            block = block["rawText"]
+        else:
+            break
+    return block
 
 
 def extract_text_block(block: Any) -> Optional[str]:
-    """Attempt to pull a human-readable string from a commentary/text block."""
-    if block is None:
-        return None
-    if isinstance(block, str):
+    """Attempt to pull a human-readable string from a commentary/text block.
+
+    Iterative: wrapper chains are followed in a loop and collections are
+    flattened with an explicit stack of iterators, concatenating every
+    non-empty string in document order.
+    """
+    block = _unwrap_text(block)
+    if block is None or isinstance(block, str):
         return block
-    if isinstance(block, dict):
-        if "text" in block:
-            return extract_text_block(block["text"])
-        if "value" in block:
-            return extract_text_block(block["value"])
-        if "textViewModel" in block:
-            return extract_text_block(block["textViewModel"])
-        if "attributes" in block:
-            return extract_text_block(block.get("string"))
-        if "attributedText" in block:
-            return extract_text_block(block["attributedText"])
-        if "rawText" in block:
-            return extract_text_block(block["rawText"])
-    if isinstance(block, Iterable):
-        parts: List[str] = []
-        for item in block:
-            text = extract_text_block(item)
-            if text:
-                parts.append(text)
-        return "".join(parts) if parts else None
+    if not isinstance(block, Iterable):
+        return None
+    parts: List[str] = []
+    stack = [iter(block)]
+    while stack:
+        for item in stack[-1]:
+            item = _unwrap_text(item)
+            if isinstance(item, str):
+                if item:
+                    parts.append(item)
+            elif item is not None and isinstance(item, Iterable):
+                stack.append(iter(item))
+                break
+        else:
+            stack.pop()
+    return "".join(parts) if parts else None
+
+
+def _join_name(source: Dict[str, Any]) -> Optional[str]:
+    first = source.get("firstName") or source.get("localizedFirstName")
+    last = source.get("lastName") or source.get("localizedLastName")
+    if first or last:
+        return " ".join(filter(None, [first, last]))
     return None
 
 
-def simplify_actor(actor_ref: Optional[Any], index: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+ActorKey = Tuple[bool, str]
+ACTOR_CACHE_SIZE = 50_000
+
+
+class ActorCache:
+    """Bounded LRU of resolved actor summaries, kept across pages and profiles.
+
+    Keys are ``(inline, urn)`` as in :func:`simplify_actor`. Thread-safe, so the
+    long-running service can share it between requests.
+    """
+
+    def __init__(self, maxsize: int = ACTOR_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[ActorKey, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: ActorKey, default: Any = None) -> Any:
+        with self._lock:
+            value = self._entries.get(key, default)
+            if value is default:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return value
+
+    def __setitem__(self, key: ActorKey, value: Dict[str, Any]) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _evict(self) -> None:
+        while len(self._entries) > max(self.maxsize, 0):
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+ACTOR_CACHE = ActorCache()
+
+ActorCacheLike = Union[ActorCache, Dict[ActorKey, Optional[Dict[str, Any]]]]
+_MISSING = object()
+
+
+def simplify_actor(
+    actor_ref: Optional[Any],
+    index: Dict[str, Dict[str, Any]],
+    cache: Optional[ActorCacheLike] = None,
+) -> Optional[Dict[str, Any]]:
+    """Summarize an actor; ``cache`` memoizes resolved actors by URN.
+
+    Actors missing from ``index`` are never cached: a later page may include
+    the entity.
+    """
     if actor_ref is None:
         return None
     if isinstance(actor_ref, dict):
@@ -232,90 +435,207 @@ def simplify_actor(actor_ref: Optional[Any], index: Dict[str, Dict[str, Any]]) -
     else:
         actor_urn = actor_ref
         actor = index.get(actor_urn)
+
     if not isinstance(actor, dict):
         return {"entityUrn": actor_urn} if actor_urn else None
 
-    # Profiles often appear as miniProfile entries or profile view models.
-    name = None
-    first = actor.get("firstName") or actor.get("localizedFirstName")
-    last = actor.get("lastName") or actor.get("localizedLastName")
-    if first or last:
-        name = " ".join(filter(None, [first, last]))
+    cache_urn = actor_urn
+    if actor is actor_ref and not isinstance(cache_urn, str):
+        # Dash actor components carry the member/company urn as backendUrn only.
+        cache_urn = actor.get("backendUrn")
+    cache_key = (actor is actor_ref, cache_urn) if isinstance(cache_urn, str) else None
+    if cache is not None and cache_key is not None:
+        cached = cache.get(cache_key, _MISSING)
+        if cached is not _MISSING:
+            return cached
 
+    # Profiles often appear as miniProfile entries or profile view models.
+    name = _join_name(actor)
     public_id = actor.get("publicIdentifier")
     if not public_id and isinstance(actor.get("miniProfile"), dict):
         mini = actor["miniProfile"]
         public_id = mini.get("publicIdentifier")
         if not name:
-            first = mini.get("firstName") or mini.get("localizedFirstName")
-            last = mini.get("lastName") or mini.get("localizedLastName")
-            if first or last:
-                name = " ".join(filter(None, [first, last]))
-
-    return {
+            name = _join_name(mini)
+    result = {
         "entityUrn": actor_urn,
         "name": name,
         "publicIdentifier": public_id,
     }
+    if cache is not None and cache_key is not None:
+        cache[cache_key] = result
+    return result
 
 
 def simplify_content_entities(content: Any) -> List[Dict[str, Any]]:
+    """Collect ``contentEntities`` anywhere under ``content`` in document order.
+
+    Walks the tree with an explicit stack and drops entities that simplify to
+    the same record.
+    """
     entities: List[Dict[str, Any]] = []
-    if isinstance(content, dict):
-        if "contentEntities" in content and isinstance(content["contentEntities"], list):
-            for entity in content["contentEntities"]:
-                if not isinstance(entity, dict):
-                    continue
-                simplified = {
-                    "title": extract_text_block(entity.get("title")),
-                    "entity": entity.get("entity"),
-                    "thumbnails": entity.get("thumbnails"),
-                    "landingUrl": entity.get("landingUrl"),
-                }
-                entities.append(simplified)
-        # Recursively inspect nested dicts for additional collections.
-        for value in content.values():
-            if isinstance(value, dict):
-                entities.extend(simplify_content_entities(value))
-            elif isinstance(value, list):
-                for item in value:
-                    entities.extend(simplify_content_entities(item))
-    elif isinstance(content, list):
-        for item in content:
-            entities.extend(simplify_content_entities(item))
+    seen: set[str] = set()
+    stack = [content]
+    push = stack.append
+    while stack:
+        node = stack.pop()
+        if type(node) is dict:
+            nested = node.get("contentEntities")
+            if isinstance(nested, list):
+                for entity in nested:
+                    if not isinstance(entity, dict):
+                        continue
+                    simplified = {
+                        "title": extract_text_block(entity.get("title")),
+                        "entity": entity.get("entity"),
+                        "thumbnails": entity.get("thumbnails"),
+                        "landingUrl": entity.get("landingUrl"),
+                    }
+                    key = json_backend.canonical_key(simplified)
+                    if key not in seen:
+                        seen.add(key)
+                        entities.append(simplified)
+            children: Iterable[Any] = reversed(node.values())
+        elif type(node) is list:
+            children = reversed(node)
+        else:
+            continue
+        for child in children:
+            if type(child) is dict or type(child) is list:
+                push(child)
     return entities
 
 
+# Keys simplify_update reads, in priority order. Every update $type is read the
+# same way: payload shapes drift, so no field is skipped based on its $type.
+_COMMENTARY_KEYS = ("commentaryV2", "commentary", "header", "body")
+_ACTOR_KEYS = ("actor", "actorUrn")
+_TYPE_KEYS = ("updateType", "$type")
+_CREATED_KEYS = ("createdAt", "firstPublishedAt", "lastModified")
+
+
+# Fields of a simplified update record, in output order.
+UPDATE_FIELDS: Tuple[str, ...] = (
+    "entityUrn",
+    "type",
+    "actor",
+    "permalink",
+    "lifecycleState",
+    "createdAt",
+    "commentary",
+    "contentEntities",
+    "numLikes",
+    "numComments",
+    "numShares",
+    "raw",
+)
+COUNT_FIELDS = frozenset({"numLikes", "numComments", "numShares"})
+DEFAULT_FIELDS = frozenset(UPDATE_FIELDS) - {"raw"}
+
+
+class FieldProjection(NamedTuple):
+    """Update record fields to compute; ``raw_keys`` narrows ``raw`` to those keys."""
+
+    fields: frozenset
+    raw_keys: Optional[Tuple[str, ...]] = None
+
+
+def parse_fields(spec: str) -> FieldProjection:
+    """Parse ``--fields`` such as ``entityUrn,createdAt,numLikes,raw.header``."""
+    fields: List[str] = []
+    raw_keys: List[str] = []
+    whole_raw = False
+    for name in (part.strip() for part in spec.split(",")):
+        if not name:
+            continue
+        if name.startswith("raw."):
+            raw_keys.append(name[4:])
+            name = "raw"
+        elif name == "raw":
+            whole_raw = True
+        if name not in UPDATE_FIELDS:
+            raise ValueError(
+                f"Unknown field {name!r}; choose from {', '.join(UPDATE_FIELDS)} or raw.<key>"
+            )
+        if name not in fields:
+            fields.append(name)
+    if not fields:
+        raise ValueError("--fields needs at least one field")
+    return FieldProjection(
+        frozenset(fields), None if whole_raw or not raw_keys else tuple(raw_keys)
+    )
+
+
+def _first_truthy(update: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    value = None
+    for key in keys:
+        value = update.get(key)
+        if value:
+            return value
+    return value
+
+
 def simplify_update(
     update: Dict[str, Any],
     index: Dict[str, Dict[str, Any]],
     include_raw: bool,
     social_counts: Dict[str, Dict[str, Any]],
+    actor_cache: Optional[ActorCacheLike] = None,
+    projection: Optional[FieldProjection] = None,
 ) -> Dict[str, Any]:
-    commentary = None
-    for key in ("commentaryV2", "commentary", "header", "body"):
-        if key in update:
-            commentary = extract_text_block(update[key])
-            if commentary:
-                break
+    """Summarize one update; with ``projection`` only the requested fields are computed.
+
+    Fields come out in :data:`UPDATE_FIELDS` order. ``contentEntities`` is
+    omitted when empty and the counts when no social counts record matches.
+    """
+    wanted = projection.fields if projection is not None else DEFAULT_FIELDS
+    simplified: Dict[str, Any] = {}
+    if "entityUrn" in wanted:
+        simplified["entityUrn"] = update.get("entityUrn")
+    if "type" in wanted:
+        simplified["type"] = _first_truthy(update, _TYPE_KEYS)
+    if "actor" in wanted:
+        simplified["actor"] = simplify_actor(
+            _first_truthy(update, _ACTOR_KEYS), index, actor_cache
+        )
+    if "permalink" in wanted:
+        simplified["permalink"] = update.get("permalink") or update.get(
+            "updateMetadata", {}
+        ).get("permalink")
+    if "lifecycleState" in wanted:
+        simplified["lifecycleState"] = update.get("lifecycleState")
+    if "createdAt" in wanted:
+        simplified["createdAt"] = _first_truthy(update, _CREATED_KEYS)
+    if "commentary" in wanted:
+        commentary = None
+        for key in _COMMENTARY_KEYS:
+            if key in update:
+                commentary = extract_text_block(update[key])
+                if commentary:
+                    break
+        simplified["commentary"] = commentary
+    if "contentEntities" in wanted:
+        content_entities = simplify_content_entities(update.get("content"))
+        if content_entities:
+            simplified["contentEntities"] = content_entities
+    if not wanted.isdisjoint(COUNT_FIELDS):
+        social = _find_social_counts(update, social_counts)
+        if isinstance(social, dict):
+            for field in ("numLikes", "numComments", "numShares"):
+                if field in wanted:
+                    simplified[field] = social.get(field)
+    if include_raw or "raw" in wanted:
+        if projection is None or projection.raw_keys is None:
+            simplified["raw"] = update
+        else:
+            simplified["raw"] = {key: update[key] for key in projection.raw_keys if key in update}
+    return simplified
 
-    actor_info = simplify_actor(update.get("actor") or update.get("actorUrn"), index)
-    content_entities = simplify_content_entities(update.get("content"))
 
+def _find_social_counts(
+    update: Dict[str, Any], social_counts: Dict[str, Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
     entity_urn = update.get("entityUrn")
-    simplified: Dict[str, Any] = {
-        "entityUrn": update.get("entityUrn"),
-        "type": update.get("updateType") or update.get("$type"),
-        "actor": actor_info,
-        "permalink": update.get("permalink") or update.get("updateMetadata", {}).get("permalink"),
-        "lifecycleState": update.get("lifecycleState"),
-        "createdAt": update.get("createdAt")
-        or update.get("firstPublishedAt")
-        or update.get("lastModified"),
-        "commentary": commentary,
-        "contentEntities": content_entities if content_entities else None,
-    }
-
     social = None
     if isinstance(entity_urn, str):
         social = social_counts.get(entity_urn)
@@ -330,19 +650,7 @@ def simplify_update(
         pre_dash = update.get("preDashEntityUrn") or update.get("dashEntityUrn")
         if isinstance(pre_dash, str):
             social = social_counts.get(pre_dash)
-
-    if isinstance(social, dict):
-        simplified["numLikes"] = social.get("numLikes")
-        simplified["numComments"] = social.get("numComments")
-        simplified["numShares"] = social.get("numShares")
-
-    if not simplified["contentEntities"]:
-        simplified.pop("contentEntities")
-
-    if include_raw:
-        simplified["raw"] = update
-
-    return simplified
+    return social
 
 
 def index_included(payload: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
@@ -433,6 +741,7 @@ def harvest_social_counts(
     payload: Dict[str, Any],
     store: Dict[str, Dict[str, Any]],
     metadata: Optional[Dict[str, Dict[str, Any]]] = None,
+    on_record: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> None:
     for item in payload.get("included", []):
         if not isinstance(item, dict):
@@ -451,10 +760,15 @@ def harvest_social_counts(
             if meta and "publishedAt" in meta:
                 record.setdefault("publishedAt", meta["publishedAt"])
         store[urn] = record
+        if on_record is not None:
+            on_record(record)
 
 
 def harvest_organization_reactions(
-    payload: Dict[str, Any], store: Dict[str, Dict[str, Any]], metadata: Dict[str, Dict[str, Any]]
+    payload: Dict[str, Any],
+    store: Dict[str, Dict[str, Any]],
+    metadata: Dict[str, Dict[str, Any]],
+    on_record: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> None:
     for item in payload.get("included", []):
         if not isinstance(item, dict):
@@ -463,7 +777,7 @@ def harvest_organization_reactions(
             continue
         key = item.get("entityUrn") or item.get("urn") or item.get("$id")
         if not isinstance(key, str):
-            key = json.dumps(item, sort_keys=True)
+            key = json_backend.canonical_key(item)
         if key in store:
             continue
         record = dict(item)
@@ -477,12 +791,15 @@ def harvest_organization_reactions(
                 if "publishedAt" in meta:
                     record.setdefault("publishedAt", meta["publishedAt"])
         store[key] = record
+        if on_record is not None:
+            on_record(record)
 
 
 def _collect_social_metadata(
     obj: Any,
     mapping: Dict[str, Dict[str, Any]],
     inherited_published: Optional[int],
+    published_urns: Optional[List[str]] = None,
 ) -> None:
     if isinstance(obj, dict):
         published = obj.get("publishedAt")
@@ -504,34 +821,86 @@ def _collect_social_metadata(
             if key in {"entityUrn", "urn"} and isinstance(value, str):
                 related_urns.append(value)
         for urn in related_urns:
-            entry = mapping.setdefault(urn, {})
-            if isinstance(published, int) and "publishedAt" not in entry:
-                entry["publishedAt"] = published
+            keys = [urn]
             if urn.startswith("urn:li:fsd_socialActivityCounts:"):
-                inner = urn.split(":", 3)[-1]
-                inner_entry = mapping.setdefault(inner, {})
-                if isinstance(published, int) and "publishedAt" not in inner_entry:
-                    inner_entry["publishedAt"] = published
+                keys.append(urn.split(":", 3)[-1])
+            for key in keys:
+                entry = mapping.setdefault(key, {})
+                if isinstance(published, int) and "publishedAt" not in entry:
+                    entry["publishedAt"] = published
+                    if published_urns is not None:
+                        published_urns.append(key)
         for value in obj.values():
             if isinstance(value, (dict, list)):
-                _collect_social_metadata(value, mapping, published)
+                _collect_social_metadata(value, mapping, published, published_urns)
     elif isinstance(obj, list):
         for item in obj:
             if isinstance(item, (dict, list)):
-                _collect_social_metadata(item, mapping, inherited_published)
+                _collect_social_metadata(item, mapping, inherited_published, published_urns)
 
 
-def collect_social_metadata(payload: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
-    metadata: Dict[str, Dict[str, Any]] = {}
+def collect_social_metadata(
+    payload: Dict[str, Any],
+    metadata: Optional[Dict[str, Dict[str, Any]]] = None,
+    published_urns: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Map social activity urns to ``{"publishedAt": ...}`` entries.
+
+    Passing ``metadata`` accumulates into it (the first ``publishedAt`` seen for
+    an urn wins); urns that gain a ``publishedAt`` are appended to
+    ``published_urns``.
+    """
+    if metadata is None:
+        metadata = {}
     for item in payload.get("included", []):
         if isinstance(item, (dict, list)):
-            _collect_social_metadata(item, metadata, None)
+            _collect_social_metadata(item, metadata, None, published_urns)
     data_section = payload.get("data")
     if isinstance(data_section, (dict, list)):
-        _collect_social_metadata(data_section, metadata, None)
+        _collect_social_metadata(data_section, metadata, None, published_urns)
     return metadata
 
 
+class PublishedAtJoin:
+    """Attach ``publishedAt`` to harvested records as metadata arrives.
+
+    Records harvested before their metadata wait in a pending index under both
+    the ``fsd_socialActivityCounts`` urn and the inner activity urn, and are
+    resolved once, when either urn first gains a ``publishedAt``. Cost is linear
+    in entities however many pages a profile has.
+    """
+
+    def __init__(self) -> None:
+        self.metadata: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+
+    def add_page(self, payload: Dict[str, Any]) -> None:
+        published: List[str] = []
+        collect_social_metadata(payload, self.metadata, published)
+        for urn in published:
+            for record in self._pending.pop(urn, ()):
+                if "publishedAt" in record:
+                    continue
+                ent = record.get("entityUrn") or record.get("urn")
+                # Same precedence as the harvesters: the record's own urn first.
+                meta = self.metadata.get(ent)
+                if not meta and ent.startswith("urn:li:fsd_socialActivityCounts:"):
+                    meta = self.metadata.get(ent.split(":", 3)[-1])
+                if meta and "publishedAt" in meta:
+                    record["publishedAt"] = meta["publishedAt"]
+
+    def track(self, record: Dict[str, Any]) -> None:
+        """Park ``record`` until its metadata arrives, unless it already has it."""
+        if "publishedAt" in record:
+            return
+        ent = record.get("entityUrn") or record.get("urn")
+        if not isinstance(ent, str):
+            return
+        self._pending.setdefault(ent, []).append(record)
+        if ent.startswith("urn:li:fsd_socialActivityCounts:"):
+            self._pending.setdefault(ent.split(":", 3)[-1], []).append(record)
+
+
 def extract_pagination_token(payload: Dict[str, Any]) -> Optional[str]:
     """Search the payload for the next pagination token, if any."""
 
@@ -590,6 +959,8 @@ def fetch_profile_updates(
     variables = f"({','.join(parts)})"
     encoded_variables = quote(variables, safe="(),:%")
     url = f"{GRAPHQL_URL}?{encoded_params}&variables={encoded_variables}"
+    import requests
+
     response = session.get(url, timeout=timeout)
     try:
         response.raise_for_status()
@@ -598,7 +969,68 @@ def fetch_profile_updates(
         if details:
             raise requests.HTTPError(f"{exc} -> {details[:500]}", response=response) from None
         raise
-    return response.json()
+    return json_backend.decode_response(response)
+
+
+def iter_update_pages(
+    session: requests.Session,
+    profile_urn: str,
+    start: int,
+    count: int,
+    timeout: float,
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield ``(start, payload)`` for each page until pagination runs out.
+
+    Stopping iteration early (e.g. once a limit is reached) fetches no further
+    pages.
+    """
+    cursor = start
+    pagination_token: Optional[str] = None
+    seen_tokens: set[str] = set()
+    pages = 0
+
+    try:
+        while True:
+            payload = fetch_profile_updates(
+                session,
+                profile_urn,
+                cursor,
+                count,
+                timeout,
+                pagination_token,
+            )
+            pages += 1
+            metrics.PAGES.inc(source="updates")
+            included = payload.get("included")
+            if isinstance(included, list):
+                metrics.record_entities(included)
+            yield cursor, payload
+
+            # Determine whether another page likely exists.
+            section = get_updates_section(payload)
+            items = section.get("items", []) if isinstance(section, dict) else []
+            next_token = extract_pagination_token(payload)
+            if len(items) < count and not next_token:
+                break
+            if not next_token:
+                break
+            if next_token in seen_tokens:
+                break
+            seen_tokens.add(next_token)
+            pagination_token = next_token
+            cursor += count
+    finally:
+        metrics.PAGES_PER_PROFILE.observe(pages, source="updates")
+
+
+UPDATES_OUTPUT = "updates"
+SOCIAL_COUNTS_OUTPUT = "socialCounts"
+ORGANIZATION_REACTIONS_OUTPUT = "organizationReactions"
+OUTPUT_KINDS: Tuple[str, ...] = (
+    UPDATES_OUTPUT,
+    SOCIAL_COUNTS_OUTPUT,
+    ORGANIZATION_REACTIONS_OUTPUT,
+)
 
 
 def fetch_all_updates(
@@ -613,34 +1045,125 @@ def fetch_all_updates(
     social_counts_only: bool,
     organization_reactions_only: bool,
     target_profile_id: Optional[str],
+    projection: Optional[FieldProjection] = None,
+) -> List[Dict[str, Any]]:
+    return summarize_update_pages(
+        iter_update_pages(session, profile_urn, start, count, timeout),
+        count=count,
+        limit=limit,
+        verbose=verbose,
+        include_raw=include_raw,
+        social_counts_only=social_counts_only,
+        organization_reactions_only=organization_reactions_only,
+        target_profile_id=target_profile_id,
+        projection=projection,
+    )
+
+
+def summarize_update_pages(
+    pages: Iterable[Tuple[int, Dict[str, Any]]],
+    count: int,
+    limit: Optional[int],
+    verbose: bool,
+    include_raw: bool,
+    social_counts_only: bool,
+    organization_reactions_only: bool,
+    target_profile_id: Optional[str],
+    projection: Optional[FieldProjection] = None,
 ) -> List[Dict[str, Any]]:
+    """Turn ``(start, payload)`` pages, live or saved, into the CLI's records.
+
+    ``projection`` limits update records to the requested fields; the actor
+    index and social counts are then only built when a requested field needs them.
+    """
+    if social_counts_only:
+        kind = SOCIAL_COUNTS_OUTPUT
+    elif organization_reactions_only:
+        kind = ORGANIZATION_REACTIONS_OUTPUT
+    else:
+        kind = UPDATES_OUTPUT
+    return summarize_update_outputs(
+        pages,
+        (kind,),
+        count=count,
+        limit=limit,
+        verbose=verbose,
+        include_raw=include_raw,
+        target_profile_id=target_profile_id,
+        projection=projection,
+    )[kind]
+
+
+def summarize_update_outputs(
+    pages: Iterable[Tuple[int, Dict[str, Any]]],
+    outputs: Iterable[str],
+    count: int,
+    limit: Optional[int],
+    verbose: bool,
+    include_raw: bool,
+    target_profile_id: Optional[str],
+    projection: Optional[FieldProjection] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Harvest several of :data:`OUTPUT_KINDS` from one pass over ``pages``.
+
+    Each output stops collecting once it reaches ``limit``, exactly where a
+    separate run for it would have stopped paginating, so every result matches
+    the single-output run; pages are only consumed until all outputs are done.
+    """
+    pending = [kind for kind in OUTPUT_KINDS if kind in set(outputs)]
+    results: Dict[str, List[Dict[str, Any]]] = {}
     collected: List[Dict[str, Any]] = []
     seen: set[str] = set()
     social_counts: Dict[str, Dict[str, Any]] = {}
     org_reactions: Dict[str, Dict[str, Any]] = {}
     owned_posts: set[str] = set()
-    social_metadata: Dict[str, Dict[str, Any]] = {}
-    cursor = start
-    pagination_token: Optional[str] = None
-    seen_tokens: set[str] = set()
+    join = PublishedAtJoin()
+    social_metadata = join.metadata
+    fields = projection.fields if projection is not None else DEFAULT_FIELDS
+    needs_index = "actor" in fields
+    needs_counts = not fields.isdisjoint(COUNT_FIELDS)
+
+    def finish(kind: str) -> None:
+        pending.remove(kind)
+        if kind == UPDATES_OUTPUT:
+            records = collected
+        elif kind == SOCIAL_COUNTS_OUTPUT:
+            records = [
+                item
+                for item in social_counts.values()
+                if _is_supported_social_entry(item)
+                and _entry_matches_owned(item, owned_posts)
+            ]
+        else:
+            records = [
+                item
+                for item in org_reactions.values()
+                if _is_supported_social_entry(item)
+                and _entry_matches_owned(item, owned_posts)
+            ]
+            if verbose:
+                print(
+                    f"Authored organization reactions collected={len(records)}",
+                    file=sys.stderr,
+                )
+            if not records and org_reactions:
+                if verbose:
+                    print(
+                        "No owned organization reactions detected; falling back to entire set",
+                        file=sys.stderr,
+                    )
+                records = list(org_reactions.values())
+        if limit:
+            records = records[:limit]
+        if pending and kind != UPDATES_OUTPUT:
+            # Later pages may still resolve publishedAt on the shared records.
+            records = [dict(item) for item in records]
+        results[kind] = records
 
-    while True:
-        payload = fetch_profile_updates(
-            session,
-            profile_urn,
-            cursor,
-            count,
-            timeout,
-            pagination_token,
-        )
-        page_metadata = collect_social_metadata(payload)
-        for key, value in page_metadata.items():
-            if key in social_metadata:
-                existing = social_metadata[key]
-                if "publishedAt" not in existing and "publishedAt" in value:
-                    existing["publishedAt"] = value["publishedAt"]
-            else:
-                social_metadata[key] = dict(value)
+    for cursor, payload in pages:
+        # Only the social-count and org-reaction records carry publishedAt.
+        if SOCIAL_COUNTS_OUTPUT in pending or ORGANIZATION_REACTIONS_OUTPUT in pending:
+            join.add_page(payload)
 
         if target_profile_id:
             owned_before = len(owned_posts)
@@ -651,42 +1174,26 @@ def fetch_all_updates(
                     file=sys.stderr,
                 )
 
-        def apply_metadata(record: Dict[str, Any]) -> None:
-            ent = record.get("entityUrn") or record.get("urn")
-            if not isinstance(ent, str):
-                return
-            meta = social_metadata.get(ent)
-            if not meta and ent.startswith("urn:li:fsd_socialActivityCounts:"):
-                meta = social_metadata.get(ent.split(":", 3)[-1])
-            if meta and "publishedAt" in meta and "publishedAt" not in record:
-                record["publishedAt"] = meta["publishedAt"]
-
-        for existing in social_counts.values():
-            apply_metadata(existing)
-        for existing in org_reactions.values():
-            apply_metadata(existing)
-
-        if social_counts_only:
-            harvest_social_counts(payload, social_counts, social_metadata)
-            new_in_page = 0
-            item_count = len(social_counts)
+        if SOCIAL_COUNTS_OUTPUT in pending:
+            harvest_social_counts(payload, social_counts, social_metadata, join.track)
             if verbose:
                 print(
-                    f"Fetched start={cursor} count={count}: collected social counts={item_count}",
+                    f"Fetched start={cursor} count={count}: collected social counts={len(social_counts)}",
                     file=sys.stderr,
                 )
-        elif organization_reactions_only:
-            harvest_organization_reactions(payload, org_reactions, social_metadata)
-            new_in_page = 0
-            item_count = len(org_reactions)
+        elif UPDATES_OUTPUT in pending and needs_counts:
+            harvest_social_counts(payload, social_counts)
+
+        if ORGANIZATION_REACTIONS_OUTPUT in pending:
+            harvest_organization_reactions(payload, org_reactions, social_metadata, join.track)
             if verbose:
                 print(
-                    f"Fetched start={cursor} count={count}: collected org reactions={item_count}",
+                    f"Fetched start={cursor} count={count}: collected org reactions={len(org_reactions)}",
                     file=sys.stderr,
                 )
-        else:
-            index = index_included(payload)
-            harvest_social_counts(payload, social_counts, social_metadata)
+
+        if UPDATES_OUTPUT in pending:
+            index = index_included(payload) if needs_index else {}
             order, updates = collect_updates(payload)
 
             new_in_page = 0
@@ -697,7 +1204,9 @@ def fetch_all_updates(
                 if not update:
                     continue
                 collected.append(
-                    simplify_update(update, index, include_raw, social_counts)
+                    simplify_update(
+                        update, index, include_raw, social_counts, ACTOR_CACHE, projection
+                    )
                 )
                 seen.add(urn)
                 new_in_page += 1
@@ -710,62 +1219,20 @@ def fetch_all_updates(
                     file=sys.stderr,
                 )
 
-        if social_counts_only and limit and len(social_counts) >= limit:
-            break
-        if organization_reactions_only and limit and len(org_reactions) >= limit:
-            break
-        if not social_counts_only and limit and len(collected) >= limit:
-            break
-        # Determine whether another page likely exists.
-        section = get_updates_section(payload)
-        items = section.get("items", []) if isinstance(section, dict) else []
-        next_token = extract_pagination_token(payload)
-        if len(items) < count and not next_token:
-            break
-        if not next_token:
-            break
-        if next_token in seen_tokens:
-            break
-        seen_tokens.add(next_token)
-        pagination_token = next_token
-        cursor += count
-
-    if social_counts_only:
-        results = [
-            item
-            for item in social_counts.values()
-            if _is_supported_social_entry(item)
-            and _entry_matches_owned(item, owned_posts)
-        ]
-        if limit:
-            return results[:limit]
-        return results
-    if organization_reactions_only:
-        results = [
-            item
-            for item in org_reactions.values()
-            if _is_supported_social_entry(item)
-            and _entry_matches_owned(item, owned_posts)
-        ]
-        if verbose:
-            print(
-                f"Authored organization reactions collected={len(results)}",
-                file=sys.stderr,
-            )
-        if not results and org_reactions:
-            if verbose:
-                print(
-                    "No owned organization reactions detected; falling back to entire set",
-                    file=sys.stderr,
-                )
-            results = list(org_reactions.values())
         if limit:
-            return results[:limit]
-        return results
+            sizes = {
+                UPDATES_OUTPUT: len(collected),
+                SOCIAL_COUNTS_OUTPUT: len(social_counts),
+                ORGANIZATION_REACTIONS_OUTPUT: len(org_reactions),
+            }
+            for kind in [kind for kind in pending if sizes[kind] >= limit]:
+                finish(kind)
+        if not pending:
+            break
 
-    if limit:
-        return collected[:limit]
-    return collected
+    for kind in list(pending):
+        finish(kind)
+    return results
 
 
 def _is_supported_social_entry(entry: Dict[str, Any]) -> bool:
@@ -803,9 +1270,9 @@ def _candidate_urns(entry: Dict[str, Any]) -> set[str]:
     return candidates
 
 
-URN_PATTERN = re.compile(r"urn:li:[a-zA-Z0-9_.:-]+")
-ACTIVITY_PATTERN = re.compile(r"activity[-:]?(\d{6,})", re.IGNORECASE)
-UGC_PATTERN = re.compile(r"ugcPost[-:]?(\d{6,})", re.IGNORECASE)
+URN_PATTERN = LazyPattern(r"urn:li:[a-zA-Z0-9_.:-]+")
+ACTIVITY_PATTERN = LazyPattern(r"activity[-:]?(\d{6,})", re.IGNORECASE)
+UGC_PATTERN = LazyPattern(r"ugcPost[-:]?(\d{6,})", re.IGNORECASE)
 
 
 def collect_owned_posts(payload: Dict[str, Any], profile_id: str) -> set[str]:
@@ -865,8 +1332,19 @@ def _extract_profile_id(profile_urn: str) -> Optional[str]:
     return None
 
 
+def write_records(path: str, records: List[Dict[str, Any]], ndjson: bool, compact: bool) -> None:
+    if ndjson:
+        from record_index import write_indexed
+
+        write_indexed(path, records)
+    else:
+        with open(path, "w", encoding="utf-8") as handle:
+            json_backend.dump(records, handle, compact=compact, ensure_ascii=False)
+
+
 def main() -> None:
     args = parse_args()
+    metrics.export_at_exit(args.metrics_file)
     cookie_header = args.cookie or os.getenv("LINKEDIN_COOKIE") or DEFAULT_COOKIE
     csrf_token = args.csrf_token or os.getenv("LINKEDIN_CSRF_TOKEN") or DEFAULT_CSRF_TOKEN
 
@@ -894,28 +1372,117 @@ def main() -> None:
 
     args.count = count_value
 
+    if args.ndjson and not args.output:
+        raise SystemExit("--ndjson requires --output")
+
+    extra_outputs = {
+        kind: path
+        for kind, path in (
+            (SOCIAL_COUNTS_OUTPUT, args.social_counts_output),
+            (ORGANIZATION_REACTIONS_OUTPUT, args.organization_reactions_output),
+        )
+        if path
+    }
+    if extra_outputs and (args.social_counts_only or args.organization_reactions_only):
+        raise SystemExit(
+            "--social-counts-output/--organization-reactions-output collect alongside the "
+            "updates; drop --social-counts-only/--organization-reactions-only"
+        )
+
+    projection = None
+    if args.fields:
+        if args.social_counts_only or args.organization_reactions_only:
+            raise SystemExit(
+                "--fields selects update fields; it cannot be combined with "
+                "--social-counts-only or --organization-reactions-only"
+            )
+        try:
+            projection = parse_fields(args.fields)
+        except ValueError as exc:
+            raise SystemExit(str(exc)) from exc
+
+    # Index the previous snapshot before --output may overwrite it.
+    previous_index = None
+    if args.diff_against:
+        from changeset import load_index
+
+        previous_index = load_index(args.diff_against)
+
+    dedupe = None
+    if args.dedupe_index:
+        from dedupe_index import DedupeIndex
+
+        dedupe = DedupeIndex(args.dedupe_index, bloom_bits_per_key=args.dedupe_bloom_bits)
+
+    ACTOR_CACHE.resize(args.actor_cache_size)
     session = build_session(cookie_header, csrf_token, args.referer, args.header)
     target_profile_id = _extract_profile_id(args.profile_urn)
-    updates = fetch_all_updates(
-        session=session,
-        profile_urn=args.profile_urn,
-        start=args.start,
-        count=args.count,
-        timeout=args.timeout,
-        limit=args.limit,
-        verbose=args.verbose,
-        include_raw=args.include_raw,
-        social_counts_only=args.social_counts_only,
-        organization_reactions_only=args.organization_reactions_only,
-        target_profile_id=target_profile_id,
-    )
+    if extra_outputs:
+        results = summarize_update_outputs(
+            iter_update_pages(session, args.profile_urn, args.start, args.count, args.timeout),
+            (UPDATES_OUTPUT, *extra_outputs),
+            count=args.count,
+            limit=args.limit,
+            verbose=args.verbose,
+            include_raw=args.include_raw,
+            target_profile_id=target_profile_id,
+            projection=projection,
+        )
+        updates = results[UPDATES_OUTPUT]
+        for kind, path in extra_outputs.items():
+            records = results[kind]
+            if dedupe is not None:
+                records = dedupe.filter_new(records)
+            write_records(path, records, ndjson=args.ndjson, compact=args.compact)
+            if args.verbose:
+                print(f"Wrote {len(records)} {kind} records to {path}", file=sys.stderr)
+    else:
+        updates = fetch_all_updates(
+            session=session,
+            profile_urn=args.profile_urn,
+            start=args.start,
+            count=args.count,
+            timeout=args.timeout,
+            limit=args.limit,
+            verbose=args.verbose,
+            include_raw=args.include_raw,
+            social_counts_only=args.social_counts_only,
+            organization_reactions_only=args.organization_reactions_only,
+            target_profile_id=target_profile_id,
+            projection=projection,
+        )
+    if args.verbose:
+        print(f"Actor cache: {ACTOR_CACHE.stats()}", file=sys.stderr)
+
+    if previous_index is not None:
+        from changeset import diff_records, write_changeset
 
+        changes = diff_records(updates, previous_index, base=args.diff_against)
+        write_changeset(changes, args.changes_output)
+        if args.verbose:
+            print(
+                f"Changeset: {len(changes['added'])} new, {len(changes['changed'])} changed, "
+                f"{changes['unchanged']} unchanged against {len(previous_index)} previous records",
+                file=sys.stderr,
+            )
+        # The changeset owns stdout; the full result is only written to --output.
+        if not args.output:
+            if dedupe is not None:
+                dedupe.close()
+            return
+
+    if dedupe is not None:
+        updates = dedupe.filter_new(updates)
     if args.output:
-        with open(args.output, "w", encoding="utf-8") as handle:
-            json.dump(updates, handle, indent=2, ensure_ascii=False)
+        write_records(args.output, updates, ndjson=args.ndjson, compact=args.compact)
     else:
-        json.dump(updates, sys.stdout, indent=2, ensure_ascii=False)
+        json_backend.dump(updates, sys.stdout, compact=args.compact, ensure_ascii=False)
         sys.stdout.write("\n")
+    if dedupe is not None:
+        # Only flushed once every output is written, so a failed run records nothing.
+        if args.verbose:
+            print(f"Dedupe index: {dedupe.stats()}", file=sys.stderr)
+        dedupe.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""Fetch LinkedIn network info (follower/connection counts) for public identifiers.
+
+Python counterpart of ``cloud-function/profile_network_info_function.js``: a
+GET against
+``https://www.linkedin.com/voyager/api/identity/profiles/<publicId>/networkinfo``
+whose ``data`` object carries ``followersCount`` and friends.
+
+Unlike the cloud function, many identifiers are fetched concurrently over the
+shared, warm sessions of :mod:`lkvanity.sessions`, and results go through a TTL
+cache (optionally persisted with ``--cache-file``) because follower counts
+change slowly. Output is NDJSON, one object per identifier.
+
+Example usage:
+
+    python fetch_network_info.py ramzib k-dumont --cache-file networkinfo-cache.json
+    python fetch_network_info.py --ids-file creators.txt --concurrency 16 --output followers.ndjson
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import quote
+
+import json_backend
+import metrics
+
+if TYPE_CHECKING:
+    import requests
+
+    from lkvanity.cache import TTLCache
+    from lkvanity.sessions import SessionPool
+
+NETWORKINFO_BASE_URL = "https://www.linkedin.com/voyager/api/identity/profiles"
+DEFAULT_TTL_SECONDS = 86400.0
+
+
+def build_network_info_url(public_id: str) -> str:
+    return f"{NETWORKINFO_BASE_URL}/{quote(public_id, safe='')}/networkinfo"
+
+
+def fetch_network_info(
+    session: requests.Session,
+    public_id: str,
+    timeout: float,
+) -> Dict[str, Any]:
+    """Return the ``data`` object of the networkinfo response (empty if absent)."""
+    import requests
+
+    response = session.get(build_network_info_url(public_id), timeout=timeout)
+    try:
+        response.raise_for_status()
+    except requests.HTTPError as exc:
+        details = response.text.strip()
+        if details:
+            raise requests.HTTPError(f"{exc} -> {details[:200]}", response=response) from None
+        raise
+    payload = json_backend.decode_response(response)
+    data = payload.get("data") if isinstance(payload, dict) else None
+    return data if isinstance(data, dict) else {}
+
+
+class NetworkInfoFetcher:
+    """Cached, concurrent network info lookups over a :class:`SessionPool`."""
+
+    def __init__(
+        self,
+        pool: SessionPool,
+        timeout: float = 30.0,
+        cache: Optional[TTLCache] = None,
+        concurrency: int = 8,
+    ) -> None:
+        from lkvanity.cache import TTLCache
+
+        self.pool = pool
+        self.timeout = timeout
+        self.cache = cache if cache is not None else TTLCache(DEFAULT_TTL_SECONDS)
+        self.concurrency = concurrency
+        self.requests_made = 0
+
+    def get(self, public_id: str) -> Dict[str, Any]:
+        cached = self.cache.get(public_id)
+        if cached is not None:
+            return cached
+        return self._fetch(public_id)
+
+    def _fetch(self, public_id: str) -> Dict[str, Any]:
+        data = fetch_network_info(self.pool.voyager(), public_id, self.timeout)
+        self.requests_made += 1
+        self.cache.set(public_id, data)
+        return data
+
+    def fetch_many(self, public_ids: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Yield one NDJSON-ready record per identifier, in input order.
+
+        Cache hits are answered without touching the executor; misses are
+        fetched ``concurrency`` at a time. Failures become ``error`` records.
+        """
+        ordered = list(dict.fromkeys(public_ids))
+        cached: Dict[str, Dict[str, Any]] = {}
+        for public_id in ordered:
+            data = self.cache.get(public_id)
+            if data is not None:
+                cached[public_id] = data
+
+        def lookup(public_id: str) -> Dict[str, Any]:
+            try:
+                data = self._fetch(public_id)
+            except Exception as exc:
+                return {"publicId": public_id, "error": str(exc)}
+            return self._record(public_id, data, cached=False)
+
+        misses = [public_id for public_id in ordered if public_id not in cached]
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as executor:
+            futures = {public_id: executor.submit(lookup, public_id) for public_id in misses}
+            for public_id in ordered:
+                if public_id in cached:
+                    yield self._record(public_id, cached[public_id], cached=True)
+                else:
+                    yield futures[public_id].result()
+
+    @staticmethod
+    def _record(public_id: str, data: Dict[str, Any], cached: bool) -> Dict[str, Any]:
+        return {
+            "publicId": public_id,
+            "followersCount": data.get("followersCount"),
+            "connectionsCount": data.get("connectionsCount"),
+            "cached": cached,
+            "data": data,
+        }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Fetch LinkedIn follower counts for many public identifiers as NDJSON",
+    )
+    parser.add_argument(
+        "public_ids",
+        nargs="*",
+        help="Public identifiers (vanity names), e.g. 'ramzib'.",
+    )
+    parser.add_argument(
+        "--ids-file",
+        help="File with one public identifier per line (blank lines and # comments ignored).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Concurrent networkinfo requests (default: 8).",
+    )
+    parser.add_argument(
+        "--cache-file",
+        help="Persist the TTL cache to this JSON file between runs.",
+    )
+    parser.add_argument(
+        "--ttl",
+        type=float,
+        default=DEFAULT_TTL_SECONDS,
+        help=f"Seconds a cached result stays valid (default: {DEFAULT_TTL_SECONDS:g}).",
+    )
+    parser.add_argument(
+        "--cookie",
+        help="Cookie header string. Defaults to LINKEDIN_COOKIE env var or module default.",
+    )
+    parser.add_argument(
+        "--csrf-token",
+        dest="csrf_token",
+        help="CSRF token value. Defaults to LINKEDIN_CSRF_TOKEN env var or module default.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=30.0,
+        help="HTTP timeout in seconds (default: 30).",
+    )
+    parser.add_argument(
+        "--output",
+        help="Write NDJSON to this path instead of stdout.",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print cache statistics to stderr.",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Write OpenMetrics request/pagination counters to this textfile on exit.",
+    )
+    return parser.parse_args()
+
+
+def read_ids(args: argparse.Namespace) -> List[str]:
+    public_ids = list(args.public_ids)
+    if args.ids_file:
+        with open(args.ids_file, "r", encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    public_ids.append(line)
+    return public_ids
+
+
+def main() -> int:
+    args = parse_args()
+    metrics.export_at_exit(args.metrics_file)
+    public_ids = read_ids(args)
+    if not public_ids:
+        raise SystemExit("No public identifiers given. Pass them as arguments or via --ids-file.")
+
+    from lkvanity.cache import FileTTLCache
+    from lkvanity.sessions import SessionPool, resolve_credentials
+
+    cookie_header, csrf_token = resolve_credentials(args.cookie, args.csrf_token)
+    pool = SessionPool(cookie_header, csrf_token, pool_size=max(8, args.concurrency))
+    cache = FileTTLCache(args.cache_file, args.ttl)
+    fetcher = NetworkInfoFetcher(pool, args.timeout, cache, args.concurrency)
+
+    handle = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    failures = 0
+    try:
+        for record in fetcher.fetch_many(public_ids):
+            if "error" in record:
+                failures += 1
+            handle.write(json_backend.dumps(record, compact=True))
+            handle.write("\n")
+    finally:
+        if handle is not sys.stdout:
+            handle.close()
+        cache.save()
+        pool.close()
+
+    if args.verbose:
+        print(
+            f"networkinfo: {len(public_ids)} ids, {fetcher.requests_made} requests, "
+            f"cache={cache.stats()}",
+            file=sys.stderr,
+        )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""JSON encode/decode helpers shared by the CLIs.
+
+``orjson`` is used when it is installed and the standard library otherwise; set
+``LKVANITY_JSON_BACKEND=stdlib`` to force the fallback. Decoding accepts raw
+bytes so HTTP bodies can be parsed straight from ``response.content`` without
+an intermediate text decode, and every writer can switch between the historical
+``indent=2`` layout and a compact single-line form. ``ensure_ascii`` escapes
+non-ASCII as ``\\uXXXX``; by default the indented layout is escaped (the
+historical ``json.dump(indent=2)`` bytes of ``fetchv2``) and the compact form
+writes raw UTF-8. Callers that historically wrote ``ensure_ascii=False`` pass it
+explicitly.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from typing import IO, Any, Optional, Union
+
+try:  # pragma: no cover - depends on the environment
+    if os.getenv("LKVANITY_JSON_BACKEND", "").lower() == "stdlib":
+        raise ImportError
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+_NON_ASCII = re.compile("[^\x00-\x7f]")
+
+
+def _escape_non_ascii(match: "re.Match[str]") -> str:
+    code = ord(match.group())
+    if code > 0xFFFF:
+        code -= 0x10000
+        return "\\u%04x\\u%04x" % (0xD800 | (code >> 10), 0xDC00 | (code & 0x3FF))
+    return "\\u%04x" % code
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, compact: bool = False, ensure_ascii: Optional[bool] = None) -> str:
+    """Serialize ``obj`` either compactly or with two-space indentation."""
+    return dumps_bytes(obj, compact=compact, ensure_ascii=ensure_ascii).decode("utf-8")
+
+
+def dumps_bytes(obj: Any, compact: bool = False, ensure_ascii: Optional[bool] = None) -> bytes:
+    """Like :func:`dumps`; ``ensure_ascii`` defaults to escaping only the indented layout."""
+    if ensure_ascii is None:
+        ensure_ascii = not compact
+    if orjson is not None:
+        try:
+            body = orjson.dumps(obj, option=0 if compact else orjson.OPT_INDENT_2)
+        except TypeError:
+            # Oversized integers or non-string keys: let the stdlib handle them.
+            pass
+        else:
+            if not ensure_ascii or body.isascii():
+                return body
+            # Non-ASCII only occurs inside strings, so escaping it keeps the document valid.
+            return _NON_ASCII.sub(_escape_non_ascii, body.decode("utf-8")).encode("ascii")
+    if compact:
+        text = json.dumps(obj, ensure_ascii=ensure_ascii, separators=(",", ":"))
+    else:
+        text = json.dumps(obj, indent=2, ensure_ascii=ensure_ascii)
+    return text.encode("utf-8")
+
+
+def dump(
+    obj: Any, handle: IO[str], compact: bool = False, ensure_ascii: Optional[bool] = None
+) -> None:
+    handle.write(dumps(obj, compact=compact, ensure_ascii=ensure_ascii))
+
+
+def canonical_key(obj: Any) -> str:
+    """Return a stable, key-sorted compact encoding suitable as a dict key."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+def decode_response(response: Any) -> Any:
+    """Parse a ``requests`` response body from its raw bytes."""
+    return loads(response.content)
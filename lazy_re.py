@@ -0,0 +1,34 @@
+"""Regular expressions that compile on first use.
+
+Module-level patterns in the CLIs are declared with :class:`LazyPattern` so that
+importing a script for ``--help`` or a cache hit does not pay for compiling
+patterns it never runs.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Optional
+
+
+class LazyPattern:
+    """Drop-in stand-in for ``re.Pattern`` that defers ``re.compile``."""
+
+    __slots__ = ("_source", "_flags", "_compiled")
+
+    def __init__(self, source: str, flags: int = 0) -> None:
+        self._source = source
+        self._flags = flags
+        self._compiled: Optional[re.Pattern[str]] = None
+
+    @property
+    def compiled(self) -> re.Pattern[str]:
+        if self._compiled is None:
+            self._compiled = re.compile(self._source, self._flags)
+        return self._compiled
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.compiled, name)
+
+    def __repr__(self) -> str:
+        return f"LazyPattern({self._source!r}, {self._flags!r})"
@@ -0,0 +1,6 @@
+"""Unified ``lkvanity`` command line for the LinkedIn vanity-metrics scripts.
+
+Each subcommand maps onto one of the standalone scripts in the repository root
+and is only imported once it has been selected, keeping ``lkvanity --help`` and
+short-lived batch invocations cheap to start.
+"""
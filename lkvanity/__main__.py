@@ -0,0 +1,5 @@
+import sys
+
+from lkvanity.cli import main
+
+sys.exit(main())
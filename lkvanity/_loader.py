@@ -0,0 +1,38 @@
+"""Import the repository-root scripts as modules on demand."""
+
+from __future__ import annotations
+
+import importlib
+import importlib.machinery
+import importlib.util
+import os
+import sys
+from types import ModuleType
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_script(name: str) -> ModuleType:
+    """Return the root-level script ``name`` as a module, importing it at most once.
+
+    Scripts without a ``.py`` suffix (``fetchv2``) are loaded from their source
+    file directly; everything else goes through the normal import system.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+
+    path = os.path.join(REPO_ROOT, name)
+    if os.path.isfile(path) and not os.path.exists(path + ".py"):
+        loader = importlib.machinery.SourceFileLoader(name, path)
+        spec = importlib.util.spec_from_loader(name, loader)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            loader.exec_module(module)
+        except BaseException:
+            sys.modules.pop(name, None)
+            raise
+        return module
+    return importlib.import_module(name)
@@ -0,0 +1,182 @@
+"""Small thread-safe in-process caches and request coalescing."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import json_backend
+
+
+class TTLCache:
+    """Bounded mapping whose entries expire ``ttl`` seconds after being stored.
+
+    A ``ttl`` of zero (or less) disables caching entirely, which keeps call sites
+    free of ``if cache_enabled`` branches.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+class FileTTLCache(TTLCache):
+    """:class:`TTLCache` on wall-clock time that can be saved to and loaded from JSON.
+
+    Keys must be strings. Expired entries are dropped on load, so a cache file
+    shared by successive batch runs only ever serves values younger than ``ttl``.
+    """
+
+    def __init__(self, path: Optional[str], ttl: float, max_entries: int = 100_000) -> None:
+        super().__init__(ttl, max_entries=max_entries, clock=time.time)
+        self.path = path
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def load(self, path: str) -> None:
+        with open(path, "rb") as handle:
+            stored = json_backend.loads(handle.read() or b"{}")
+        now = self._clock()
+        with self._lock:
+            for key, entry in stored.items():
+                expires_at = entry.get("expiresAt")
+                if isinstance(expires_at, (int, float)) and expires_at > now:
+                    self._entries[key] = (float(expires_at), entry.get("value"))
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        if not path:
+            return
+        with self._lock:
+            snapshot = {
+                key: {"expiresAt": expires_at, "value": value}
+                for key, (expires_at, value) in self._entries.items()
+            }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json_backend.dump(snapshot, handle, compact=True)
+        os.replace(tmp_path, path)
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls that share a key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight block until it finishes and get the same result (or exception).
+    With ``result_ttl`` > 0 a successful result is also served to callers that
+    arrive up to that many seconds after completion.
+    """
+
+    def __init__(
+        self,
+        result_ttl: float = 0.0,
+        max_entries: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.results = TTLCache(result_ttl, max_entries=max_entries, clock=clock)
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        if self.results.ttl > 0:
+            cached = self.results.get(key)
+            if cached is not None:
+                return cached
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = func()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                if flight.error is None:
+                    # Cached before the flight is dropped so no caller misses both.
+                    self.results.set(key, flight.result)
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "inFlight": len(self._flights),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "results": self.results.stats(),
+        }
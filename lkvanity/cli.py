@@ -0,0 +1,99 @@
+"""Subcommand dispatcher for ``python -m lkvanity``.
+
+The top level deliberately avoids argparse and every script import: it only
+looks at ``argv[0]`` to pick a subcommand, then loads that script and hands it
+the remaining arguments so each subcommand keeps its existing flags and help.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Dict, List, NamedTuple, Optional
+
+from lkvanity._loader import load_script
+
+
+class Command(NamedTuple):
+    script: str
+    summary: str
+
+
+COMMANDS: Dict[str, Command] = {
+    "updates": Command(
+        "fetch_linkedin_profile_updates",
+        "Fetch profile updates, social counts or organization reactions",
+    ),
+    "posts": Command(
+        "fetchv2",
+        "Collect raw included entities and derive authored post counts",
+    ),
+    "cards": Command(
+        "fetch_linkedin_posts",
+        "Fetch notification cards scoped to a vanity profile",
+    ),
+    "urn": Command(
+        "extract_profile_urn",
+        "Resolve a vanity URL to its profile URN and image",
+    ),
+    "networkinfo": Command(
+        "fetch_network_info",
+        "Fetch follower counts for many public identifiers (cached, NDJSON)",
+    ),
+    "serve": Command(
+        "lkvanity.service",
+        "Run the long-lived local HTTP service with warm sessions",
+    ),
+    "refresh": Command(
+        "lkvanity.refresh",
+        "Refresh creators with URN, posts and network info overlapped",
+    ),
+    "schedule": Command(
+        "lkvanity.schedule",
+        "Refresh the creators that need it most within an hourly request budget",
+    ),
+    "reprocess": Command(
+        "lkvanity.reprocess",
+        "Rebuild derived outputs from saved raw payloads on every core",
+    ),
+    "leaderboard": Command(
+        "lkvanity.leaderboard",
+        "Rank creators by engagement over 7d/30d/all-time windows",
+    ),
+    "queue": Command(
+        "lkvanity.workqueue",
+        "Lease-based refresh queue: enqueue creators, run workers, show status",
+    ),
+}
+
+
+def usage() -> str:
+    width = max(len(name) for name in COMMANDS)
+    lines = [
+        "usage: lkvanity <command> [options]",
+        "",
+        "commands:",
+    ]
+    for name, command in COMMANDS.items():
+        lines.append(f"  {name:<{width}}  {command.summary}")
+    lines.append("")
+    lines.append("Run `lkvanity <command> --help` for command options.")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = list(sys.argv[1:] if argv is None else argv)
+    if not args or args[0] in {"-h", "--help"}:
+        print(usage())
+        return 0
+
+    name, rest = args[0], args[1:]
+    command = COMMANDS.get(name)
+    if command is None:
+        print(usage(), file=sys.stderr)
+        print(f"\nlkvanity: unknown command '{name}'", file=sys.stderr)
+        return 2
+
+    module = load_script(command.script)
+    sys.argv = [f"lkvanity {name}", *rest]
+    result = module.main()
+    return result if isinstance(result, int) else 0
@@ -0,0 +1,136 @@
+"""Check ``lkvanity`` startup against an import-time budget.
+
+Runs ``python -X importtime -m lkvanity <command> --help`` for every subcommand,
+sums the cumulative time of top-level imports that a bare ``python -c pass``
+does not already perform (``site`` and friends), and fails when any run exceeds
+the budget or pulls in a module that should only be loaded on demand. Batch jobs
+start these tools thousands of times a day, so this runs in CI on every push
+(``.github/workflows/importcheck.yml``). A command over the budget is measured
+again up to ``--retries`` times before it fails, so one slow start on a shared
+runner does not fail the build; an eagerly imported module always fails.
+
+Example usage:
+
+    python -m lkvanity.importcheck --budget-ms 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from typing import List, Optional, Sequence, Set, Tuple
+
+from lkvanity._loader import REPO_ROOT
+from lkvanity.cli import COMMANDS
+
+DEFAULT_BUDGET_MS = 40.0
+FORBIDDEN_MODULES = ("requests", "urllib3", "pyarrow")
+
+
+def _run_importtime(argv: Sequence[str]) -> List[Tuple[int, str, bool]]:
+    """Return ``(cumulative_us, module, is_top_level)`` for every import logged."""
+    result = subprocess.run(
+        argv,
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"{' '.join(argv[3:])} exited with {result.returncode}:\n{result.stderr}")
+
+    entries: List[Tuple[int, str, bool]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue
+        # Nested imports are indented by at least two spaces after the separator.
+        entries.append((int(cumulative.strip()), name.strip(), not name.startswith("  ")))
+    return entries
+
+
+def interpreter_baseline() -> Set[str]:
+    """Modules that every ``python`` start imports regardless of the command."""
+    entries = _run_importtime([sys.executable, "-X", "importtime", "-c", "pass"])
+    return {name for _, name, _ in entries}
+
+
+def measure(
+    command: Optional[str], baseline: Set[str]
+) -> Tuple[float, List[Tuple[float, str]]]:
+    """Return lkvanity's own import time (ms) and per-module cumulative times."""
+    argv = [sys.executable, "-X", "importtime", "-m", "lkvanity"]
+    if command:
+        argv.append(command)
+    argv.append("--help")
+
+    total_us = 0
+    modules: List[Tuple[float, str]] = []
+    for micros, name, top_level in _run_importtime(argv):
+        if name in baseline:
+            continue
+        modules.append((micros / 1000, name))
+        if top_level:
+            total_us += micros
+    return total_us / 1000, modules
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fail when lkvanity startup exceeds an import budget")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help=f"Maximum cumulative import time per invocation (default: {DEFAULT_BUDGET_MS:g}).",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=5,
+        help="Number of slowest imports to report per command (default: 5).",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="Re-measure commands over the budget this many times (default: 2).",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    baseline = interpreter_baseline()
+    # Warm the bytecode cache so the first command is not penalised for compiling.
+    measure(None, baseline)
+
+    failures = 0
+    for command in [None, *COMMANDS]:
+        label = command or "(top level)"
+        total_ms, modules = measure(command, baseline)
+        for _ in range(args.retries):
+            if total_ms <= args.budget_ms:
+                break
+            retry_ms, retry_modules = measure(command, baseline)
+            if retry_ms < total_ms:
+                total_ms, modules = retry_ms, retry_modules
+        loaded = {name for _, name in modules}
+        forbidden = [name for name in FORBIDDEN_MODULES if name in loaded]
+        status = "ok"
+        if total_ms > args.budget_ms or forbidden:
+            status = "FAIL"
+            failures += 1
+        print(f"{label:<14} {total_ms:8.1f} ms  {status}")
+        if forbidden:
+            print(f"  eagerly imported: {', '.join(forbidden)}")
+        if status == "FAIL":
+            for elapsed, name in sorted(modules, reverse=True)[: args.top]:
+                print(f"  {elapsed:8.1f} ms  {name}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+"""Incremental creator leaderboards over collected posts.
+
+Every (window, metric) pair is a :class:`RankingBoard`: a max-heap with lazy
+deletion, so re-scoring one creator after a refresh is a single O(log n) push
+and reading the top N costs O(N log n) rather than a full re-sort.
+
+Windows are ``7d``, ``30d`` and ``all``. Metrics are total engagement (likes +
+comments + shares), engagement per post and engagement per follower. Windowed
+scores also change when posts age out without any refresh; each window keeps
+a heap of the next moment a creator's score changes, and reads re-score just
+the creators whose oldest in-window post has expired.
+
+Input is the NDJSON written by ``lkvanity refresh`` (one object per creator
+with ``username``/``creator``, ``posts`` and ``followersCount``).
+
+Example usage:
+
+    python -m lkvanity refresh --creators-file creators.txt --output refresh.ndjson
+    python -m lkvanity leaderboard refresh.ndjson --window 7d --metric engagement --top 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import sys
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import json_backend
+
+DAY_MS = 86_400_000
+WINDOWS: Dict[str, Optional[int]] = {"7d": 7 * DAY_MS, "30d": 30 * DAY_MS, "all": None}
+METRICS = ("engagement", "engagementPerPost", "engagementPerFollower")
+
+
+class RankingBoard:
+    """Top-N ranking of ``creator -> score`` with O(log n) updates.
+
+    Superseded heap entries are skipped when read and the heap is rebuilt once
+    they outnumber the live ones, which keeps memory at O(n) amortized.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, str, int]] = []
+        self._live: Dict[str, Tuple[float, int]] = {}
+        self._tokens = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __contains__(self, creator: str) -> bool:
+        return creator in self._live
+
+    def score(self, creator: str) -> Optional[float]:
+        entry = self._live.get(creator)
+        return entry[0] if entry else None
+
+    def set(self, creator: str, score: Optional[float]) -> None:
+        if score is None:
+            self.discard(creator)
+            return
+        current = self._live.get(creator)
+        if current is not None and current[0] == score:
+            return
+        token = next(self._tokens)
+        self._live[creator] = (score, token)
+        heapq.heappush(self._heap, (-score, creator, token))
+        self._maybe_compact()
+
+    def discard(self, creator: str) -> None:
+        if self._live.pop(creator, None) is not None:
+            self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        if len(self._heap) > 2 * len(self._live) + 64:
+            self._heap = [(-score, creator, token) for creator, (score, token) in self._live.items()]
+            heapq.heapify(self._heap)
+
+    def _is_live(self, entry: Tuple[float, str, int]) -> bool:
+        current = self._live.get(entry[1])
+        return current is not None and current[1] == entry[2]
+
+    def top(self, n: int) -> List[Tuple[str, float]]:
+        """Return up to ``n`` ``(creator, score)`` pairs, best first (ties by name)."""
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        taken: List[Tuple[float, str, int]] = []
+        while heap and len(taken) < n:
+            entry = heapq.heappop(heap)
+            if self._is_live(entry):
+                taken.append(entry)
+        for entry in taken:
+            heapq.heappush(heap, entry)
+        return [(creator, -neg_score) for neg_score, creator, _ in taken]
+
+    def rank(self, creator: str) -> Optional[int]:
+        """1-based rank of ``creator`` (O(n); meant for occasional lookups)."""
+        entry = self._live.get(creator)
+        if entry is None:
+            return None
+        key = (-entry[0], creator)
+        return 1 + sum(1 for other, (score, _) in self._live.items() if (-score, other) < key)
+
+
+def _engagement(post: Dict[str, Any]) -> int:
+    return (
+        int(post.get("numLikes") or 0)
+        + int(post.get("numComments") or 0)
+        + int(post.get("numShares") or 0)
+    )
+
+
+class _CreatorPosts:
+    """A creator's posts sorted by ``publishedAt`` with engagement prefix sums."""
+
+    def __init__(self, posts: Iterable[Dict[str, Any]], followers: Optional[int]) -> None:
+        dated = sorted(
+            (int(post.get("publishedAt") or 0), _engagement(post))
+            for post in posts
+            if isinstance(post, dict)
+        )
+        self.published = [published for published, _ in dated]
+        self.prefix = [0]
+        for _, engagement in dated:
+            self.prefix.append(self.prefix[-1] + engagement)
+        self.followers = followers
+
+    def window(self, start_ms: Optional[int]) -> Tuple[int, int, Optional[int]]:
+        """Return ``(engagement, posts, next_expiry_ms)`` for posts at or after ``start_ms``."""
+        first = 0 if start_ms is None else bisect_left(self.published, start_ms)
+        count = len(self.published) - first
+        total = self.prefix[-1] - self.prefix[first]
+        next_expiry = self.published[first] if count and start_ms is not None else None
+        return total, count, next_expiry
+
+    def metrics(self, total: int, count: int) -> Dict[str, Optional[float]]:
+        return {
+            "engagement": float(total),
+            "engagementPerPost": total / count if count else 0.0,
+            "engagementPerFollower": total / self.followers if self.followers else None,
+        }
+
+
+class LeaderboardEngine:
+    """Rankings for every window and metric, updated one creator at a time."""
+
+    def __init__(
+        self,
+        windows: Optional[Dict[str, Optional[int]]] = None,
+        metrics: Sequence[str] = METRICS,
+    ) -> None:
+        self.windows = dict(WINDOWS if windows is None else windows)
+        self.metrics = tuple(metrics)
+        self.boards: Dict[Tuple[str, str], RankingBoard] = {
+            (window, metric): RankingBoard() for window in self.windows for metric in self.metrics
+        }
+        self._creators: Dict[str, _CreatorPosts] = {}
+        # window -> heap of (expires_at_ms, creator, token) for lazy re-scoring.
+        self._expiries: Dict[str, List[Tuple[int, str, int]]] = {w: [] for w in self.windows}
+        self._expiry_tokens: Dict[Tuple[str, str], int] = {}
+        self._tokens = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._creators)
+
+    def update(
+        self,
+        creator: str,
+        posts: Iterable[Dict[str, Any]],
+        followers: Optional[int] = None,
+        now_ms: Optional[int] = None,
+    ) -> None:
+        """Replace ``creator``'s posts and re-score it on every board."""
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        self._creators[creator] = _CreatorPosts(posts, followers)
+        for window in self.windows:
+            self._score(creator, window, now_ms)
+
+    def remove(self, creator: str) -> None:
+        self._creators.pop(creator, None)
+        for board in self.boards.values():
+            board.discard(creator)
+        for window in self.windows:
+            self._expiry_tokens.pop((window, creator), None)
+
+    def _score(self, creator: str, window: str, now_ms: int) -> None:
+        span = self.windows[window]
+        start_ms = now_ms - span if span is not None else None
+        posts = self._creators[creator]
+        total, count, oldest = posts.window(start_ms)
+        for metric, value in posts.metrics(total, count).items():
+            if metric in self.metrics:
+                self.boards[(window, metric)].set(creator, value)
+        if oldest is not None:
+            token = next(self._tokens)
+            self._expiry_tokens[(window, creator)] = token
+            # The score changes once the oldest in-window post leaves the window.
+            heapq.heappush(self._expiries[window], (oldest + span + 1, creator, token))
+        else:
+            self._expiry_tokens.pop((window, creator), None)
+
+    def advance(self, now_ms: Optional[int] = None) -> int:
+        """Re-score creators whose windowed posts expired by ``now_ms``; returns how many."""
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        rescored = 0
+        for window, expiries in self._expiries.items():
+            while expiries and expiries[0][0] <= now_ms:
+                _, creator, token = heapq.heappop(expiries)
+                if self._expiry_tokens.get((window, creator)) != token:
+                    continue
+                self._score(creator, window, now_ms)
+                rescored += 1
+        return rescored
+
+    def top(
+        self, window: str, metric: str, n: int = 10, now_ms: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        if (window, metric) not in self.boards:
+            raise KeyError(f"Unknown board {window}/{metric}")
+        self.advance(now_ms)
+        return self.boards[(window, metric)].top(n)
+
+
+def read_records(paths: Sequence[str]) -> Iterator[Dict[str, Any]]:
+    for path in paths:
+        handle = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+        try:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    yield json_backend.loads(line)
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Rank creators by engagement from refresh NDJSON output",
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="NDJSON files from `lkvanity refresh` ('-' for stdin); later lines win.",
+    )
+    parser.add_argument(
+        "--window",
+        choices=sorted(WINDOWS),
+        action="append",
+        help="Window to print; can be repeated (default: all windows).",
+    )
+    parser.add_argument(
+        "--metric",
+        choices=METRICS,
+        action="append",
+        help="Metric to print; can be repeated (default: all metrics).",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Creators per ranking (default: 10).",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.top <= 0:
+        raise SystemExit("--top must be positive")
+
+    engine = LeaderboardEngine()
+    now_ms = int(time.time() * 1000)
+    for record in read_records(args.inputs):
+        creator = record.get("username") or record.get("creator")
+        if not creator or record.get("error") or record.get("posts") is None:
+            continue
+        engine.update(creator, record["posts"], record.get("followersCount"), now_ms)
+
+    for window in args.window or list(WINDOWS):
+        for metric in args.metric or list(METRICS):
+            ranking = engine.top(window, metric, args.top, now_ms)
+            entries = [
+                {"rank": position, "creator": creator, "score": round(score, 6)}
+                for position, (creator, score) in enumerate(ranking, 1)
+            ]
+            sys.stdout.write(
+                json_backend.dumps(
+                    {"window": window, "metric": metric, "ranking": entries}, compact=True
+                )
+                + "\n"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
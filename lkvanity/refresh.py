@@ -0,0 +1,326 @@
+"""Refresh creators with URN resolution, pagination and network info overlapped.
+
+``profilePostsFetcher`` runs URN resolution, post pagination and the network
+info call strictly one after another. Here each creator gets a small dependency
+graph instead:
+
+    urn ──> posts
+    networkinfo            (needs only the vanity)
+
+Every step starts as soon as its inputs are available, so per-creator latency
+is the critical path ``max(urn + posts, networkinfo)`` rather than the sum.
+Several creators are refreshed at once and all steps share the warm sessions
+of :mod:`lkvanity.sessions`.
+
+Each creator is ``vanity``, a profile URL, or ``vanity,profileUrn`` when the
+URN is already known (which skips resolution). Results are written as NDJSON,
+one object per creator, including per-step timings.
+
+Example usage:
+
+    python -m lkvanity refresh ramzib k-dumont --count 100
+    python -m lkvanity refresh --creators-file creators.txt --output refresh.ndjson
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from lkvanity._loader import load_script
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
+    from lkvanity.service import VanityService
+
+# Mirrors lkvanity.service.DEFAULT_COUNT; the service, sessions and executor
+# modules are only imported once a command actually runs, keeping --help cheap.
+DEFAULT_COUNT = 100
+
+TaskSpec = Tuple[Sequence[str], Callable[..., Any]]
+
+
+def run_graph(
+    executor: Executor,
+    tasks: Mapping[str, TaskSpec],
+) -> Tuple[Dict[str, Any], Dict[str, BaseException], Dict[str, float]]:
+    """Run ``{name: (dependencies, fn)}`` on ``executor`` as dependencies resolve.
+
+    ``fn`` receives the results of its dependencies as keyword arguments. A
+    failed task skips everything downstream of it. Returns results, errors and
+    per-task wall time in milliseconds.
+    """
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    results: Dict[str, Any] = {}
+    errors: Dict[str, BaseException] = {}
+    timings: Dict[str, float] = {}
+    pending = dict(tasks)
+    running: Dict[Future, str] = {}
+
+    def timed(name: str, fn: Callable[..., Any], kwargs: Dict[str, Any]) -> Any:
+        started = time.perf_counter()
+        try:
+            return fn(**kwargs)
+        finally:
+            timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    while pending or running:
+        for name, (deps, fn) in list(pending.items()):
+            if any(dep in errors for dep in deps):
+                errors[name] = RuntimeError(f"skipped: dependency failed ({', '.join(deps)})")
+                del pending[name]
+            elif all(dep in results for dep in deps):
+                kwargs = {dep: results[dep] for dep in deps}
+                running[executor.submit(timed, name, fn, kwargs)] = name
+                del pending[name]
+        if not running:
+            if pending:
+                raise ValueError(f"Unsatisfiable task dependencies: {sorted(pending)}")
+            break
+        done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+        for future in done:
+            name = running.pop(future)
+            exc = future.exception()
+            if exc is not None:
+                errors[name] = exc
+            else:
+                results[name] = future.result()
+    return results, errors, timings
+
+
+def parse_creator(spec: str) -> Tuple[Optional[str], str, Optional[str]]:
+    """Split a creator spec into ``(vanity, profile_url, profile_urn)``."""
+    from lkvanity.service import normalize_profile_url
+
+    spec = spec.strip()
+    profile_urn: Optional[str] = None
+    if "," in spec:
+        spec, profile_urn = (part.strip() for part in spec.split(",", 1))
+        profile_urn = profile_urn or None
+    url = normalize_profile_url(spec)
+    vanity = load_script("extract_profile_urn").infer_vanity_from_url(url)
+    return vanity, url, profile_urn
+
+
+def build_refresh_graph(
+    service: VanityService,
+    vanity: Optional[str],
+    url: str,
+    profile_urn: Optional[str],
+    count: int,
+    include_web_metadata: bool,
+    max_pages: Optional[int] = None,
+) -> Dict[str, TaskSpec]:
+    tasks: Dict[str, TaskSpec] = {}
+    if profile_urn:
+        tasks["urn"] = ((), lambda: {"id": profile_urn, "username": vanity, "url": url})
+    else:
+        tasks["urn"] = ((), lambda: service.resolve_urn(url))
+
+    def posts(urn: Dict[str, Any]) -> List[Dict[str, Any]]:
+        resolved = urn.get("id")
+        if not resolved:
+            raise ValueError("Profile URN resolution did not return an id.")
+        if not resolved.startswith("urn:"):
+            resolved = f"urn:li:fsd_profile:{resolved}"
+        return service.collect_posts(resolved, count, include_web_metadata, max_pages)
+
+    tasks["posts"] = (("urn",), posts)
+    if vanity:
+        tasks["networkinfo"] = ((), lambda: service.network_info(vanity))
+    else:
+        # Without a vanity up front the resolved username is the only handle.
+        tasks["networkinfo"] = (("urn",), lambda urn: service.network_info(urn["username"]))
+    return tasks
+
+
+def refresh_creator(
+    service: VanityService,
+    executor: Executor,
+    spec: str,
+    count: int = DEFAULT_COUNT,
+    include_web_metadata: bool = True,
+    max_pages: Optional[int] = None,
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    vanity, url, profile_urn = parse_creator(spec)
+    tasks = build_refresh_graph(
+        service, vanity, url, profile_urn, count, include_web_metadata, max_pages
+    )
+    results, errors, timings = run_graph(executor, tasks)
+
+    urn = results.get("urn") or {}
+    resolved = urn.get("id")
+    if resolved and not resolved.startswith("urn:"):
+        resolved = f"urn:li:fsd_profile:{resolved}"
+    network = results.get("networkinfo") or {}
+    record: Dict[str, Any] = {
+        "creator": spec,
+        "id": resolved,
+        "username": urn.get("username") or vanity,
+        "url": urn.get("url") or url,
+        "imageUrl": urn.get("imageUrl"),
+        "posts": results.get("posts"),
+        "followersCount": network.get("followersCount"),
+        "timings": {
+            **timings,
+            "total": round((time.perf_counter() - started) * 1000, 1),
+        },
+    }
+    # Network info stays best effort, as in the cloud function.
+    fatal = {name: str(exc) for name, exc in errors.items() if name != "networkinfo"}
+    if fatal:
+        record["error"] = fatal
+    return record
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Refresh creators with URN, posts and network info fetched concurrently",
+    )
+    parser.add_argument(
+        "creators",
+        nargs="*",
+        help="Creator vanity, profile URL, or 'vanity,profileUrn'.",
+    )
+    parser.add_argument(
+        "--creators-file",
+        help="File with one creator spec per line (blank lines and # comments ignored).",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=DEFAULT_COUNT,
+        help=f"Page size for pagination (default: {DEFAULT_COUNT}, max 100).",
+    )
+    parser.add_argument(
+        "--max-pages",
+        type=int,
+        help="Fetch at most this many pages per creator (optional safeguard).",
+    )
+    parser.add_argument(
+        "--no-web-metadata",
+        action="store_true",
+        help="Omit includeWebMetadata=true from GraphQL requests.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=5,
+        help="Creators refreshed at the same time (default: 5).",
+    )
+    parser.add_argument(
+        "--cookie",
+        help="Cookie header string. Defaults to LINKEDIN_COOKIE env var or module default.",
+    )
+    parser.add_argument(
+        "--csrf-token",
+        dest="csrf_token",
+        help="CSRF token value. Defaults to LINKEDIN_CSRF_TOKEN env var or module default.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=30.0,
+        help="HTTP timeout in seconds (default: 30).",
+    )
+    parser.add_argument(
+        "--output",
+        help="Write NDJSON results to this path instead of stdout.",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print per-creator progress to stderr.",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Write OpenMetrics request/pagination counters to this textfile on exit.",
+    )
+    return parser.parse_args()
+
+
+def read_creators(args: argparse.Namespace) -> List[str]:
+    creators = list(args.creators)
+    if args.creators_file:
+        with open(args.creators_file, "r", encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    creators.append(line)
+    return creators
+
+
+def main() -> int:
+    args = parse_args()
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    import json_backend
+    import metrics
+    from lkvanity.service import VanityService
+    from lkvanity.sessions import SessionPool, resolve_credentials
+
+    metrics.export_at_exit(args.metrics_file)
+    if not 0 < args.count <= 100:
+        raise SystemExit("--count must be between 1 and 100")
+    if args.concurrency <= 0:
+        raise SystemExit("--concurrency must be positive")
+    creators = read_creators(args)
+    if not creators:
+        raise SystemExit("No creators given. Pass them as arguments or via --creators-file.")
+
+    cookie_header, csrf_token = resolve_credentials(args.cookie, args.csrf_token)
+    pool = SessionPool(cookie_header, csrf_token, pool_size=max(8, args.concurrency * 3))
+    service = VanityService(pool, timeout=args.timeout, verbose=args.verbose)
+
+    handle = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    failures = 0
+    # Creators run on one pool and their graph steps on another, so a creator
+    # waiting on its own steps can never starve them of workers.
+    with ThreadPoolExecutor(max_workers=args.concurrency * 3) as steps, ThreadPoolExecutor(
+        max_workers=args.concurrency
+    ) as creators_pool:
+        futures = [
+            creators_pool.submit(
+                refresh_creator,
+                service,
+                steps,
+                spec,
+                args.count,
+                not args.no_web_metadata,
+                args.max_pages,
+            )
+            for spec in creators
+        ]
+        for spec, future in zip(creators, futures):
+            try:
+                record = future.result()
+            except Exception as exc:
+                # One creator's pipeline blowing up must not abort the batch.
+                record = {"creator": spec, "error": {"refresh": str(exc)}, "timings": {}}
+            if "error" in record:
+                failures += 1
+            if args.verbose:
+                posts = record.get("posts")
+                print(
+                    f"{record['creator']}: posts={len(posts) if posts is not None else '-'} "
+                    f"timings={record['timings']}",
+                    file=sys.stderr,
+                )
+            handle.write(json_backend.dumps(record, compact=True))
+            handle.write("\n")
+            handle.flush()
+
+    if handle is not sys.stdout:
+        handle.close()
+    pool.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
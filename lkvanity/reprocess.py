@@ -0,0 +1,269 @@
+"""Re-run the derivation pipeline over saved raw payloads on every core.
+
+Fixing ``derive_posts`` or ``collect_owned_posts`` should not require another
+round of LinkedIn requests. This command takes a directory of saved raw
+payloads (``org-reactions.json`` dumps from ``fetchv2`` or ``mail.json``-style
+GraphQL pages) and rebuilds the usual outputs with a ``ProcessPoolExecutor``:
+
+* each sub-directory is one profile: all of its ``*.json`` files are treated as
+  pages of that profile and processed together in one task;
+* each ``*.json`` file directly in the input directory is a task of its own.
+
+The profile id comes from ``--profile-urn``, else from the sub-directory name
+when it is a profile id (``ACoAA...``) or a ``urn:li:...`` URN, else it is
+inferred from the actor that authored most updates in the payload. Other
+directory names (``2024-10/``, ``batch-a/``) only group files.
+
+Outputs go to ``<output-dir>/<task>/posts.json`` (``--pipeline posts``) or
+``updates.json`` (the ``fetch_linkedin_profile_updates.py`` modes), in the same
+format the fetching CLIs write; posts can also be merged into a partitioned
+Parquet dataset. One summary line per task is printed as NDJSON.
+
+Example usage:
+
+    python -m lkvanity reprocess raw/ --output-dir derived/ --workers 8
+    python -m lkvanity reprocess raw/ --output-dir derived/ --pipeline social-counts
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sys
+from collections import Counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+import json_backend
+from lkvanity._loader import load_script
+
+PIPELINES = ("posts", "updates", "social-counts", "org-reactions")
+# Member profile ids are long base64url strings, e.g. ACoAAByAzQoB9-VHcgJ_Fx6moaCchiwhtPfz7rw.
+PROFILE_ID = re.compile(r"AC[A-Za-z0-9]AA[A-Za-z0-9_-]{20,}")
+PROFILE_URN_PREFIX = "urn:li:fsd_profile:"
+
+
+class ReprocessTask(NamedTuple):
+    name: str
+    paths: List[str]
+    profile_id: Optional[str]
+    pipeline: str
+    output_dir: str
+    compact: bool
+    return_posts: bool
+
+
+def directory_profile_id(name: str) -> Optional[str]:
+    """Return the profile id a sub-directory is named after, if it is named after one."""
+    if name.startswith("urn:li:"):
+        return name.rsplit(":", 1)[-1] or None
+    return name if PROFILE_ID.fullmatch(name) else None
+
+
+def discover_tasks(
+    root: str,
+    pipeline: str,
+    output_dir: str,
+    profile_urn: Optional[str] = None,
+    compact: bool = False,
+    return_posts: bool = False,
+) -> List[ReprocessTask]:
+    forced_id = profile_urn.rsplit(":", 1)[-1] if profile_urn else None
+    tasks: List[ReprocessTask] = []
+    for entry in sorted(os.scandir(root), key=lambda item: item.name):
+        if entry.is_dir():
+            paths = sorted(
+                os.path.join(directory, name)
+                for directory, _, names in os.walk(entry.path)
+                for name in names
+                if name.endswith(".json")
+            )
+            if not paths:
+                continue
+            profile_id = forced_id or directory_profile_id(entry.name)
+            tasks.append(
+                ReprocessTask(
+                    entry.name, paths, profile_id, pipeline, output_dir, compact, return_posts
+                )
+            )
+        elif entry.name.endswith(".json"):
+            name = entry.name[: -len(".json")]
+            tasks.append(
+                ReprocessTask(
+                    name, [entry.path], forced_id, pipeline, output_dir, compact, return_posts
+                )
+            )
+    return tasks
+
+
+def _actor_profiles(obj: Any) -> Iterable[str]:
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            if node.startswith(PROFILE_URN_PREFIX):
+                yield node[len(PROFILE_URN_PREFIX) :]
+        elif isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def infer_profile_id(included: Iterable[Any]) -> Optional[str]:
+    """Return the profile that acts on the most feed updates in ``included``."""
+    votes: Counter = Counter()
+    for item in included:
+        if isinstance(item, dict) and item.get("$type") == "com.linkedin.voyager.dash.feed.Update":
+            votes.update(set(_actor_profiles(item.get("actor"))))
+    return votes.most_common(1)[0][0] if votes else None
+
+
+def _load_pages(paths: List[str]) -> List[Dict[str, Any]]:
+    pages: List[Dict[str, Any]] = []
+    for path in paths:
+        with open(path, "rb") as handle:
+            payload = json_backend.loads(handle.read())
+        if isinstance(payload, dict) and isinstance(payload.get("included"), list):
+            pages.append(payload)
+    return pages
+
+
+def reprocess_task(task: ReprocessTask) -> Dict[str, Any]:
+    """Worker entry point: derive one task's outputs and write them to disk."""
+    pages = _load_pages(task.paths)
+    included = [item for page in pages for item in page["included"]]
+    profile_id = task.profile_id or infer_profile_id(included)
+    summary: Dict[str, Any] = {
+        "task": task.name,
+        "profileId": profile_id,
+        "files": len(task.paths),
+        "pages": len(pages),
+    }
+
+    if task.pipeline == "posts":
+        fetchv2 = load_script("fetchv2")
+        unique = fetchv2.dedupe_items(included)
+        records = fetchv2.derive_posts(unique, profile_id)
+        summary["included"] = len(unique)
+        filename = "posts.json"
+    else:
+        updates = load_script("fetch_linkedin_profile_updates")
+        records = updates.summarize_update_pages(
+            enumerate(pages),
+            count=1,
+            limit=None,
+            verbose=False,
+            include_raw=False,
+            social_counts_only=task.pipeline == "social-counts",
+            organization_reactions_only=task.pipeline == "org-reactions",
+            target_profile_id=profile_id,
+        )
+        filename = "updates.json"
+
+    directory = os.path.join(task.output_dir, task.name)
+    os.makedirs(directory, exist_ok=True)
+    summary["output"] = os.path.join(directory, filename)
+    with open(summary["output"], "w", encoding="utf-8") as handle:
+        json_backend.dump(records, handle, compact=task.compact)
+        handle.write("\n")
+    summary["records"] = len(records)
+    if task.return_posts:
+        summary["posts"] = records
+    return summary
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Rebuild derived outputs from saved raw payloads across a process pool",
+    )
+    parser.add_argument("input_dir", help="Directory of saved raw payloads.")
+    parser.add_argument(
+        "--output-dir",
+        required=True,
+        help="Directory receiving one sub-directory of outputs per task.",
+    )
+    parser.add_argument(
+        "--pipeline",
+        choices=PIPELINES,
+        default="posts",
+        help=(
+            "posts: fetchv2 derive_posts; updates/social-counts/org-reactions: the "
+            "fetch_linkedin_profile_updates.py modes (default: posts)."
+        ),
+    )
+    parser.add_argument(
+        "--profile-urn",
+        help="Treat every payload as belonging to this profile instead of inferring it.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (default: one per CPU).",
+    )
+    parser.add_argument(
+        "--parquet-dir",
+        help="Also merge derived posts into this partitioned Parquet dataset (posts pipeline).",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write single-line JSON outputs instead of the indented layout.",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print progress to stderr.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.workers <= 0:
+        raise SystemExit("--workers must be positive")
+    if args.parquet_dir and args.pipeline != "posts":
+        raise SystemExit("--parquet-dir is only supported with --pipeline posts")
+    if not os.path.isdir(args.input_dir):
+        raise SystemExit(f"Not a directory: {args.input_dir}")
+
+    tasks = discover_tasks(
+        args.input_dir,
+        args.pipeline,
+        args.output_dir,
+        profile_urn=args.profile_urn,
+        compact=args.compact,
+        return_posts=bool(args.parquet_dir),
+    )
+    if not tasks:
+        raise SystemExit(f"No *.json payloads found in {args.input_dir}")
+
+    # multiprocessing is only worth importing once there is work to do.
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    failures = 0
+    done = 0
+    with ProcessPoolExecutor(max_workers=min(args.workers, len(tasks))) as executor:
+        futures = {executor.submit(reprocess_task, task): task for task in tasks}
+        for future in as_completed(futures):
+            task = futures[future]
+            done += 1
+            try:
+                summary = future.result()
+            except Exception as exc:
+                failures += 1
+                summary = {"task": task.name, "error": str(exc)}
+            posts = summary.pop("posts", None)
+            if posts is not None and summary.get("profileId"):
+                from columnar_export import PartitionedParquetWriter
+
+                with PartitionedParquetWriter(args.parquet_dir, summary["profileId"]) as writer:
+                    writer.write_posts(posts)
+            sys.stdout.write(json_backend.dumps(summary, compact=True) + "\n")
+            if args.verbose:
+                print(f"[{done}/{len(tasks)}] {task.name}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
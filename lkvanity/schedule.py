@@ -0,0 +1,425 @@
+"""Budgeted, priority-ordered creator refreshes driven by a local state file.
+
+``refreshCreators`` sweeps every creator with the same cadence and depth. This
+scheduler instead ranks creators by how much a refresh is likely to be worth:
+
+    need = hours since last refresh
+           * (1 + RATE_WEIGHT * posts per day over the last 30 days
+                + VELOCITY_WEIGHT * log1p(engagement gained per hour))
+
+where engagement velocity comes from the last two stored snapshots. Creators
+that posted within ``--hot-days`` or whose engagement is still moving are
+*hot*: they become due after ``--hot-interval`` and are refreshed deeply (up to
+``--deep-pages`` pages). Everyone else is *cold*: due only after
+``--cold-interval`` and refreshed with the first page only.
+
+A failed refresh records the attempt time and a failure count. The creator is
+retried after ``--hot-interval`` doubled per consecutive failure (capped at
+``--cold-interval``) and ranked by time since that attempt, so a creator that
+keeps failing cannot hold the never-refreshed priority and drain every run.
+
+Each run spends at most what is left of ``--budget`` requests in the rolling
+hour recorded in the state file, so the command can be started from cron as
+often as wanted. Planning uses a per-creator cost estimate; the ledger is
+charged with the requests the session pool actually made.
+
+Example usage:
+
+    python -m lkvanity schedule --state creators-state.json --creators-file creators.txt
+    python -m lkvanity schedule --state creators-state.json --budget 300 --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from lkvanity.refresh import parse_creator, read_creators, refresh_creator
+
+HOUR = 3600.0
+DAY = 86400.0
+RATE_WINDOW_DAYS = 30
+RATE_WEIGHT = 2.0
+VELOCITY_WEIGHT = 0.5
+DEFAULT_BUDGET = 600
+DEFAULT_DEEP_PAGES = 5
+DEFAULT_HOT_DAYS = 7.0
+DEFAULT_HOT_INTERVAL = 1.0 * HOUR
+DEFAULT_COLD_INTERVAL = 7.0 * DAY
+MAX_SNAPSHOTS = 2
+
+
+class PlannedRefresh(NamedTuple):
+    creator: str
+    tier: str
+    need: float
+    max_pages: int
+    cost: int
+
+
+def load_state(path: str) -> Dict[str, Any]:
+    import json_backend
+
+    if not os.path.exists(path):
+        return {"creators": {}, "ledger": []}
+    with open(path, "rb") as handle:
+        state = json_backend.loads(handle.read() or b"{}")
+    state.setdefault("creators", {})
+    state.setdefault("ledger", [])
+    return state
+
+
+def save_state(state: Dict[str, Any], path: str) -> None:
+    import json_backend
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json_backend.dump(state, handle, compact=True)
+    os.replace(tmp_path, path)
+
+
+def add_creators(state: Dict[str, Any], specs: Sequence[str]) -> None:
+    """Register creator specs (``vanity``, URL or ``vanity,profileUrn``) in ``state``."""
+    creators = state["creators"]
+    for spec in specs:
+        vanity, url, profile_urn = parse_creator(spec)
+        key = vanity or url
+        entry = creators.setdefault(key, {"url": url})
+        if profile_urn and not entry.get("profileUrn"):
+            entry["profileUrn"] = profile_urn
+
+
+def budget_remaining(state: Dict[str, Any], budget: int, now: float) -> int:
+    """Drop ledger entries older than an hour and return what is left of ``budget``."""
+    ledger = [entry for entry in state["ledger"] if entry["at"] > now - HOUR]
+    state["ledger"] = ledger
+    return max(0, budget - sum(entry["requests"] for entry in ledger))
+
+
+def _engagement(post: Dict[str, Any]) -> int:
+    return post.get("numLikes", 0) + post.get("numComments", 0) + post.get("numShares", 0)
+
+
+def posts_per_day(entry: Dict[str, Any], now: float) -> float:
+    since_ms = (now - RATE_WINDOW_DAYS * DAY) * 1000
+    recent = [ts for ts in entry.get("publishedAt", ()) if ts and ts >= since_ms]
+    return len(recent) / RATE_WINDOW_DAYS
+
+
+def failure_backoff(failures: int, hot_interval: float, cold_interval: float) -> float:
+    """Seconds to wait after the ``failures``-th consecutive failed refresh."""
+    return min(hot_interval * 2 ** (failures - 1), cold_interval)
+
+
+def engagement_velocity(entry: Dict[str, Any]) -> float:
+    """Engagement gained per hour on posts present in both of the last two snapshots."""
+    snapshots = entry.get("snapshots") or []
+    if len(snapshots) < 2:
+        return 0.0
+    previous, latest = snapshots[-2], snapshots[-1]
+    hours = (latest["at"] - previous["at"]) / HOUR
+    if hours <= 0:
+        return 0.0
+    before = previous["engagement"]
+    gained = sum(
+        max(0, value - before[urn]) for urn, value in latest["engagement"].items() if urn in before
+    )
+    return gained / hours
+
+
+def plan_refreshes(
+    state: Dict[str, Any],
+    now: float,
+    budget: int,
+    deep_pages: int = DEFAULT_DEEP_PAGES,
+    hot_days: float = DEFAULT_HOT_DAYS,
+    hot_interval: float = DEFAULT_HOT_INTERVAL,
+    cold_interval: float = DEFAULT_COLD_INTERVAL,
+) -> List[PlannedRefresh]:
+    """Rank due creators by need and keep the best ones that fit in ``budget`` requests."""
+    candidates: List[PlannedRefresh] = []
+    for creator, entry in state["creators"].items():
+        last = entry.get("lastRefreshed")
+        rate = posts_per_day(entry, now)
+        velocity = engagement_velocity(entry)
+        latest_post_ms = max(entry.get("publishedAt") or [0])
+        hot = last is None or velocity > 0 or latest_post_ms >= (now - hot_days * DAY) * 1000
+        age = now - last if last is not None else None
+        if age is not None and age < (hot_interval if hot else cold_interval):
+            continue
+        failures = entry.get("failures") or 0
+        if failures:
+            since_attempt = now - entry["lastAttempt"]
+            if since_attempt < failure_backoff(failures, hot_interval, cold_interval):
+                continue
+            age = since_attempt
+        # Never-refreshed creators sort first; a week is plenty to outrank the rest.
+        hours = age / HOUR if age is not None else 7 * 24.0
+        need = hours * (1 + RATE_WEIGHT * rate + VELOCITY_WEIGHT * math.log1p(velocity))
+        max_pages = deep_pages if hot else 1
+        # Pages, one networkinfo call, plus URN resolution until the URN is known.
+        cost = max_pages + 1 + (0 if entry.get("profileUrn") else 1)
+        candidates.append(
+            PlannedRefresh(creator, "hot" if hot else "cold", round(need, 3), max_pages, cost)
+        )
+
+    candidates.sort(key=lambda planned: planned.need, reverse=True)
+    plan: List[PlannedRefresh] = []
+    for planned in candidates:
+        if planned.cost <= budget:
+            plan.append(planned)
+            budget -= planned.cost
+    return plan
+
+
+def record_refresh(entry: Dict[str, Any], record: Dict[str, Any], now: float) -> None:
+    """Fold a ``refresh_creator`` result into the creator's state entry."""
+    entry["lastAttempt"] = now
+    if record.get("error"):
+        entry["lastError"] = record["error"]
+        entry["failures"] = (entry.get("failures") or 0) + 1
+        return
+    entry.pop("lastError", None)
+    entry.pop("failures", None)
+    entry["lastRefreshed"] = now
+    if record.get("id"):
+        entry["profileUrn"] = record["id"]
+    if record.get("followersCount") is not None:
+        entry["followersCount"] = record["followersCount"]
+    posts = record.get("posts") or []
+    published = set(entry.get("publishedAt") or [])
+    published.update(post["publishedAt"] for post in posts if post.get("publishedAt"))
+    since_ms = (now - RATE_WINDOW_DAYS * DAY) * 1000
+    latest = max(published, default=None)
+    entry["publishedAt"] = sorted(ts for ts in published if ts >= since_ms or ts == latest)
+    snapshots = entry.setdefault("snapshots", [])
+    snapshots.append({"at": now, "engagement": {post["urn"]: _engagement(post) for post in posts}})
+    del snapshots[:-MAX_SNAPSHOTS]
+
+
+def run_schedule(
+    state: Dict[str, Any],
+    plan: Sequence[PlannedRefresh],
+    refresh: Callable[[str, int], Dict[str, Any]],
+    concurrency: int = 5,
+    clock: Callable[[], float] = time.time,
+) -> List[Dict[str, Any]]:
+    """Execute ``plan`` with ``refresh(spec, max_pages)`` and update ``state`` in place."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    creators = state["creators"]
+
+    def spec_for(creator: str) -> str:
+        urn = creators[creator].get("profileUrn")
+        return f"{creator},{urn}" if urn else creators[creator].get("url") or creator
+
+    records: List[Dict[str, Any]] = []
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = [
+            (planned, executor.submit(refresh, spec_for(planned.creator), planned.max_pages))
+            for planned in plan
+        ]
+        for planned, future in futures:
+            try:
+                record = future.result()
+            except Exception as exc:
+                record = {"creator": planned.creator, "error": {"refresh": str(exc)}}
+            record_refresh(creators[planned.creator], record, clock())
+            records.append(
+                {
+                    "creator": planned.creator,
+                    "tier": planned.tier,
+                    "need": planned.need,
+                    "maxPages": planned.max_pages,
+                    "posts": len(record.get("posts") or []),
+                    "followersCount": record.get("followersCount"),
+                    **({"error": record["error"]} if record.get("error") else {}),
+                }
+            )
+    return records
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Refresh the creators that need it most within an hourly request budget",
+    )
+    parser.add_argument(
+        "creators",
+        nargs="*",
+        help="Creators to add to the state file (vanity, profile URL, or 'vanity,profileUrn').",
+    )
+    parser.add_argument(
+        "--creators-file",
+        help="File with one creator spec per line to add to the state file.",
+    )
+    parser.add_argument(
+        "--state",
+        required=True,
+        help="JSON state file with per-creator history and the request ledger.",
+    )
+    parser.add_argument(
+        "--budget",
+        type=int,
+        default=DEFAULT_BUDGET,
+        help=f"Requests allowed per rolling hour (default: {DEFAULT_BUDGET}).",
+    )
+    parser.add_argument(
+        "--deep-pages",
+        type=int,
+        default=DEFAULT_DEEP_PAGES,
+        help=f"Pages fetched for hot creators (default: {DEFAULT_DEEP_PAGES}).",
+    )
+    parser.add_argument(
+        "--hot-days",
+        type=float,
+        default=DEFAULT_HOT_DAYS,
+        help=f"A post within this many days makes a creator hot (default: {DEFAULT_HOT_DAYS:g}).",
+    )
+    parser.add_argument(
+        "--hot-interval",
+        type=float,
+        default=DEFAULT_HOT_INTERVAL,
+        help=f"Minimum seconds between hot refreshes (default: {DEFAULT_HOT_INTERVAL:g}).",
+    )
+    parser.add_argument(
+        "--cold-interval",
+        type=float,
+        default=DEFAULT_COLD_INTERVAL,
+        help=f"Minimum seconds between cold refreshes (default: {DEFAULT_COLD_INTERVAL:g}).",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=100,
+        help="Page size for pagination (default: 100, max 100).",
+    )
+    parser.add_argument(
+        "--no-web-metadata",
+        action="store_true",
+        help="Omit includeWebMetadata=true from GraphQL requests.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=5,
+        help="Creators refreshed at the same time (default: 5).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the plan as NDJSON without fetching or touching the state file.",
+    )
+    parser.add_argument(
+        "--cookie",
+        help="Cookie header string. Defaults to LINKEDIN_COOKIE env var or module default.",
+    )
+    parser.add_argument(
+        "--csrf-token",
+        dest="csrf_token",
+        help="CSRF token value. Defaults to LINKEDIN_CSRF_TOKEN env var or module default.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=30.0,
+        help="HTTP timeout in seconds (default: 30).",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print the budget and plan summary to stderr.",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Write OpenMetrics request/pagination counters to this textfile on exit.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    import json_backend
+    import metrics
+
+    metrics.export_at_exit(args.metrics_file)
+    if not 0 < args.count <= 100:
+        raise SystemExit("--count must be between 1 and 100")
+    if args.deep_pages <= 0:
+        raise SystemExit("--deep-pages must be positive")
+
+    state = load_state(args.state)
+    add_creators(state, read_creators(args))
+    if not state["creators"]:
+        raise SystemExit("No creators in the state file. Pass them as arguments or via --creators-file.")
+
+    now = time.time()
+    remaining = budget_remaining(state, args.budget, now)
+    plan = plan_refreshes(
+        state,
+        now,
+        remaining,
+        deep_pages=args.deep_pages,
+        hot_days=args.hot_days,
+        hot_interval=args.hot_interval,
+        cold_interval=args.cold_interval,
+    )
+    if args.verbose:
+        hot = sum(planned.tier == "hot" for planned in plan)
+        print(
+            f"budget: {remaining}/{args.budget} left this hour; planned {len(plan)} "
+            f"({hot} hot, {len(plan) - hot} cold) of {len(state['creators'])} creators",
+            file=sys.stderr,
+        )
+    if args.dry_run:
+        for planned in plan:
+            sys.stdout.write(json_backend.dumps(planned._asdict(), compact=True) + "\n")
+        return 0
+
+    from lkvanity.service import VanityService
+    from lkvanity.sessions import SessionPool, resolve_credentials
+
+    cookie_header, csrf_token = resolve_credentials(args.cookie, args.csrf_token)
+    pool = SessionPool(cookie_header, csrf_token, pool_size=max(8, args.concurrency * 3))
+    service = VanityService(pool, timeout=args.timeout, verbose=args.verbose)
+    failures = 0
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency * 3) as steps:
+            records = run_schedule(
+                state,
+                plan,
+                lambda spec, max_pages: refresh_creator(
+                    service, steps, spec, args.count, not args.no_web_metadata, max_pages
+                ),
+                concurrency=args.concurrency,
+            )
+        for record in records:
+            failures += "error" in record
+            sys.stdout.write(json_backend.dumps(record, compact=True) + "\n")
+    finally:
+        state["ledger"].append({"at": time.time(), "requests": pool.requests_made})
+        save_state(state, args.state)
+        pool.close()
+    if args.verbose:
+        print(f"spent {pool.requests_made} requests", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
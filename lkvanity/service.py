@@ -0,0 +1,434 @@
+"""Long-running local HTTP service with warm sessions and caches.
+
+Replaces the chain of cold cloud-function hops (``profilePostsFetcher`` ->
+``profileUrnFetcher`` -> ``profileNetworkInfoFetcher``) with one process that
+reuses the ``extract_profile_urn`` and ``fetchv2`` logic in-process. Sessions,
+connection pools and the URN/network-info caches stay warm between requests,
+and ``ThreadingHTTPServer`` serves concurrent callers. Concurrent requests for
+the same URN, network info or posts page run share one upstream fetch
+(:class:`~lkvanity.cache.SingleFlight`), so a ``/posts`` call landing while a
+refresh batch is paginating that profile waits for it instead of repeating it.
+
+Endpoints (GET query parameters or a POST JSON body):
+
+    /health                       -> {"status": "ok"}
+    /urn?url=<profile url>        -> {"id", "username", "url", "imageUrl"}
+    /networkinfo?publicId=<vanity>-> {"publicId", "data"}
+    /posts?url=<profile url>      -> {"id", "username", "url", "imageUrl", "posts", "followersCount"}
+    /posts?profileUrn=<urn>       -> same, skipping URN resolution
+    /stats                        -> cache hit rates and coalesced calls
+    /metrics                      -> OpenMetrics text: upstream requests, pages, entities
+
+Example usage:
+
+    python -m lkvanity serve --port 8080
+    curl 'http://127.0.0.1:8080/posts?url=https://www.linkedin.com/in/ramzib/&count=50'
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import json_backend
+import metrics
+from lkvanity._loader import load_script
+from lkvanity.cache import SingleFlight, TTLCache
+from lkvanity.sessions import SessionPool, resolve_credentials
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+DEFAULT_COUNT = 100
+
+
+class RequestError(Exception):
+    """Client-side problem with a service request; maps to an HTTP status."""
+
+    def __init__(self, message: str, status: int = 400) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def normalize_profile_url(value: str) -> str:
+    if value.startswith("http"):
+        return value
+    return f"https://www.linkedin.com/in/{value.strip('/')}/"
+
+
+class VanityService:
+    """In-process equivalent of the profile URN, network info and posts functions."""
+
+    def __init__(
+        self,
+        pool: SessionPool,
+        timeout: float = 30.0,
+        urn_ttl: float = 86400.0,
+        network_ttl: float = 3600.0,
+        posts_ttl: float = 0.0,
+        verbose: bool = False,
+        urn_mode: str = "auto",
+        coalesce_ttl: float = 0.0,
+    ) -> None:
+        self.pool = pool
+        self.timeout = timeout
+        self.verbose = verbose
+        self.urn_mode = urn_mode
+        self.urn_cache = TTLCache(urn_ttl)
+        self.network_cache = TTLCache(network_ttl)
+        self.posts_cache = TTLCache(posts_ttl)
+        self.flights = SingleFlight(coalesce_ttl)
+        self._fetchv2 = load_script("fetchv2")
+        self._urn = load_script("extract_profile_urn")
+        self.network = load_script("fetch_network_info").NetworkInfoFetcher(
+            pool, timeout, cache=self.network_cache
+        )
+
+    def resolve_urn(self, url: str) -> Dict[str, Any]:
+        url = normalize_profile_url(url)
+        cached = self.urn_cache.get(url)
+        if cached is not None:
+            return cached
+        return self.flights.do(("urn", url, self.urn_mode), lambda: self._resolve_urn(url))
+
+    def _resolve_urn(self, url: str) -> Dict[str, Any]:
+        try:
+            result = self._urn.resolve_profile(
+                self.pool.voyager(),
+                url,
+                self.timeout,
+                mode=self.urn_mode,
+                html_session=self.pool.html(),
+                verbose=self.verbose,
+            )
+        except ValueError as exc:
+            raise RequestError(str(exc), 502) from exc
+        self.urn_cache.set(url, result)
+        return result
+
+    def network_info(self, public_id: str) -> Dict[str, Any]:
+        return self.flights.do(("networkinfo", public_id), lambda: self.network.get(public_id))
+
+    def collect_posts(
+        self,
+        profile_urn: str,
+        count: int = DEFAULT_COUNT,
+        include_web_metadata: bool = True,
+        max_pages: Optional[int] = None,
+        on_page: Optional[Callable[[List[Any]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Paginate ``profile_urn`` with the warm voyager session and derive its posts.
+
+        ``on_page`` is called with each page's ``included`` items as it arrives.
+        Calls without it share a run already paginating the same profile with
+        the same parameters; calls with it always paginate themselves, since
+        only the caller that started a run would see its pages.
+        """
+
+        def run() -> List[Dict[str, Any]]:
+            included = self._fetchv2.collect_included(
+                session=self.pool.voyager(),
+                profile_urn=profile_urn,
+                start=0,
+                count=count,
+                timeout=self.timeout,
+                max_pages=max_pages,
+                verbose=self.verbose,
+                include_web_metadata=include_web_metadata,
+                on_page=on_page,
+            )
+            profile_id = self._fetchv2.extract_profile_id(profile_urn)
+            return self._fetchv2.derive_posts(included, profile_id)
+
+        if on_page is not None:
+            return run()
+        key = ("pages", profile_urn, count, include_web_metadata, max_pages)
+        return self.flights.do(key, run)
+
+    def posts(
+        self,
+        url: Optional[str] = None,
+        profile_urn: Optional[str] = None,
+        username: Optional[str] = None,
+        count: int = DEFAULT_COUNT,
+        include_web_metadata: bool = True,
+    ) -> Dict[str, Any]:
+        if not 0 < count <= 100:
+            raise RequestError("`count` must be an integer between 1 and 100.")
+        if not url and not profile_urn:
+            raise RequestError("Missing `url` or `profileUrn` parameter.")
+
+        cache_key = (url, profile_urn, count, include_web_metadata)
+        cached = self.posts_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        return self.flights.do(
+            ("posts", username) + cache_key,
+            lambda: self._posts(cache_key, username),
+        )
+
+    def _posts(self, cache_key: Tuple[Any, ...], username: Optional[str]) -> Dict[str, Any]:
+        url, profile_urn, count, include_web_metadata = cache_key
+        metadata: Dict[str, Any] = {}
+        if not profile_urn:
+            metadata = self.resolve_urn(url)
+            profile_urn = metadata.get("id")
+            if not profile_urn:
+                raise RequestError("Profile URN resolution did not return an id.", 502)
+        if not profile_urn.startswith("urn:"):
+            profile_urn = f"urn:li:fsd_profile:{profile_urn}"
+        profile_id = self._fetchv2.extract_profile_id(profile_urn)
+        posts = self.collect_posts(profile_urn, count, include_web_metadata)
+
+        vanity = username or metadata.get("username") or profile_id
+        try:
+            followers = self.network_info(vanity).get("followersCount")
+        except Exception:
+            # Mirrors fetchProfileNetworkInfo: follower counts are best effort.
+            followers = None
+
+        result = {
+            "id": profile_urn,
+            "username": vanity,
+            "url": metadata.get("url") or (normalize_profile_url(url) if url else None),
+            "imageUrl": metadata.get("imageUrl"),
+            "posts": posts,
+            "followersCount": followers,
+        }
+        self.posts_cache.set(cache_key, result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "urn": self.urn_cache.stats(),
+            "networkinfo": self.network_cache.stats(),
+            "posts": self.posts_cache.stats(),
+            "singleflight": self.flights.stats(),
+            "threads": threading.active_count(),
+        }
+
+
+def _first(params: Dict[str, Any], key: str) -> Optional[Any]:
+    value = params.get(key)
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def _text(params: Dict[str, Any], key: str) -> Optional[str]:
+    """``_first`` for string parameters; JSON bodies may carry any type."""
+    value = _first(params, key)
+    if value is not None and not isinstance(value, str):
+        raise RequestError(f"`{key}` must be a string.")
+    return value
+
+
+def _count(params: Dict[str, Any]) -> int:
+    """Parse ``count``; absent means the default, anything but an integer is a 400."""
+    value = _first(params, "count")
+    if value is None:
+        return DEFAULT_COUNT
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    raise RequestError("`count` must be an integer between 1 and 100.")
+
+
+def _as_bool(value: Any) -> bool:
+    return value is True or (isinstance(value, str) and value.lower() == "true")
+
+
+class ServiceRoutes:
+    """Request handling mixed into ``BaseHTTPRequestHandler`` by :func:`build_server`."""
+
+    service: VanityService
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.service.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: Dict[str, Any]) -> None:
+        self._send_bytes(status, json_backend.dumps_bytes(body, compact=True), "application/json")
+
+    def _send_bytes(self, status: int, payload: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("content-type", content_type)
+        self.send_header("content-length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _params(self) -> Tuple[str, Dict[str, Any]]:
+        parsed = urlparse(self.path)
+        params: Dict[str, Any] = dict(parse_qs(parsed.query))
+        try:
+            length = int(self.headers.get("content-length") or 0)
+        except ValueError as exc:
+            raise RequestError("Invalid content-length header.") from exc
+        if length:
+            try:
+                body = json_backend.loads(self.rfile.read(length))
+            except ValueError as exc:
+                raise RequestError(f"Request body is not valid JSON: {exc}") from exc
+            if isinstance(body, dict):
+                params.update(body)
+        return parsed.path.rstrip("/") or "/", params
+
+    def _dispatch(self) -> None:
+        try:
+            route, params = self._params()
+            if route == "/metrics":
+                payload = metrics.REGISTRY.render().encode("utf-8")
+                self._send_bytes(200, payload, metrics.CONTENT_TYPE)
+                return
+            self._send(200, self.route(route, params))
+        except RequestError as exc:
+            self._send(exc.status, {"error": str(exc)})
+        except Exception as exc:
+            response = getattr(exc, "response", None)
+            status = 502 if response is not None else 500
+            self._send(status, {"error": str(exc) or "Unexpected error"})
+
+    def route(self, route: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        service = self.service
+        if route in {"/", "/health"}:
+            return {"status": "ok"}
+        if route == "/stats":
+            return service.stats()
+        if route == "/urn":
+            url = _text(params, "url")
+            if not url:
+                raise RequestError("Missing `url` parameter.")
+            return service.resolve_urn(url)
+        if route == "/networkinfo":
+            public_id = _text(params, "publicId")
+            if not public_id:
+                raise RequestError("Missing `publicId` parameter.")
+            return {"publicId": public_id, "data": service.network_info(public_id)}
+        if route == "/posts":
+            return service.posts(
+                url=_text(params, "url"),
+                profile_urn=_text(params, "profileUrn"),
+                username=_text(params, "username"),
+                count=_count(params),
+                include_web_metadata=not _as_bool(_first(params, "noWebMetadata")),
+            )
+        raise RequestError(f"Unknown endpoint {route}", 404)
+
+    do_GET = _dispatch
+    do_POST = _dispatch
+
+
+def build_server(service: VanityService, host: str, port: int) -> ThreadingHTTPServer:
+    # http.server is only needed once we actually serve, not for `serve --help`.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    handler = type(
+        "ServiceHandler", (ServiceRoutes, BaseHTTPRequestHandler), {"service": service}
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Serve posts, URN and network info lookups from one warm process",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Bind port (default: 8080)")
+    parser.add_argument(
+        "--cookie",
+        help="Cookie header string. Defaults to LINKEDIN_COOKIE env var or module default.",
+    )
+    parser.add_argument(
+        "--csrf-token",
+        dest="csrf_token",
+        help="CSRF token value. Defaults to LINKEDIN_CSRF_TOKEN env var or module default.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=30.0,
+        help="Upstream HTTP timeout in seconds (default: 30).",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=32,
+        help="Warm connections kept per upstream host (default: 32).",
+    )
+    parser.add_argument(
+        "--urn-ttl",
+        type=float,
+        default=86400.0,
+        help="Seconds to cache resolved profile URNs (default: 86400).",
+    )
+    parser.add_argument(
+        "--network-ttl",
+        type=float,
+        default=3600.0,
+        help="Seconds to cache network info (default: 3600).",
+    )
+    parser.add_argument(
+        "--posts-ttl",
+        type=float,
+        default=0.0,
+        help="Seconds to cache /posts results (default: 0, disabled).",
+    )
+    parser.add_argument(
+        "--coalesce-ttl",
+        type=float,
+        default=0.0,
+        help="Seconds a coalesced fetch result is reused by late duplicate callers "
+        "(default: 0, only callers arriving while it is in flight share it).",
+    )
+    parser.add_argument(
+        "--urn-mode",
+        choices=("auto", "api", "html"),
+        default="auto",
+        help="Profile URN resolution: identity API, HTML scrape, or API then HTML (default: auto).",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log requests and pagination progress to stderr.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    cookie_header, csrf_token = resolve_credentials(args.cookie, args.csrf_token)
+    pool = SessionPool(cookie_header, csrf_token, pool_size=args.pool_size)
+    service = VanityService(
+        pool,
+        timeout=args.timeout,
+        urn_ttl=args.urn_ttl,
+        network_ttl=args.network_ttl,
+        posts_ttl=args.posts_ttl,
+        verbose=args.verbose,
+        urn_mode=args.urn_mode,
+        coalesce_ttl=args.coalesce_ttl,
+    )
+    server = build_server(service, args.host, args.port)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
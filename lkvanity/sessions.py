@@ -0,0 +1,100 @@
+"""Long-lived, shared HTTP sessions for in-process LinkedIn calls.
+
+The standalone scripts build a fresh ``requests.Session`` per run. Long-running
+modes instead keep one session per header profile for the life of the process,
+with a connection pool sized for concurrent callers, so every request after the
+first reuses an open TLS connection.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
+
+from lkvanity._loader import load_script
+
+if TYPE_CHECKING:
+    import requests
+
+FEED_REFERER = "https://www.linkedin.com/feed/"
+
+
+def resolve_credentials(
+    cookie_header: Optional[str] = None,
+    csrf_token: Optional[str] = None,
+) -> Tuple[str, str]:
+    """Apply the same precedence as fetchv2: argument, environment, module default."""
+    updates = load_script("fetch_linkedin_profile_updates")
+    cookie = cookie_header or os.getenv("LINKEDIN_COOKIE") or updates.DEFAULT_COOKIE
+    csrf = csrf_token or os.getenv("LINKEDIN_CSRF_TOKEN") or updates.DEFAULT_CSRF_TOKEN
+    return cookie, csrf
+
+
+class SessionPool:
+    """Lazily created, process-wide sessions for the voyager API and profile HTML.
+
+    ``requests`` sessions share a thread-safe urllib3 pool per host, so a single
+    session can serve many worker threads; ``pool_size`` caps how many idle
+    connections are kept warm per host.
+    """
+
+    def __init__(
+        self,
+        cookie_header: str,
+        csrf_token: str,
+        pool_size: int = 32,
+        extra_headers: Iterable[str] = (),
+    ) -> None:
+        self.cookie_header = cookie_header
+        self.csrf_token = csrf_token
+        self.pool_size = pool_size
+        self.extra_headers = list(extra_headers)
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+        self.requests_made = 0
+
+    def _count(self, response: requests.Response, *args: Any, **kwargs: Any) -> None:
+        with self._lock:
+            self.requests_made += 1
+
+    def _mount(self, session: requests.Session) -> requests.Session:
+        from requests.adapters import HTTPAdapter
+
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.hooks["response"].append(self._count)
+        return session
+
+    def _get(self, kind: str) -> requests.Session:
+        session = self._sessions.get(kind)
+        if session is not None:
+            return session
+        with self._lock:
+            session = self._sessions.get(kind)
+            if session is None:
+                if kind == "voyager":
+                    updates = load_script("fetch_linkedin_profile_updates")
+                    session = updates.build_session(
+                        self.cookie_header, self.csrf_token, FEED_REFERER, self.extra_headers
+                    )
+                else:
+                    urn = load_script("extract_profile_urn")
+                    session = urn.build_session(self.cookie_header, self.csrf_token, FEED_REFERER)
+                self._sessions[kind] = self._mount(session)
+        return session
+
+    def voyager(self) -> requests.Session:
+        """Session for GraphQL and REST voyager endpoints (normalized JSON)."""
+        return self._get("voyager")
+
+    def html(self) -> requests.Session:
+        """Session for rendered profile pages."""
+        return self._get("html")
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
@@ -0,0 +1,516 @@
+"""Lease-based creator work queue shared by refresh workers through SQLite.
+
+The cloud refresh shares one in-memory ``queue.shift()``, so it cannot spread
+over several machines. Here the queue is a SQLite database:
+
+* ``enqueue`` adds creators (vanity, profile URL or ``vanity,profileUrn``);
+* ``work`` runs worker threads that each *claim* a creator with a lease that
+  expires after ``--lease`` seconds, extend the lease after every page of the
+  ``fetchv2`` pagination, and *commit* the refresh record when done. A worker
+  whose lease was taken over stops paginating and its result is discarded, so
+  no creator is refreshed by two workers at once. Failed or abandoned jobs are
+  retried after ``--retry-delay`` up to ``--max-attempts`` times; an expired
+  lease counts as a failed attempt;
+* ``status`` prints job counts per state.
+
+Claims run in ``BEGIN IMMEDIATE`` transactions, so any number of worker
+processes can share one database file. The default rollback journal is kept
+(not WAL) so that workers on several hosts can share the file on a network
+filesystem, provided it implements POSIX byte-range locks.
+
+Example usage:
+
+    python -m lkvanity queue enqueue --db queue.sqlite --creators-file creators.txt
+    python -m lkvanity queue work --db queue.sqlite --concurrency 4 --output results.ndjson
+    python -m lkvanity queue status --db queue.sqlite
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from lkvanity.refresh import parse_creator, read_creators
+
+if TYPE_CHECKING:
+    import sqlite3
+
+    from lkvanity.service import VanityService
+
+DEFAULT_LEASE_SECONDS = 120.0
+DEFAULT_RETRY_DELAY = 300.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    creator TEXT PRIMARY KEY,
+    spec TEXT NOT NULL,
+    max_pages INTEGER,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    available_at REAL NOT NULL DEFAULT 0,
+    updated_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_claimable ON jobs (state, available_at);
+"""
+
+
+class Job(NamedTuple):
+    creator: str
+    spec: str
+    max_pages: Optional[int]
+    owner: str
+    attempts: int
+
+
+class LeaseLost(RuntimeError):
+    """Raised when a job's lease expired and was released or taken over."""
+
+
+class WorkQueue:
+    """SQLite-backed job table with claim/heartbeat/complete/fail leases.
+
+    Each thread gets its own connection; the object itself can be shared.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.clock = clock
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            import sqlite3
+
+            connection = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            connection.execute("PRAGMA busy_timeout=30000")
+            self._local.connection = connection
+        return connection
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def enqueue(
+        self, specs: Sequence[str], max_pages: Optional[int] = None, requeue: bool = False
+    ) -> int:
+        """Add creators; ``requeue`` also resets finished or failed ones. Returns rows touched."""
+        connection = self._connection()
+        now = self.clock()
+        touched = 0
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for spec in specs:
+                vanity, url, _ = parse_creator(spec)
+                creator = vanity or url
+                cursor = connection.execute(
+                    "INSERT OR IGNORE INTO jobs (creator, spec, max_pages, updated_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (creator, spec, max_pages, now),
+                )
+                if not cursor.rowcount and requeue:
+                    cursor = connection.execute(
+                        "UPDATE jobs SET spec = ?, max_pages = ?, state = 'pending', attempts = 0, "
+                        "available_at = 0, error = NULL, updated_at = ? "
+                        "WHERE creator = ? AND state IN ('done', 'failed')",
+                        (spec, max_pages, now, creator),
+                    )
+                touched += cursor.rowcount
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return touched
+
+    def claim(self, owner: str) -> Optional[Job]:
+        """Lease the next due pending job to ``owner``.
+
+        Expired leases are first released like :meth:`fail` releases a job: back
+        to pending after ``retry_delay``, or failed once ``max_attempts`` is used up.
+        """
+        connection = self._connection()
+        now = self.clock()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = 'lease expired', available_at = ?, lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? "
+                "WHERE state = 'leased' AND lease_expires < ?",
+                (self.max_attempts, now + self.retry_delay, now, now),
+            )
+            row = connection.execute(
+                "SELECT creator, spec, max_pages, attempts FROM jobs "
+                "WHERE state = 'pending' AND available_at <= ? "
+                "ORDER BY available_at, creator LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                connection.execute("COMMIT")
+                return None
+            creator, spec, max_pages, attempts = row
+            connection.execute(
+                "UPDATE jobs SET state = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE creator = ?",
+                (owner, now + self.lease_seconds, now, creator),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return Job(creator, spec, max_pages, owner, attempts + 1)
+
+    def heartbeat(self, job: Job) -> bool:
+        """Extend ``job``'s lease; ``False`` means the lease was lost."""
+        now = self.clock()
+        cursor = self._connection().execute(
+            "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+            "WHERE creator = ? AND lease_owner = ? AND state = 'leased'",
+            (now + self.lease_seconds, now, job.creator, job.owner),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job: Job, result: Dict[str, Any]) -> bool:
+        """Store ``result`` if ``job`` still holds its lease; ``False`` if it was lost."""
+        import json_backend
+
+        cursor = self._connection().execute(
+            "UPDATE jobs SET state = 'done', result = ?, error = NULL, lease_owner = NULL, "
+            "lease_expires = NULL, updated_at = ? "
+            "WHERE creator = ? AND lease_owner = ? AND state = 'leased'",
+            (json_backend.dumps(result, compact=True), self.clock(), job.creator, job.owner),
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job: Job, error: str) -> bool:
+        """Release ``job`` for a retry after ``retry_delay``, or mark it failed for good."""
+        now = self.clock()
+        state = "failed" if job.attempts >= self.max_attempts else "pending"
+        cursor = self._connection().execute(
+            "UPDATE jobs SET state = ?, error = ?, available_at = ?, lease_owner = NULL, "
+            "lease_expires = NULL, updated_at = ? "
+            "WHERE creator = ? AND lease_owner = ? AND state = 'leased'",
+            (state, error, now + self.retry_delay, now, job.creator, job.owner),
+        )
+        return cursor.rowcount == 1
+
+    def counts(self) -> Dict[str, int]:
+        now = self.clock()
+        counts = {"pending": 0, "leased": 0, "expired": 0, "done": 0, "failed": 0}
+        for state, expired, total in self._connection().execute(
+            "SELECT state, state = 'leased' AND lease_expires < ?, COUNT(*) FROM jobs "
+            "GROUP BY 1, 2",
+            (now,),
+        ):
+            key = "expired" if expired else state
+            counts[key] = counts.get(key, 0) + total
+        return counts
+
+
+def refresh_job(
+    service: VanityService,
+    queue: WorkQueue,
+    job: Job,
+    count: int,
+    include_web_metadata: bool = True,
+) -> Dict[str, Any]:
+    """Refresh one claimed creator, renewing the lease after every page."""
+
+    def beat(_page: Any = None) -> None:
+        if not queue.heartbeat(job):
+            raise LeaseLost(f"lease on {job.creator} was taken over")
+
+    started = time.perf_counter()
+    vanity, url, profile_urn = parse_creator(job.spec)
+    metadata: Dict[str, Any] = {}
+    if not profile_urn:
+        metadata = service.resolve_urn(url)
+        profile_urn = metadata.get("id")
+        if not profile_urn:
+            raise ValueError("Profile URN resolution did not return an id.")
+        beat()
+    if not profile_urn.startswith("urn:"):
+        profile_urn = f"urn:li:fsd_profile:{profile_urn}"
+    posts = service.collect_posts(
+        profile_urn, count, include_web_metadata, job.max_pages, on_page=beat
+    )
+    username = metadata.get("username") or vanity
+    try:
+        followers = service.network_info(username).get("followersCount") if username else None
+    except Exception:
+        # Follower counts stay best effort, as in the cloud function.
+        followers = None
+    return {
+        "creator": job.spec,
+        "id": profile_urn,
+        "username": username,
+        "url": metadata.get("url") or url,
+        "imageUrl": metadata.get("imageUrl"),
+        "posts": posts,
+        "followersCount": followers,
+        "attempt": job.attempts,
+        "timings": {"total": round((time.perf_counter() - started) * 1000, 1)},
+    }
+
+
+def work(
+    queue: WorkQueue,
+    run: Callable[[Job], Dict[str, Any]],
+    emit: Callable[[Dict[str, Any]], None],
+    concurrency: int = 1,
+    wait: bool = False,
+    poll_interval: float = 5.0,
+) -> Dict[str, int]:
+    """Claim and run jobs on ``concurrency`` threads until the queue is drained.
+
+    With ``wait`` the workers keep polling for new or expired jobs instead.
+    Returns counts of committed, failed and lost jobs.
+    """
+    import socket
+
+    owner_prefix = f"{socket.gethostname()}:{os.getpid()}"
+    totals = {"done": 0, "failed": 0, "lost": 0}
+    lock = threading.Lock()
+
+    def tally(key: str) -> None:
+        with lock:
+            totals[key] += 1
+
+    def worker(number: int) -> None:
+        owner = f"{owner_prefix}:{number}"
+        try:
+            while True:
+                job = queue.claim(owner)
+                if job is None:
+                    if not wait:
+                        return
+                    time.sleep(poll_interval)
+                    continue
+                try:
+                    record = run(job)
+                except LeaseLost:
+                    tally("lost")
+                    continue
+                except Exception as exc:
+                    queue.fail(job, str(exc))
+                    tally("failed")
+                    emit({"creator": job.spec, "attempt": job.attempts, "error": str(exc)})
+                    continue
+                if queue.complete(job, record):
+                    tally("done")
+                    emit(record)
+                else:
+                    tally("lost")
+        finally:
+            queue.close()
+
+    threads = [
+        threading.Thread(target=worker, args=(number,), daemon=True)
+        for number in range(max(1, concurrency))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return totals
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Lease-based creator refresh queue shared by workers on several hosts",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="Add creators to the queue.")
+    enqueue.add_argument(
+        "creators",
+        nargs="*",
+        help="Creator vanity, profile URL, or 'vanity,profileUrn'.",
+    )
+    enqueue.add_argument(
+        "--creators-file",
+        help="File with one creator spec per line (blank lines and # comments ignored).",
+    )
+    enqueue.add_argument(
+        "--max-pages",
+        type=int,
+        help="Fetch at most this many pages for these creators.",
+    )
+    enqueue.add_argument(
+        "--requeue",
+        action="store_true",
+        help="Also reset creators that are already done or failed.",
+    )
+
+    worker = commands.add_parser("work", help="Claim and refresh creators until drained.")
+    worker.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Worker threads in this process (default: 4).",
+    )
+    worker.add_argument(
+        "--count",
+        type=int,
+        default=100,
+        help="Page size for pagination (default: 100, max 100).",
+    )
+    worker.add_argument(
+        "--lease",
+        type=float,
+        default=DEFAULT_LEASE_SECONDS,
+        help=(
+            "Lease length in seconds, renewed after every page "
+            f"(default: {DEFAULT_LEASE_SECONDS:g})."
+        ),
+    )
+    worker.add_argument(
+        "--max-attempts",
+        type=int,
+        default=DEFAULT_MAX_ATTEMPTS,
+        help=f"Attempts before a creator is marked failed (default: {DEFAULT_MAX_ATTEMPTS}).",
+    )
+    worker.add_argument(
+        "--retry-delay",
+        type=float,
+        default=DEFAULT_RETRY_DELAY,
+        help=f"Seconds before a failed creator is retried (default: {DEFAULT_RETRY_DELAY:g}).",
+    )
+    worker.add_argument(
+        "--wait",
+        action="store_true",
+        help="Keep polling for new or expired jobs instead of exiting when drained.",
+    )
+    worker.add_argument(
+        "--no-web-metadata",
+        action="store_true",
+        help="Omit includeWebMetadata=true from GraphQL requests.",
+    )
+    worker.add_argument(
+        "--cookie",
+        help="Cookie header string. Defaults to LINKEDIN_COOKIE env var or module default.",
+    )
+    worker.add_argument(
+        "--csrf-token",
+        dest="csrf_token",
+        help="CSRF token value. Defaults to LINKEDIN_CSRF_TOKEN env var or module default.",
+    )
+    worker.add_argument(
+        "--timeout",
+        type=float,
+        default=30.0,
+        help="HTTP timeout in seconds (default: 30).",
+    )
+    worker.add_argument(
+        "--output",
+        help="Append committed NDJSON records to this path instead of stdout.",
+    )
+    worker.add_argument(
+        "--metrics-file",
+        help="Write OpenMetrics request/pagination counters to this textfile on exit.",
+    )
+
+    commands.add_parser("status", help="Print job counts per state as JSON.")
+
+    for sub in commands.choices.values():
+        sub.add_argument("--db", required=True, help="SQLite queue database path.")
+        sub.add_argument(
+            "--verbose",
+            action="store_true",
+            help="Print progress to stderr.",
+        )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    import json_backend
+    import metrics
+
+    if args.command == "enqueue":
+        queue = WorkQueue(args.db)
+        creators = read_creators(args)
+        if not creators:
+            raise SystemExit("No creators given. Pass them as arguments or via --creators-file.")
+        touched = queue.enqueue(creators, args.max_pages, args.requeue)
+        if args.verbose:
+            print(f"queued {touched} of {len(creators)} creators", file=sys.stderr)
+        return 0
+
+    if args.command == "status":
+        sys.stdout.write(json_backend.dumps(WorkQueue(args.db).counts(), compact=True) + "\n")
+        return 0
+
+    if not 0 < args.count <= 100:
+        raise SystemExit("--count must be between 1 and 100")
+    if args.concurrency <= 0:
+        raise SystemExit("--concurrency must be positive")
+    metrics.export_at_exit(args.metrics_file)
+
+    from lkvanity.service import VanityService
+    from lkvanity.sessions import SessionPool, resolve_credentials
+
+    queue = WorkQueue(
+        args.db,
+        lease_seconds=args.lease,
+        max_attempts=args.max_attempts,
+        retry_delay=args.retry_delay,
+    )
+    cookie_header, csrf_token = resolve_credentials(args.cookie, args.csrf_token)
+    pool = SessionPool(cookie_header, csrf_token, pool_size=max(8, args.concurrency * 2))
+    service = VanityService(pool, timeout=args.timeout, verbose=args.verbose)
+    handle = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    write_lock = threading.Lock()
+
+    def emit(record: Dict[str, Any]) -> None:
+        line = json_backend.dumps(record, compact=True) + "\n"
+        with write_lock:
+            handle.write(line)
+            handle.flush()
+        if args.verbose:
+            posts = record.get("posts")
+            status = "error" if "error" in record else f"posts={len(posts or [])}"
+            print(f"{record['creator']}: {status}", file=sys.stderr)
+
+    try:
+        totals = work(
+            queue,
+            lambda job: refresh_job(service, queue, job, args.count, not args.no_web_metadata),
+            emit,
+            concurrency=args.concurrency,
+            wait=args.wait,
+        )
+    finally:
+        if handle is not sys.stdout:
+            handle.close()
+        pool.close()
+    if args.verbose:
+        print(f"worker totals: {totals}", file=sys.stderr)
+    return 1 if totals["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
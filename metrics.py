@@ -0,0 +1,314 @@
+"""Process-wide fetch and parse metrics with OpenMetrics text export.
+
+The HTTP sessions built by the CLIs record every response (count by host and
+status, latency, body size, urllib3 retries, errors by status) and the
+pagination loops record pages, pages per profile, 400-boundary stops, included
+entities per ``$type`` and derived posts. Everything lands in :data:`REGISTRY`,
+which renders as an OpenMetrics exposition: the CLIs write it to a textfile
+with ``--metrics-file`` (e.g. for the node_exporter textfile collector) and
+``lkvanity serve`` exposes it on ``/metrics``.
+
+Only the standard library is used so importing this module stays cheap.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (1024.0, 16384.0, 65536.0, 262144.0, 1048576.0, 4194304.0, 16777216.0)
+PAGES_BUCKETS = (1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {list(self.labelnames)}, got {sorted(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [
+            f"# TYPE {self.name} {self.kind}",
+            f"# HELP {self.name} {_escape(self.documentation)}",
+        ]
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Exposition lines for every label set, without the header."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every recorded value."""
+
+
+class Counter(_Metric):
+    """Monotonic counter; exposed with the ``_total`` suffix."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram with ``_bucket``, ``_count`` and ``_sum`` samples."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Iterable[float],
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets)) + (math.inf,)
+        # label values -> [per-bucket counts..., sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 1)
+            for position, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[position] += 1
+                    break
+            state[-1] += value
+
+    def count(self, **labels: Any) -> int:
+        state = self._values.get(self._key(labels))
+        return int(sum(state[:-1])) if state else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        lines: List[str] = []
+        names = self.labelnames + ("le",)
+        for key, state in items:
+            cumulative = 0.0
+            for bound, hits in zip(self.buckets, state):
+                cumulative += hits
+                labels = _format_labels(names, key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-1])}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together as one exposition."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Iterable[float],
+        labelnames: Sequence[str] = (),
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, buckets, labelnames))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """Atomically replace ``path`` so collectors never read a partial file."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            handle.write(self.render())
+        os.replace(tmp_path, path)
+
+    def clear(self) -> None:
+        for metric in list(self._metrics.values()):
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+REQUESTS = REGISTRY.counter(
+    "linkedin_http_responses", "HTTP responses received.", ("host", "status")
+)
+REQUEST_ERRORS = REGISTRY.counter(
+    "linkedin_http_errors", "HTTP responses with a 4xx/5xx status.", ("host", "status")
+)
+RETRIES = REGISTRY.counter(
+    "linkedin_http_retries", "Retries urllib3 performed before a response arrived.", ("host",)
+)
+REQUEST_LATENCY = REGISTRY.histogram(
+    "linkedin_http_request_duration_seconds",
+    "Time from sending a request until its response headers arrived.",
+    LATENCY_BUCKETS,
+    ("host",),
+)
+RESPONSE_BYTES = REGISTRY.histogram(
+    "linkedin_http_response_bytes",
+    "Decoded response body size.",
+    BYTES_BUCKETS,
+    ("host",),
+)
+PAGES = REGISTRY.counter("linkedin_pages", "Feed pages fetched.", ("source",))
+PAGES_PER_PROFILE = REGISTRY.histogram(
+    "linkedin_pages_per_profile",
+    "Feed pages fetched per profile pagination run.",
+    PAGES_BUCKETS,
+    ("source",),
+)
+BOUNDARY_STOPS = REGISTRY.counter(
+    "linkedin_pagination_boundary_stops",
+    "Pagination runs stopped by a 400 on the pagination token.",
+    ("source",),
+)
+ENTITIES = REGISTRY.counter(
+    "linkedin_included_entities", "Included entities received, by $type.", ("type",)
+)
+POSTS_DERIVED = REGISTRY.counter("linkedin_posts_derived", "Posts derived from included entities.")
+
+
+def _host(response: requests.Response) -> str:
+    url = getattr(response, "url", "") or ""
+    host = url.split("://", 1)[-1].split("/", 1)[0]
+    return host or "unknown"
+
+
+def record_response(response: requests.Response, *args: Any, **kwargs: Any) -> None:
+    """``requests`` response hook feeding the HTTP metrics."""
+    host = _host(response)
+    status = response.status_code
+    REQUESTS.inc(host=host, status=status)
+    if status >= 400:
+        REQUEST_ERRORS.inc(host=host, status=status)
+    elapsed = getattr(response, "elapsed", None)
+    if elapsed is not None:
+        REQUEST_LATENCY.observe(elapsed.total_seconds(), host=host)
+    # Hooks run before a non-streamed body is read; reading it here only
+    # moves that read earlier.
+    RESPONSE_BYTES.observe(len(response.content or b""), host=host)
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    history = getattr(retries, "history", None)
+    if history:
+        RETRIES.inc(len(history), host=host)
+
+
+def instrument_session(session: requests.Session) -> requests.Session:
+    if record_response not in session.hooks["response"]:
+        session.hooks["response"].append(record_response)
+    return session
+
+
+def record_entities(items: Iterable[Any]) -> None:
+    counts: Dict[str, int] = {}
+    for item in items:
+        if isinstance(item, dict):
+            entity_type = item.get("$type") or "unknown"
+            counts[entity_type] = counts.get(entity_type, 0) + 1
+    for entity_type, count in counts.items():
+        ENTITIES.inc(count, type=entity_type)
+
+
+def write_textfile(path: Optional[str], registry: MetricsRegistry = REGISTRY) -> None:
+    """Write ``registry`` to ``path`` when one was requested."""
+    if path:
+        registry.write_textfile(path)
+
+
+def export_at_exit(path: Optional[str], registry: MetricsRegistry = REGISTRY) -> None:
+    """Write the textfile when the process exits, including after ``SystemExit``."""
+    if path:
+        import atexit
+
+        atexit.register(registry.write_textfile, path)
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""NDJSON outputs with a sidecar offset index for random access.
+
+Writers that opt in (``fetchv2 --ndjson``, ``fetch_linkedin_profile_updates.py
+--ndjson``) emit one compact JSON record per line plus ``<path>.idx``, a
+binary table mapping every ``urn``, ``entityUrn`` and ``$id`` of a record to
+the byte offset and length of its line. Keys are stored sorted, so the reader
+memory-maps both files and answers a lookup with a binary search over the
+table and a single ``loads`` of the matching line; URN ranges and prefixes are
+contiguous runs of the table. Nothing else in the file is parsed.
+
+Index layout (little-endian):
+
+    header   magic, entry count, data file size, key blob size
+    entries  count x (key offset, record offset, key length, record length)
+    blob     UTF-8 keys, concatenated in sorted order
+
+The data file size in the header lets the reader reject an index that no
+longer matches its NDJSON file.
+
+Example usage:
+
+    ./fetchv2 'urn:li:fsd_profile:ACoAAByAzQoB9-VHcgJ_Fx6moaCchiwhtPfz7rw' \
+        --ndjson --output org-reactions.ndjson --posts-output posts.ndjson
+    python record_index.py posts.ndjson urn:li:activity:7374105656353742848
+    python record_index.py org-reactions.ndjson --prefix urn:li:fsd_socialActivityCounts:
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import json_backend
+
+KEY_CANDIDATES = ("urn", "entityUrn", "$id")
+
+_MAGIC = b"LKOFX1\0\0"
+_HEADER = struct.Struct("<8sQQQ")
+_ENTRY = struct.Struct("<QQII")
+
+
+def index_path(path: str) -> str:
+    return f"{path}.idx"
+
+
+def record_keys(record: Dict[str, Any]) -> List[str]:
+    """Return the distinct lookup keys of ``record``."""
+    keys: List[str] = []
+    for candidate in KEY_CANDIDATES:
+        value = record.get(candidate)
+        if isinstance(value, str) and value not in keys:
+            keys.append(value)
+    return keys
+
+
+class IndexedWriter:
+    """Stream records to ``path`` as NDJSON and write the index on :meth:`close`.
+
+    Both files are written to temporary paths and moved into place together,
+    so an interrupted run leaves the previous output untouched.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._tmp_path = f"{path}.{os.getpid()}.tmp"
+        self._handle = open(self._tmp_path, "wb")
+        self._entries: List[Tuple[bytes, int, int]] = []
+        self._offset = 0
+        self.records = 0
+
+    def __enter__(self) -> "IndexedWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, *exc: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def write(self, record: Any) -> None:
+        body = json_backend.dumps_bytes(record, compact=True)
+        self._handle.write(body)
+        self._handle.write(b"\n")
+        if isinstance(record, dict):
+            for key in record_keys(record):
+                self._entries.append((key.encode("utf-8"), self._offset, len(body)))
+        self._offset += len(body) + 1
+        self.records += 1
+
+    def extend(self, records: Iterable[Any]) -> None:
+        for record in records:
+            self.write(record)
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self._handle.close()
+        # Ties keep file order, so a duplicated key resolves to its first record.
+        self._entries.sort()
+        blob = bytearray()
+        tmp_index = f"{index_path(self.path)}.{os.getpid()}.tmp"
+        with open(tmp_index, "wb") as handle:
+            handle.write(_HEADER.pack(_MAGIC, len(self._entries), self._offset, 0))
+            for key, offset, length in self._entries:
+                handle.write(_ENTRY.pack(len(blob), offset, len(key), length))
+                blob += key
+            handle.write(blob)
+            handle.seek(0)
+            handle.write(_HEADER.pack(_MAGIC, len(self._entries), self._offset, len(blob)))
+        os.replace(self._tmp_path, self.path)
+        os.replace(tmp_index, index_path(self.path))
+
+    def discard(self) -> None:
+        if not self._handle.closed:
+            self._handle.close()
+        try:
+            os.remove(self._tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+def write_indexed(path: str, records: Iterable[Any]) -> int:
+    """Write ``records`` to ``path`` with its index; returns the record count."""
+    with IndexedWriter(path) as writer:
+        writer.extend(records)
+    return writer.records
+
+
+def _map(path: str) -> Optional[mmap.mmap]:
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class IndexedRecords:
+    """Read-only random access to an NDJSON file written by :class:`IndexedWriter`.
+
+    ``len()`` counts index keys, not records: a record is listed under each
+    of its ``urn``, ``entityUrn`` and ``$id``.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._data: Optional[mmap.mmap] = None
+        self._index = _map(index_path(path))
+        if self._index is None:
+            raise ValueError(f"{index_path(path)} is empty")
+        magic, count, data_size, _ = _HEADER.unpack_from(self._index)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"{index_path(path)} is not a record index")
+        if os.path.getsize(path) != data_size:
+            self.close()
+            raise ValueError(f"{index_path(path)} does not match {path}; rewrite the output")
+        self._data = _map(path)
+        self._count = count
+        self._blob_at = _HEADER.size + count * _ENTRY.size
+
+    def __enter__(self) -> "IndexedRecords":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _entry(self, position: int) -> Tuple[int, int, int, int]:
+        return _ENTRY.unpack_from(self._index, _HEADER.size + position * _ENTRY.size)
+
+    def _key(self, position: int) -> bytes:
+        key_offset, _, key_length, _ = self._entry(position)
+        start = self._blob_at + key_offset
+        return self._index[start : start + key_length]
+
+    def _record(self, position: int) -> Dict[str, Any]:
+        _, offset, _, length = self._entry(position)
+        return json_backend.loads(self._data[offset : offset + length])
+
+    def _bisect(self, key: bytes) -> int:
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _find(self, key: str) -> Optional[int]:
+        encoded = key.encode("utf-8")
+        position = self._bisect(encoded)
+        if position < self._count and self._key(position) == encoded:
+            return position
+        return None
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) is not None
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        position = self._find(key)
+        if position is None:
+            raise KeyError(key)
+        return self._record(position)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        position = self._find(key)
+        return default if position is None else self._record(position)
+
+    def range(
+        self, start: Optional[str] = None, stop: Optional[str] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield ``(key, record)`` for ``start <= key < stop`` in key order."""
+        position = self._bisect(start.encode("utf-8")) if start is not None else 0
+        end = self._bisect(stop.encode("utf-8")) if stop is not None else self._count
+        for current in range(position, end):
+            yield self._key(current).decode("utf-8"), self._record(current)
+
+    def prefix(self, prefix: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield ``(key, record)`` for every key starting with ``prefix``."""
+        encoded = prefix.encode("utf-8")
+        position = self._bisect(encoded)
+        while position < self._count:
+            key = self._key(position)
+            if not key.startswith(encoded):
+                break
+            yield key.decode("utf-8"), self._record(position)
+            position += 1
+
+    def keys(self) -> Iterator[str]:
+        for position in range(self._count):
+            yield self._key(position).decode("utf-8")
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Yield every record in file order, including records without keys."""
+        data = self._data
+        if data is None:
+            return
+        start = 0
+        while start < len(data):
+            end = data.find(b"\n", start)
+            if end == -1:
+                end = len(data)
+            if end > start:
+                yield json_backend.loads(data[start:end])
+            start = end + 1
+
+    def close(self) -> None:
+        for mapped in (self._data, self._index):
+            if mapped is not None:
+                mapped.close()
+        self._data = self._index = None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Look up records in an NDJSON output through its offset index",
+    )
+    parser.add_argument("path", help="NDJSON file written with --ndjson")
+    parser.add_argument("keys", nargs="*", help="urn / entityUrn / $id values to print")
+    parser.add_argument("--prefix", help="Print every record with a key starting with this.")
+    parser.add_argument("--start", help="Print records with keys >= this (with --stop).")
+    parser.add_argument("--stop", help="Print records with keys < this (with --start).")
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write single-line JSON instead of the indented layout.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        records = IndexedRecords(args.path)
+    except (OSError, ValueError) as exc:
+        raise SystemExit(str(exc)) from exc
+    missing = 0
+    with records:
+        found: List[Any] = []
+        for key in args.keys:
+            record = records.get(key)
+            if record is None:
+                print(f"Not found: {key}", file=sys.stderr)
+                missing += 1
+            else:
+                found.append(record)
+        if args.prefix is not None:
+            found.extend(record for _, record in records.prefix(args.prefix))
+        if args.start is not None or args.stop is not None:
+            found.extend(record for _, record in records.range(args.start, args.stop))
+        json_backend.dump(found, sys.stdout, compact=args.compact)
+        sys.stdout.write("\n")
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""Disk-backed, deduplicating store for raw GraphQL ``included`` entities.
+
+Each unique entity is written exactly once as a length-prefixed, zlib
+compressed JSON record. Only a compact index of 8-byte key digests to file
+offsets stays in memory, so accumulating every page of a large profile costs
+roughly one page of RSS instead of the whole history.
+
+Entities are keyed the same way as ``fetchv2.dedupe_items`` (first of ``$id``,
+``entityUrn``, ``urn``); items with none of those keys fall back to a hash of
+their canonical JSON content.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import tempfile
+import zlib
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import json_backend
+
+_HEADER = struct.Struct(">I")
+KEY_CANDIDATES = ("$id", "entityUrn", "urn")
+
+
+def entity_key(item: Dict[str, Any]) -> bytes:
+    """Return the 8-byte digest used to deduplicate ``item``."""
+    for candidate in KEY_CANDIDATES:
+        value = item.get(candidate)
+        if isinstance(value, str):
+            material = f"{candidate}\0{value}".encode("utf-8")
+            break
+    else:
+        material = b"content\0" + json_backend.canonical_key(item).encode("utf-8")
+    return hashlib.blake2b(material, digest_size=8).digest()
+
+
+class SpillStore:
+    """Append-only record file with an in-memory ``key -> (offset, length)`` index.
+
+    Iterating the store re-reads the file sequentially, so it can be passed to
+    consumers such as ``write_json`` and ``derive_posts`` one after the other.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        path: Optional[str] = None,
+        compress_level: int = 6,
+        keep: bool = False,
+    ) -> None:
+        if path is None:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            fd, path = tempfile.mkstemp(prefix="included-", suffix=".spill", dir=directory)
+            os.close(fd)
+        self.path = path
+        self.keep = keep
+        self.compress_level = compress_level
+        self._handle: IO[bytes] = open(path, "w+b")
+        self._index: Dict[bytes, Tuple[int, int]] = {}
+        self._end = 0
+        self.duplicates = 0
+        self.bytes_written = 0
+
+    def __enter__(self) -> "SpillStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, item: Any) -> bool:
+        return isinstance(item, dict) and entity_key(item) in self._index
+
+    def add(self, item: Any) -> bool:
+        """Store ``item`` unless an entity with the same key is already present."""
+        if not isinstance(item, dict):
+            return False
+        key = entity_key(item)
+        if key in self._index:
+            self.duplicates += 1
+            return False
+        body = zlib.compress(json_backend.dumps_bytes(item, compact=True), self.compress_level)
+        self._handle.seek(self._end)
+        self._handle.write(_HEADER.pack(len(body)))
+        self._handle.write(body)
+        self._index[key] = (self._end, len(body))
+        self._end += _HEADER.size + len(body)
+        self.bytes_written += _HEADER.size + len(body)
+        return True
+
+    def extend(self, items: Iterable[Any]) -> int:
+        """Add every item from one page; returns how many were new."""
+        added = 0
+        for item in items:
+            if self.add(item):
+                added += 1
+        return added
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        location = self._index.get(key)
+        if location is None:
+            return None
+        offset, length = location
+        self._handle.seek(offset + _HEADER.size)
+        return json_backend.loads(zlib.decompress(self._handle.read(length)))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self._handle.flush()
+        with open(self.path, "rb") as reader:
+            position = 0
+            while position < self._end:
+                header = reader.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    break
+                (length,) = _HEADER.unpack(header)
+                yield json_backend.loads(zlib.decompress(reader.read(length)))
+                position += _HEADER.size + length
+
+    def write_json(
+        self,
+        handle: IO[str],
+        compact: bool = False,
+        keep: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> int:
+        """Stream ``{"included": [...]}`` to ``handle`` one entity at a time.
+
+        The output matches ``json_backend.dump({"included": items}, handle, compact)``
+        for the same entities. ``keep`` filters entities on the way out without
+        materializing them. Returns the number of entities written.
+        """
+        items: Iterable[Dict[str, Any]] = self if keep is None else filter(keep, self)
+        written = 0
+        if compact:
+            handle.write('{"included":[')
+            for item in items:
+                if written:
+                    handle.write(",")
+                handle.write(json_backend.dumps(item, compact=True))
+                written += 1
+            handle.write("]}")
+            return written
+        pad = "  "
+        handle.write("{\n" + pad + '"included": [')
+        for item in items:
+            handle.write(",\n" if written else "\n")
+            written += 1
+            body = json_backend.dumps(item)
+            handle.write("\n".join(pad * 2 + line for line in body.split("\n")))
+        if written:
+            handle.write("\n" + pad + "]\n}")
+        else:
+            handle.write("]\n}")
+        return written
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self._handle.close()
+        if not self.keep:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass